@@ -5,6 +5,23 @@
  */
 
 (async () => {
+  // ── Offline support ────────────────────────────────────────────────────────
+  if ('serviceWorker' in navigator && location.protocol !== 'file:') {
+    window.addEventListener('load', () => {
+      navigator.serviceWorker.register('sw.js')
+        .catch(err => console.warn('Service worker registration failed:', err));
+    });
+    // A background sync replaced cached files: anything loaded from here on
+    // (search workers) would come from the new build, not this page's
+    navigator.serviceWorker.addEventListener('message', ({ data }) => {
+      if (data?.type !== 'sotd:precache-updated') return;
+      SearchPool.pinToPage();
+      if (data.urls.some(url => !url.startsWith('images/'))) {
+        Results.showToast('A new version has been downloaded. Reload to update.');
+      }
+    });
+  }
+
   // ── Load data ──────────────────────────────────────────────────────────────
   let ingredients, effects;
   try {
@@ -18,6 +35,20 @@
     return;
   }
 
+  // Search counters + perf panel: ?debug in the URL or localStorage sotd_debug=1
+  RecipeEngine.setDebug(
+    new URLSearchParams(location.search).has('debug') || localStorage.getItem('sotd_debug') === '1'
+  );
+
+  // ── Derived indexes (persisted per data version) ───────────────────────────
+  DerivedCache.register('filters', () => Filters.buildIndex(ingredients, effects));
+  DerivedCache.register('goal-effect-groups', () => GoalMode.buildEffectGroups(effects));
+  DerivedCache.register('goal-relevant-ids', () => GoalMode.buildRelevantIds(ingredients, effects));
+  DerivedCache.register('search-index', () => RecipeEngine.buildSearchIndex(ingredients));
+  await DerivedCache.open(Data.getVersion());
+  // Optional: searches fall back to scanning the ingredient list until it's built
+  RecipeEngine.setSearchIndex(DerivedCache.peek('search-index', RecipeEngine.setSearchIndex));
+
   // ── State ──────────────────────────────────────────────────────────────────
   let currentMode = 'ingredient';
   let sortField = 'name';   // 'name' | 'value' | 'fuse'
@@ -46,7 +77,7 @@
     _updateGrid();
   });
 
-  Filters.init(effects, () => _updateGrid());
+  Filters.init(effects, () => _updateGrid(), ingredients, DerivedCache.get('filters'));
   Search.init(() => _updateGrid());
 
   // Goal mode requests a grid re-filter when effect changes in grid view
@@ -108,10 +139,11 @@
 
   // ── Initial mode ─────────────────────────────────────────────────────────────
   _activateMode('ingredient');
+  _loadSharedRecipe();
 
   // ── Grid update ───────────────────────────────────────────────────────────
   function _updateGrid() {
-    let filtered = ingredients.filter(i => Filters.passes(i) && Search.matches(i));
+    let filtered = Filters.getFiltered().filter(i => Search.matches(i));
 
     filtered = [...filtered].sort((a, b) => {
       let primary, secondary;
@@ -180,6 +212,22 @@
     _updateGrid();
   }
 
+  // Shared links carry a packed recipe code: #r=<code>
+  function _loadSharedRecipe() {
+    const match = location.hash.match(/^#r=([A-Za-z0-9_-]+)$/);
+    if (!match) return;
+    const decoded = Storage.decodeRecipe(match[1]);
+    if (!decoded) {
+      Results.showToast('Invalid recipe link.', 'error');
+      return;
+    }
+    if (decoded.stale) {
+      Results.showToast('This recipe link was made for a different ingredient list.', 'error');
+      return;
+    }
+    RecipeBuilder.loadIngredients(decoded.ids.map(id => Data.getIngredientById(id)).filter(Boolean));
+  }
+
   // ── Initial grid render ────────────────────────────────────────────────────
   _updateGrid();
 
@@ -5,32 +5,63 @@
 const Data = (() => {
   let _ingredients = null;
   let _effects = null;
+  let _version = null;
+  let _layoutVersion = null; // hash of the ingredient-id order only (share-code indices)
+  let _substitutes = {}; // id → substitute ids, closest first (tools/build_substitutes.py)
+  let _byId = null;
 
   async function loadData() {
-    const [ingrResp, effectsResp] = await Promise.all([
+    const [ingrResp, effectsResp, subsResp] = await Promise.all([
       fetch('data/ingredients.json'),
       fetch('data/effects.json'),
+      fetch('data/substitutes.json').catch(() => null),
     ]);
 
     if (!ingrResp.ok) throw new Error('Failed to load ingredients.json');
     if (!effectsResp.ok) throw new Error('Failed to load effects.json');
 
-    _ingredients = await ingrResp.json();
-    _effects = await effectsResp.json();
+    const [ingrText, effectsText] = await Promise.all([ingrResp.text(), effectsResp.text()]);
+    _ingredients = JSON.parse(ingrText);
+    _effects = JSON.parse(effectsText);
+    _version = _hash(ingrText + '\u0000' + effectsText);
+    _layoutVersion = _hash(_ingredients.map(i => i.id).join('\n'));
+    _byId = null;
 
-    return { ingredients: _ingredients, effects: _effects };
+    // Optional: without the index the results panel just shows no swap suggestions
+    _substitutes = subsResp?.ok ? await subsResp.json().catch(() => ({})) : {};
+
+    return { ingredients: _ingredients, effects: _effects, version: _version };
+  }
+
+  // FNV-1a (32-bit) — over the raw JSON it identifies a data version for caches
+  function _hash(text) {
+    let h = 0x811c9dc5;
+    for (let i = 0; i < text.length; i++) {
+      h ^= text.charCodeAt(i);
+      h = Math.imul(h, 0x01000193);
+    }
+    return (h >>> 0).toString(16).padStart(8, '0');
   }
 
   function getIngredients() { return _ingredients || []; }
   function getEffects() { return _effects || []; }
+  function getVersion() { return _version; }
+  /** Changes only when ingredients are added, removed or reordered. */
+  function getLayoutVersion() { return _layoutVersion; }
 
   function getIngredientById(id) {
-    return (_ingredients || []).find(i => i.id === id) || null;
+    if (!_byId) _byId = new Map((_ingredients || []).map(i => [i.id, i]));
+    return _byId.get(id) || null;
+  }
+
+  /** Ingredients with the same type and effect as `id`, closest stats first. */
+  function getSubstitutes(id) {
+    return (_substitutes[id] || []).map(getIngredientById).filter(Boolean);
   }
 
   function getEffectById(id) {
     return (_effects || []).find(e => e.id === id) || null;
   }
 
-  return { loadData, getIngredients, getEffects, getIngredientById, getEffectById };
+  return { loadData, getIngredients, getEffects, getVersion, getLayoutVersion, getIngredientById, getEffectById, getSubstitutes };
 })();
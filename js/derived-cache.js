@@ -0,0 +1,126 @@
+/**
+ * derived-cache.js — Persist indexes derived from the data files in IndexedDB
+ *
+ * Each derived structure is registered with a builder. Entries are stored as
+ * one record keyed by SCHEMA_VERSION and Data.getVersion(), so a data change —
+ * or a builder whose output shape changed — invalidates them all.
+ *
+ * On a cache hit, get() returns the stored entry. On a miss, entries are built
+ * one per idle callback and persisted once all exist. get() still builds on
+ * demand for what the first render needs; peek() lets optional entries wait
+ * for the idle build instead.
+ * Entries must be structured-cloneable (plain objects, arrays, Maps, typed arrays).
+ */
+
+const DerivedCache = (() => {
+  const DB_NAME = 'sotd-derived';
+  const STORE = 'indexes';
+  const SCHEMA_VERSION = 1; // bump when any builder's output shape changes
+
+  const _builders = new Map(); // key → () => value
+  const _waiting = new Map();  // key → peek() callbacks for entries not built yet
+  let _entries = {};
+  let _version = null;
+  let _dirty = false;
+
+  function register(key, builder) {
+    _builders.set(key, builder);
+  }
+
+  /**
+   * Load entries stored for `version`. Resolves to true on a cache hit.
+   * Never rejects — IndexedDB being unavailable just means rebuilding.
+   */
+  async function open(version) {
+    _version = version;
+    _entries = {};
+    let stored = null;
+    try {
+      stored = await _withStore('readonly', store => store.get(_recordKey()));
+    } catch (err) {
+      console.warn('DerivedCache: IndexedDB unavailable, rebuilding indexes', err);
+    }
+
+    if (stored) {
+      _entries = stored;
+      if ([..._builders.keys()].every(key => key in _entries)) return true;
+    }
+    _dirty = true;
+    _buildAndPersist();
+    return false;
+  }
+
+  function get(key) {
+    if (!(key in _entries)) {
+      const builder = _builders.get(key);
+      if (!builder) throw new Error(`DerivedCache: no builder registered for "${key}"`);
+      _entries[key] = builder();
+      _dirty = true;
+      for (const onBuilt of _waiting.get(key) || []) onBuilt(_entries[key]);
+      _waiting.delete(key);
+    }
+    return _entries[key];
+  }
+
+  /**
+   * The entry for `key` if it is already loaded or built, else null — without
+   * building it. On a miss, `onBuilt` receives the entry once the idle build
+   * (or a later get()) makes it. For entries the app can start without.
+   */
+  function peek(key, onBuilt) {
+    if (key in _entries) return _entries[key];
+    if (onBuilt) {
+      if (!_waiting.has(key)) _waiting.set(key, []);
+      _waiting.get(key).push(onBuilt);
+    }
+    return null;
+  }
+
+  function _recordKey() {
+    return `${SCHEMA_VERSION}:${_version}`;
+  }
+
+  async function _buildAndPersist() {
+    const version = _version;
+    for (const key of _builders.keys()) {
+      await _idle(); // one builder per idle slot keeps each pause short
+      if (_version !== version) return; // reopened for another data version
+      get(key);
+    }
+    if (!_dirty || !_version) return;
+    try {
+      await _withStore('readwrite', store => {
+        store.clear(); // only the current data version is worth keeping
+        return store.put(_entries, _recordKey());
+      });
+      _dirty = false;
+    } catch (err) {
+      console.warn('DerivedCache: failed to persist indexes', err);
+    }
+  }
+
+  function _withStore(mode, fn) {
+    return new Promise((resolve, reject) => {
+      if (typeof indexedDB === 'undefined') return reject(new Error('no indexedDB'));
+      const openReq = indexedDB.open(DB_NAME, 1);
+      openReq.onupgradeneeded = () => openReq.result.createObjectStore(STORE);
+      openReq.onerror = () => reject(openReq.error);
+      openReq.onsuccess = () => {
+        const db = openReq.result;
+        const tx = db.transaction(STORE, mode);
+        const req = fn(tx.objectStore(STORE));
+        tx.oncomplete = () => { db.close(); resolve(req.result); };
+        tx.onerror = tx.onabort = () => { db.close(); reject(tx.error); };
+      };
+    });
+  }
+
+  function _idle() {
+    return new Promise(resolve => {
+      if (typeof requestIdleCallback === 'function') requestIdleCallback(() => resolve(), { timeout: 5000 });
+      else setTimeout(resolve, 50);
+    });
+  }
+
+  return { register, open, get, peek };
+})();
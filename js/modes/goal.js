@@ -7,10 +7,20 @@
  */
 
 const GoalMode = (() => {
+  const SEARCH_BUDGET_MS = 1500; // per search, shared by the tiers tried for 'best'
+
   let _effects = [];
   let _ingredients = [];
   let _viewMode = 'recipes';
   let _goalQtys = new Map(); // id → qty (1–5); empty = no constraint
+  let _searchSeq = 0;        // bumps per search so a slower, older one can't overwrite the results
+
+  const EFFECT_GROUPS = [
+    { label: 'Stat Buffs',        ids: ['attack-up', 'defense-up', 'speed-up', 'stealth-up', 'swim-speed-up'] },
+    { label: 'Hearts & Stamina',  ids: ['hearty', 'energizing', 'enduring'] },
+    { label: 'Elemental Resists', ids: ['cold-resist', 'heat-resist', 'shock-resist', 'flame-guard', 'slip-resist'] },
+    { label: 'Special',           ids: ['gloom-resist', 'bright'] },
+  ];
 
   function activate(ingredients, effects) {
     _effects = effects;
@@ -78,22 +88,13 @@ const GoalMode = (() => {
       return;
     }
 
-    const groups = [
-      { label: 'Stat Buffs',        ids: ['attack-up', 'defense-up', 'speed-up', 'stealth-up', 'swim-speed-up'] },
-      { label: 'Hearts & Stamina',  ids: ['hearty', 'energizing', 'enduring'] },
-      { label: 'Elemental Resists', ids: ['cold-resist', 'heat-resist', 'shock-resist', 'flame-guard', 'slip-resist'] },
-      { label: 'Special',           ids: ['gloom-resist', 'bright'] },
-    ];
-
-    for (const group of groups) {
+    for (const group of DerivedCache.get('goal-effect-groups')) {
       const optgroup = document.createElement('optgroup');
       optgroup.label = group.label;
-      for (const id of group.ids) {
-        const effect = _effects.find(e => e.id === id);
-        if (!effect) continue;
+      for (const { id, name } of group.options) {
         const opt = document.createElement('option');
-        opt.value = effect.id;
-        opt.textContent = effect.name;
+        opt.value = id;
+        opt.textContent = name;
         optgroup.appendChild(opt);
       }
       select.appendChild(optgroup);
@@ -149,6 +150,9 @@ const GoalMode = (() => {
 
     // Tier field always visible (no hiding)
     tierSelect.onchange = _onSearch;
+
+    const rankSelect = document.getElementById('goal-rank-select');
+    if (rankSelect) rankSelect.onchange = _onSearch;
   }
 
   function _onSearch() {
@@ -162,34 +166,51 @@ const GoalMode = (() => {
     }
 
     if (resultsEl) resultsEl.innerHTML = '<p class="placeholder-text">Searching…</p>';
+    const seq = ++_searchSeq;
 
-    setTimeout(() => {
+    setTimeout(async () => {
       const effectDef = _effects.find(e => e.id === effectId);
-      const filteredIngredients = _ingredients.filter(i => Filters.passes(i));
+      const filteredIngredients = Filters.getFiltered();
 
       let combos = [];
       let resolvedTier = null;
+      let outcome = null;
 
       const qtys = _goalQtys.size > 0 ? _goalQtys : null;
+      const pareto = document.getElementById('goal-rank-select')?.value === 'pareto';
+      const deadline = performance.now() + SEARCH_BUDGET_MS;
+      // Anytime search: every candidate (no monster-part cap), best branches first, stopped at the deadline
+      const search = async tier => {
+        const searchOpts = { pareto, timeBudgetMs: Math.max(deadline - performance.now(), 50) };
+        outcome = await SearchPool.searchAnytime(RecipeEngine.prepareGoalSearch(
+          effectId, tier, filteredIngredients, _effects, 20, qtys, searchOpts));
+        return outcome.results;
+      };
+      RecipeEngine.resetStats();
 
       if (!tierVal || tierVal === 'best') {
         const tiers = effectDef?.tiers ?? 0;
         if (tiers === 0) {
           // Un-tiered effect (hearty, energizing, enduring) — no tier to target
-          combos = RecipeEngine.findBestCombos(effectId, 0, filteredIngredients, _effects, 20, qtys);
+          combos = await search(0);
           // resolvedTier stays null
         } else {
           for (let t = tiers; t >= 1; t--) {
-            combos = RecipeEngine.findBestCombos(effectId, t, filteredIngredients, _effects, 20, qtys);
-            if (combos.length > 0) { resolvedTier = t; break; }
+            combos = await search(t);
+            // A lower tier is only "best" once this one is proven empty, so a
+            // timeout stops here rather than spending the leftovers below
+            if (combos.length > 0 || !outcome.complete) { resolvedTier = t; break; }
           }
         }
       } else {
         resolvedTier = parseInt(tierVal, 10) || 1;
-        combos = RecipeEngine.findBestCombos(effectId, resolvedTier, filteredIngredients, _effects, 20, qtys);
+        combos = await search(resolvedTier);
       }
+      if (seq !== _searchSeq) return;
 
       // Deduplicate by effective outcome
+      const dedupStart = performance.now();
+      const beforeDedup = combos.length;
       const goalSeen = new Set();
       combos = combos.filter(c => {
         const key = `${c.ingredients.length}|${c.result.sellValue}|${c.result.tier}|${c.result.effect?.durationSec ?? 0}`;
@@ -197,26 +218,32 @@ const GoalMode = (() => {
         goalSeen.add(key);
         return true;
       });
+      RecipeEngine.recordPhase('dedup', performance.now() - dedupStart, beforeDedup - combos.length);
+      Results.renderPerfPanel(RecipeEngine.getStats(), `Goal: ${effectId} (anytime)`);
 
       const tierName = resolvedTier
         ? (effectDef?.tier_names?.[resolvedTier - 1] || `Tier ${resolvedTier}`)
         : '';
-      const title = tierName
+      const title = (tierName
         ? `${effectDef?.name || effectId} — ${tierName}`
-        : (effectDef?.name || effectId);
+        : (effectDef?.name || effectId)) + (pareto ? ' (trade-offs)' : '');
 
       if (resultsEl) {
         resultsEl.innerHTML = '';
         if (combos.length === 0) {
-          const noResultsHint = (effectDef?.tiers ?? 0) === 0
-            ? `No combos found for ${title}. Check that the relevant ingredients aren't filtered out.`
-            : `No combos found for ${title}. Try a lower tier.`;
+          const noResultsHint = outcome && !outcome.complete
+            ? `⏳ The search for ${title} hit its time limit before finding a combo. Narrow the filters or pick a lower tier.`
+            : (effectDef?.tiers ?? 0) === 0
+              ? `No combos found for ${title}. Check that the relevant ingredients aren't filtered out.`
+              : `No combos found for ${title}. Try a lower tier.`;
           resultsEl.innerHTML = `<p class="placeholder-text">${noResultsHint}</p>`;
         } else {
           const heading = document.createElement('p');
           heading.style.cssText = 'font-size:12px;color:var(--text-secondary);margin-bottom:8px;';
           heading.textContent = `${combos.length} combo${combos.length !== 1 ? 's' : ''} found for ${title}. Click to load.`;
           resultsEl.appendChild(heading);
+          const note = Results.buildSearchNote(outcome, gap => RecipeEngine.formatDuration(gap));
+          if (note) resultsEl.appendChild(note);
           for (const combo of combos) resultsEl.appendChild(_buildComboCard(combo));
         }
       }
@@ -312,16 +339,7 @@ const GoalMode = (() => {
       IngredientGrid.setHighlightedIds([]);
       return;
     }
-    const hasElixirRoute = _ingredients.some(i => i.type === 'critter' && i.effect === effectId);
-    let ids;
-    if (hasElixirRoute) {
-      ids = _ingredients
-        .filter(i => (i.type === 'critter' && i.effect === effectId) || i.type === 'monster')
-        .map(i => i.id);
-    } else {
-      ids = _ingredients.filter(i => i.effect === effectId).map(i => i.id);
-    }
-    IngredientGrid.setHighlightedIds(ids);
+    IngredientGrid.setHighlightedIds(DerivedCache.get('goal-relevant-ids').get(effectId) || []);
   }
 
   /**
@@ -330,15 +348,38 @@ const GoalMode = (() => {
    */
   function getRelevantIds(effectId) {
     if (!effectId) return null;
-    const hasElixirRoute = _ingredients.some(i => i.type === 'critter' && i.effect === effectId);
-    if (hasElixirRoute) {
-      return new Set(
-        _ingredients
-          .filter(i => (i.type === 'critter' && i.effect === effectId) || i.type === 'monster')
-          .map(i => i.id)
-      );
+    return new Set(DerivedCache.get('goal-relevant-ids').get(effectId) || []);
+  }
+
+  /**
+   * Effect dropdown groups: [{ label, options: [{ id, name }] }].
+   * Persisted by DerivedCache.
+   */
+  function buildEffectGroups(effects) {
+    return EFFECT_GROUPS.map(group => ({
+      label: group.label,
+      options: group.ids
+        .map(id => effects.find(e => e.id === id))
+        .filter(Boolean)
+        .map(e => ({ id: e.id, name: e.name })),
+    }));
+  }
+
+  /**
+   * Map<effectId, ingredientId[]> of everything that contributes to each effect:
+   * matching critters + all monster parts when an elixir route exists,
+   * otherwise the ingredients carrying the effect. Persisted by DerivedCache.
+   */
+  function buildRelevantIds(ingredients, effects) {
+    const relevant = new Map();
+    for (const { id: effectId } of effects) {
+      const hasElixirRoute = ingredients.some(i => i.type === 'critter' && i.effect === effectId);
+      const ids = hasElixirRoute
+        ? ingredients.filter(i => (i.type === 'critter' && i.effect === effectId) || i.type === 'monster')
+        : ingredients.filter(i => i.effect === effectId);
+      relevant.set(effectId, ids.map(i => i.id));
     }
-    return new Set(_ingredients.filter(i => i.effect === effectId).map(i => i.id));
+    return relevant;
   }
 
   function onQtyChange(id, qty) {
@@ -348,5 +389,5 @@ const GoalMode = (() => {
 
   function getViewMode() { return _viewMode; }
 
-  return { activate, getViewMode, getRelevantIds, onQtyChange };
+  return { activate, getViewMode, getRelevantIds, onQtyChange, buildEffectGroups, buildRelevantIds };
 })();
@@ -2,12 +2,15 @@
  * ingredient.js — Ingredient Mode
  *
  * User picks up to 5 ingredients; recipe is computed in real-time when they cook.
- * Grid shows all ingredients filtered by current category/search state.
+ * Grid shows all ingredients filtered by current category/search state. While
+ * the builder holds 1–4 ingredients, every card previews what adding it would
+ * do, from one RecipeEngine.previewAdditions pass per builder change.
  */
 
 const IngredientMode = (() => {
   let _effects = [];
   let _currentIngredients = [];
+  let _previewFrame = 0;
 
   function activate(effects) {
     _effects = effects;
@@ -25,6 +28,7 @@ const IngredientMode = (() => {
     // Sync grid selection from builder's current state
     _currentIngredients = RecipeBuilder.getIngredients();
     IngredientGrid.setSelectedIds(_currentIngredients.map(i => i.id));
+    _schedulePreviews();
 
     // Real-time result as builder changes (via app.js bridge)
   }
@@ -46,6 +50,7 @@ const IngredientMode = (() => {
   function onRecipeChanged(ingredients) {
     _currentIngredients = ingredients;
     IngredientGrid.setSelectedIds(ingredients.map(i => i.id));
+    _schedulePreviews();
     if (ingredients.length > 0) {
       _cook();
     } else {
@@ -58,6 +63,19 @@ const IngredientMode = (() => {
     Results.renderResult(result, _currentIngredients);
   }
 
+  // Recompute the grid's add-one previews before the next paint; builder
+  // changes within one frame share a single pass
+  function _schedulePreviews() {
+    if (_previewFrame) return;
+    _previewFrame = requestAnimationFrame(() => {
+      _previewFrame = 0;
+      const count = _currentIngredients.length;
+      IngredientGrid.setPreviews(count > 0 && !RecipeBuilder.isFull()
+        ? RecipeEngine.previewAdditions(_currentIngredients, Data.getIngredients(), _effects)
+        : null);
+    });
+  }
+
   function cookNow() {
     _cook();
   }
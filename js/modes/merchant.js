@@ -2,15 +2,30 @@
  * merchant.js — Merchant Mode
  *
  * User checks off which ingredients they own (session-only state).
- * Engine computes all valid recipes from that inventory, ranked by sell value.
+ * Engine computes all valid recipes from that inventory, ranked by sell value,
+ * or plans how to cook the whole inventory for the most rupees. The ranking
+ * comes from a RecipeEngine merchant session, so recalculating after a few
+ * quantity changes only enumerates the combos those changes affect (data
+ * sets past 256 ingredients get no session and a full findAllValidRecipes).
+ * Inventories past the session's 30-ingredient cap get an anytime search
+ * over everything owned instead, stopped after ANYTIME_BUDGET_MS. Plans run
+ * in a search worker (SearchPool.planInventory), off the main thread.
  */
 
 const MerchantMode = (() => {
+  const MAX_RESULTS = 200; // the combo list is virtualized, so long lists are cheap
+  const SESSION_MAX_OWNED = 30;
+  const ANYTIME_BUDGET_MS = 1500;
   let _effects = [];
   let _ingredients = [];
   let _ownedQtys = new Map(); // id → qty (1–5), session only
+  let _searchSeq = 0;         // bumps per calculation so a stale one can't overwrite the results
+  let _session = null;        // RecipeEngine.createMerchantSession, kept across calculations
 
   function activate(ingredients, effects) {
+    if (ingredients !== _ingredients || effects !== _effects) {
+      _session = RecipeEngine.createMerchantSession(ingredients, effects);
+    }
     _effects = effects;
     _ingredients = ingredients;
 
@@ -27,9 +42,11 @@ const MerchantMode = (() => {
     const checkAllBtn = document.getElementById('merchant-check-all');
     const checkNoneBtn = document.getElementById('merchant-check-none');
     const calcBtn = document.getElementById('merchant-calc-btn');
+    const planBtn = document.getElementById('merchant-plan-btn');
     checkAllBtn?.replaceWith(checkAllBtn.cloneNode(true));
     checkNoneBtn?.replaceWith(checkNoneBtn.cloneNode(true));
     calcBtn?.replaceWith(calcBtn.cloneNode(true));
+    planBtn?.replaceWith(planBtn.cloneNode(true));
 
     document.getElementById('merchant-check-all')?.addEventListener('click', () => {
       const grid = document.getElementById('ingredient-grid');
@@ -46,6 +63,7 @@ const MerchantMode = (() => {
     });
 
     document.getElementById('merchant-calc-btn')?.addEventListener('click', _calculate);
+    document.getElementById('merchant-plan-btn')?.addEventListener('click', _plan);
 
     document.getElementById('results-content').innerHTML =
       '<p class="placeholder-text">Set quantities for ingredients you own, then click Calculate.</p>';
@@ -65,14 +83,62 @@ const MerchantMode = (() => {
       return;
     }
 
-    const capped = _ownedQtys.size > 30;
-    const label = capped ? 'Best Sell Value Recipes (top 30 by value)' : 'Best Sell Value Recipes';
-
     resultsEl.innerHTML = '<p class="placeholder-text">Calculating...</p>';
+    const seq = ++_searchSeq;
+
+    setTimeout(async () => {
+      RecipeEngine.resetStats();
+      let combos;
+      let outcome = null;
+      if (_ownedQtys.size > SESSION_MAX_OWNED) {
+        outcome = await SearchPool.searchAnytime(RecipeEngine.prepareMerchantSearch(
+          _ownedQtys, _ingredients, _effects, MAX_RESULTS, { timeBudgetMs: ANYTIME_BUDGET_MS }));
+        combos = outcome.results;
+      } else if (_session) {
+        _session.update(_ownedQtys);
+        combos = _session.results(MAX_RESULTS);
+      } else {
+        // No session past 256 ingredients (packed ranks are bytes): plain exact search
+        combos = RecipeEngine.findAllValidRecipes(_ownedQtys, _ingredients, _effects, MAX_RESULTS);
+      }
+      if (seq !== _searchSeq) return;
+      Results.renderComboList(combos, 'Best Sell Value Recipes');
+      const note = Results.buildSearchNote(outcome, gap => `${gap} rupees`);
+      if (note && combos.length > 0) resultsEl.querySelector('h3')?.after(note);
+      Results.renderPerfPanel(RecipeEngine.getStats(), `Merchant: ${_ownedQtys.size} owned${outcome ? ' (anytime)' : ''}`);
+    }, 10);
+  }
+
+  function _plan() {
+    const resultsEl = document.getElementById('results-content');
+    if (!resultsEl) return;
+
+    if (_ownedQtys.size === 0) {
+      resultsEl.innerHTML = '<p class="placeholder-text">Set at least one ingredient quantity first.</p>';
+      return;
+    }
 
-    setTimeout(() => {
-      const combos = RecipeEngine.findAllValidRecipes(_ownedQtys, _ingredients, _effects, 30);
-      Results.renderComboList(combos, label);
+    resultsEl.innerHTML = '<p class="placeholder-text">Planning...</p>';
+    const seq = ++_searchSeq;
+
+    setTimeout(async () => {
+      RecipeEngine.resetStats();
+      const plan = await SearchPool.planInventory(_ownedQtys, _ingredients, _effects);
+      if (seq !== _searchSeq) return;
+      const count = plan.recipes.length;
+      Results.renderComboList(plan.recipes,
+        `Cooking Plan — ${count} recipe${count === 1 ? '' : 's'}, ${plan.totalValue} rupees total`);
+
+      if (count > 0) {
+        const unusedQty = plan.unused.reduce((sum, u) => sum + u.qty, 0);
+        const note = document.createElement('p');
+        note.className = 'plan-summary';
+        note.textContent = `At most ${plan.upperBound - plan.totalValue} rupees short of the best possible plan.` +
+          (unusedQty ? ` ${unusedQty} item${unusedQty === 1 ? '' : 's'} left uncooked: ` +
+            plan.unused.map(u => `${u.ingredient.name} ×${u.qty}`).join(', ') + '.' : '');
+        resultsEl.querySelector('h3')?.after(note);
+      }
+      Results.renderPerfPanel(RecipeEngine.getStats(), `Plan: ${_ownedQtys.size} owned`);
     }, 10);
   }
 
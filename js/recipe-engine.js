@@ -24,6 +24,288 @@ const RecipeEngine = (() => {
   // Sell value multipliers by ingredient count
   const COUNT_SELL_MULT = { 1: 1.2, 2: 1.3, 3: 1.4, 4: 1.6, 5: 1.8 };
 
+  // Optional precomputed search tables (see buildSearchIndex)
+  let _searchIndex = null;
+
+  // Search instrumentation — counters only advance while debug is on.
+  // Searches accumulate into the current stats until resetStats().
+  let _debug = false;
+  let _stats = _emptyStats();
+
+  function _emptyStats() {
+    return {
+      searches: 0,
+      nodesVisited: 0,     // generateCombos calls
+      leavesEvaluated: 0,  // computeRecipe calls on complete combos
+      prunedSuffixCap: 0,  // subtrees cut because remaining items can't fill the slots
+      prunedBound: 0,      // anytime search: subtrees cut because they can't reach the results
+      resultsRetained: 0,  // combos kept for ranking
+      dedupDrops: 0,       // combos removed as value-equivalent duplicates
+      dominated: 0,        // combos discarded by the pareto front
+      phaseMs: { enumerate: 0, sort: 0, dedup: 0 },
+    };
+  }
+
+  function setDebug(on) { _debug = !!on; }
+  function isDebug() { return _debug; }
+  function resetStats() { _stats = _emptyStats(); }
+  function getStats() { return _stats; }
+
+  /** Let callers that post-process results (e.g. goal dedup) report into the stats. */
+  function recordPhase(phase, ms, dedupDrops = 0) {
+    if (!_debug) return;
+    _stats.phaseMs[phase] = (_stats.phaseMs[phase] || 0) + ms;
+    _stats.dedupDrops += dedupDrops;
+  }
+
+  /**
+   * Precompute what the searches would otherwise derive on every call:
+   *   nameRank         — Map<id, alphabetical rank> (canonical multiset order)
+   *   effectCandidates — Map<effectId, { critterIds, foodIds }> in name order
+   *   monsterIds       — all monster parts in name order
+   * Structured-cloneable so it can be persisted by DerivedCache.
+   */
+  function buildSearchIndex(allIngredients) {
+    const byName = [...allIngredients].sort((a, b) => a.name.localeCompare(b.name));
+    const nameRank = new Map(byName.map((ing, rank) => [ing.id, rank]));
+    const effectCandidates = new Map();
+    for (const ing of byName) {
+      if (!ing.effect || (ing.type !== 'critter' && ing.type !== 'food')) continue;
+      if (!effectCandidates.has(ing.effect)) effectCandidates.set(ing.effect, { critterIds: [], foodIds: [] });
+      const entry = effectCandidates.get(ing.effect);
+      (ing.type === 'critter' ? entry.critterIds : entry.foodIds).push(ing.id);
+    }
+    const monsterIds = byName.filter(i => i.type === 'monster').map(i => i.id);
+    return { nameRank, effectCandidates, monsterIds };
+  }
+
+  function setSearchIndex(index) { _searchIndex = index; }
+
+  /** Sort into canonical (alphabetical) order, via precomputed ranks when available. */
+  function _sortByName(list) {
+    const rank = _searchIndex?.nameRank;
+    if (rank && list.every(i => rank.has(i.id))) {
+      return [...list].sort((a, b) => rank.get(a.id) - rank.get(b.id));
+    }
+    return [...list].sort((a, b) => a.name.localeCompare(b.name));
+  }
+
+  // ── Packed search representation ──────────────────────────────────────────
+  //
+  // The searches score leaves from per-candidate typed arrays and keep accepted
+  // combos as rows of candidate indices + numeric scores. Full computeRecipe
+  // results are only built for the rows that are returned.
+
+  const KIND_MEAL = 0, KIND_ELIXIR = 1, KIND_DUBIOUS = 2;
+  const TYPE_FOOD = 0, TYPE_CRITTER = 1, TYPE_MONSTER = 2, TYPE_OTHER = 3;
+  const TYPE_CODES = { food: TYPE_FOOD, critter: TYPE_CRITTER, monster: TYPE_MONSTER };
+
+  // Scratch output of _scoreLeaf, reused for every leaf
+  const _leafScore = { kind: 0, effect: -1, tier: 0, duration: 0, hearts: 0, sell: 0 };
+
+  /** Candidate attributes as typed arrays (candidates.length must fit a byte). */
+  function _packCandidates(candidates, effects) {
+    const n = candidates.length;
+    const effectIds = [];
+    const effectIdx = new Map();
+    const packed = {
+      type: new Uint8Array(n),
+      effect: new Int16Array(n),
+      potency: new Float64Array(n),
+      duration: new Float64Array(n),
+      hearts: new Float64Array(n),
+      sell: new Float64Array(n),
+      effectIds,
+      thresholds: [],
+      potencyAcc: null,  // per-effect scratch accumulators for _scoreLeaf
+      durationAcc: null,
+      seen: new Int16Array(5),
+    };
+    candidates.forEach((ing, i) => {
+      packed.type[i] = TYPE_CODES[ing.type] ?? TYPE_OTHER;
+      if (ing.effect && !effectIdx.has(ing.effect)) {
+        effectIdx.set(ing.effect, effectIds.length);
+        effectIds.push(ing.effect);
+      }
+      packed.effect[i] = ing.effect ? effectIdx.get(ing.effect) : -1;
+      packed.potency[i] = ing.effect_potency || 0;
+      packed.duration[i] = ing.effect_duration_sec || 0;
+      packed.hearts[i] = ing.hearts || 0;
+      packed.sell[i] = ing.sell_price || 0;
+    });
+    packed.thresholds = effectIds.map(id => (effects || []).find(e => e.id === id)?.potency_thresholds || []);
+    packed.potencyAcc = new Float64Array(effectIds.length);
+    packed.durationAcc = new Float64Array(effectIds.length);
+    return packed;
+  }
+
+  /**
+   * Score combo[0..n) into `out` without allocating. Mirrors computeRecipe:
+   * determineRecipeType, computeDominantEffect (first-seen effect wins ties),
+   * computeHearts and computeSellValue.
+   */
+  function _scoreLeaf(p, combo, n, out) {
+    let food = 0, critter = 0, monster = 0, base = 0;
+    for (let j = 0; j < n; j++) {
+      const i = combo[j];
+      const t = p.type[i];
+      if (t === TYPE_FOOD) food++;
+      else if (t === TYPE_CRITTER) critter++;
+      else if (t === TYPE_MONSTER) monster++;
+      base += p.sell[i];
+    }
+    out.sell = _sellFor(base, n);
+    out.effect = -1;
+    out.tier = 0;
+    out.duration = 0;
+    out.hearts = 0;
+    if (food && !critter && !monster) out.kind = KIND_MEAL;
+    else if (critter && monster && !food) out.kind = KIND_ELIXIR;
+    else { out.kind = KIND_DUBIOUS; return; }
+
+    const elixir = out.kind === KIND_ELIXIR;
+    const route = elixir ? TYPE_CRITTER : TYPE_FOOD;
+    const pot = p.potencyAcc, dur = p.durationAcc, seen = p.seen;
+    let seenCount = 0, bonusPotency = 0, bonusDuration = 0, hearts = 0;
+    for (let j = 0; j < n; j++) {
+      const i = combo[j];
+      const t = p.type[i];
+      if (!elixir && t === TYPE_FOOD) hearts += p.hearts[i];
+      if (elixir && t === TYPE_MONSTER) {
+        bonusPotency += p.potency[i];
+        bonusDuration += p.duration[i];
+        continue;
+      }
+      const e = p.effect[i];
+      if (t !== route || e < 0) continue;
+      let k = 0;
+      while (k < seenCount && seen[k] !== e) k++;
+      if (k === seenCount) { seen[seenCount++] = e; pot[e] = 0; dur[e] = 0; }
+      pot[e] += p.potency[i];
+      dur[e] += p.duration[i];
+    }
+    out.hearts = hearts;
+
+    let best = -1, maxPotency = 0;
+    for (let k = 0; k < seenCount; k++) {
+      const e = seen[k];
+      if (pot[e] > maxPotency) { maxPotency = pot[e]; best = e; }
+    }
+    if (best < 0) return;
+
+    const potency = pot[best] + (elixir ? bonusPotency : 0);
+    out.effect = best;
+    out.duration = dur[best] + (elixir ? bonusDuration : 0);
+    const thresholds = p.thresholds[best];
+    for (let t = thresholds.length - 1; t >= 0; t--) {
+      if (potency >= thresholds[t]) { out.tier = t + 1; break; }
+    }
+  }
+
+  /**
+   * Growable table of accepted combos: 5 candidate-index bytes + scores per
+   * row, and `order` — the row's position in a single-threaded enumeration,
+   * which breaks ranking ties.
+   */
+  function _createComboStore() {
+    const COLUMNS = ['idx', 'size', 'effect', 'tier', 'duration', 'hearts', 'sell', 'order'];
+    let cap = 256;
+    let count = 0;
+    const store = {
+      idx: new Uint8Array(cap * 5),
+      size: new Uint8Array(cap),
+      effect: new Int16Array(cap),
+      tier: new Uint8Array(cap),
+      duration: new Float64Array(cap),
+      hearts: new Float64Array(cap),
+      sell: new Float64Array(cap),
+      order: new Float64Array(cap),
+      push(combo, n, leaf, order) {
+        if (count === cap) grow();
+        store.idx.set(combo.subarray(0, n), count * 5);
+        store.size[count] = n;
+        store.effect[count] = leaf.effect;
+        store.tier[count] = leaf.tier;
+        store.duration[count] = leaf.duration;
+        store.hearts[count] = leaf.hearts;
+        store.sell[count] = leaf.sell;
+        store.order[count] = order;
+        return count++;
+      },
+      /** Copy row `r` of another store (or of its columns()) into this one. */
+      append(src, r) {
+        if (count === cap) grow();
+        for (const key of COLUMNS) {
+          if (key === 'idx') store.idx.set(src.idx.subarray(r * 5, r * 5 + 5), count * 5);
+          else store[key][count] = src[key][r];
+        }
+        return count++;
+      },
+      get length() {
+        return count;
+      },
+      rows() {
+        return Array.from({ length: count }, (_, i) => i);
+      },
+      /**
+       * Drop rows for which keep(row) is false, compacting in place: kept rows
+       * move down in order, so when keep(row) runs every earlier kept row is
+       * already at its new id. Returns the number dropped.
+       */
+      retain(keep) {
+        const { idx, size, effect, tier, duration, hearts, sell, order } = store;
+        let write = 0;
+        for (let row = 0; row < count; row++) {
+          if (!keep(row, write)) continue;
+          if (write !== row) {
+            idx.copyWithin(write * 5, row * 5, row * 5 + 5);
+            size[write] = size[row];
+            effect[write] = effect[row];
+            tier[write] = tier[row];
+            duration[write] = duration[row];
+            hearts[write] = hearts[row];
+            sell[write] = sell[row];
+            order[write] = order[row];
+          }
+          write++;
+        }
+        const dropped = count - write;
+        count = write;
+        return dropped;
+      },
+      /** Just the given rows, as plain typed arrays (structured-cloneable). */
+      columns(rows) {
+        const out = { count: rows.length };
+        for (const key of COLUMNS) {
+          const width = key === 'idx' ? 5 : 1;
+          const col = new store[key].constructor(rows.length * width);
+          rows.forEach((row, i) => {
+            if (width === 1) col[i] = store[key][row];
+            else col.set(store.idx.subarray(row * 5, row * 5 + 5), i * 5);
+          });
+          out[key] = col;
+        }
+        return out;
+      },
+      materialize(row, candidates, effects) {
+        const ingredients = [];
+        for (let j = 0; j < store.size[row]; j++) ingredients.push(candidates[store.idx[row * 5 + j]]);
+        return { ingredients, result: computeRecipe(ingredients, effects) };
+      },
+    };
+
+    function grow() {
+      cap *= 2;
+      for (const key of COLUMNS) {
+        const next = new store[key].constructor(key === 'idx' ? cap * 5 : cap);
+        next.set(store[key]);
+        store[key] = next;
+      }
+    }
+
+    return store;
+  }
+
   /**
    * Determine what kind of recipe this is.
    * Returns: 'meal' | 'elixir' | 'dubious' | 'empty'
@@ -130,7 +412,11 @@ const RecipeEngine = (() => {
    */
   function computeSellValue(ingredients) {
     const base = ingredients.reduce((sum, i) => sum + (i.sell_price || 0), 0);
-    const mult = COUNT_SELL_MULT[Math.min(ingredients.length, 5)] || 1.2;
+    return _sellFor(base, ingredients.length);
+  }
+
+  function _sellFor(base, count) {
+    const mult = COUNT_SELL_MULT[Math.min(count, 5)] || 1.2;
     return Math.round(base * mult);
   }
 
@@ -219,6 +505,105 @@ const RecipeEngine = (() => {
     };
   }
 
+  // ── Add-one previews ───────────────────────────────────────────────────────
+  //
+  // Ingredient mode shows on each grid card what adding it would do to the
+  // builder's recipe. The slots are folded once into running totals (type
+  // counts, base sell, food hearts, monster bonus and per-effect potency and
+  // duration for the meal and elixir routes, in first-seen order); every
+  // candidate is then one more step on those totals.
+
+  function _previewTotals(ingredients, effects) {
+    const totals = {
+      count: ingredients.length, food: 0, critter: 0, monster: 0, base: 0, hearts: 0,
+      bonusPotency: 0, bonusDuration: 0,
+      routes: { food: [], critter: [] }, // [{ effectId, potency, duration }]
+      effectDefs: new Map((effects || []).map(e => [e.id, e])),
+    };
+    for (const ing of ingredients) {
+      if (ing.type === 'food') { totals.food++; totals.hearts += ing.hearts || 0; }
+      else if (ing.type === 'critter') totals.critter++;
+      else if (ing.type === 'monster') {
+        totals.monster++;
+        totals.bonusPotency += ing.effect_potency || 0;
+        totals.bonusDuration += ing.effect_duration_sec || 0;
+      }
+      totals.base += ing.sell_price || 0;
+
+      const route = totals.routes[ing.type];
+      if (!route || !ing.effect) continue;
+      let entry = route.find(e => e.effectId === ing.effect);
+      if (!entry) route.push(entry = { effectId: ing.effect, potency: 0, duration: 0 });
+      entry.potency += ing.effect_potency || 0;
+      entry.duration += ing.effect_duration_sec || 0;
+    }
+    return totals;
+  }
+
+  /** The totals plus `extra` (or nothing), scored like computeRecipe. */
+  function _previewWith(totals, extra) {
+    const count = totals.count + (extra ? 1 : 0);
+    if (count === 0) return { type: 'empty', effectId: null, tier: 0, durationSec: 0, hearts: 0, sellValue: 0 };
+
+    const food = totals.food + (extra?.type === 'food' ? 1 : 0);
+    const critter = totals.critter + (extra?.type === 'critter' ? 1 : 0);
+    const monster = totals.monster + (extra?.type === 'monster' ? 1 : 0);
+    const type = food && !critter && !monster ? 'meal' : critter && monster && !food ? 'elixir' : 'dubious';
+    const preview = {
+      type, effectId: null, tier: 0, durationSec: 0,
+      hearts: type === 'elixir' ? 0 : totals.hearts + (extra?.type === 'food' ? extra.hearts || 0 : 0),
+      sellValue: _sellFor(totals.base + (extra?.sell_price || 0), count),
+    };
+    if (type === 'dubious') return preview;
+
+    // Dominant effect: highest potency, ties to the first seen (the new
+    // ingredient's effect is seen last unless the recipe already has it)
+    const routeType = type === 'elixir' ? 'critter' : 'food';
+    const adds = extra?.type === routeType && extra.effect ? extra : null;
+    let best = null, maxPotency = 0;
+    const consider = (effectId, potency, duration) => {
+      if (potency > maxPotency) { maxPotency = potency; best = { effectId, potency, duration }; }
+    };
+    for (const e of totals.routes[routeType]) {
+      const mine = adds?.effect === e.effectId;
+      consider(e.effectId, e.potency + (mine ? adds.effect_potency || 0 : 0),
+        e.duration + (mine ? adds.effect_duration_sec || 0 : 0));
+    }
+    if (adds && !totals.routes[routeType].some(e => e.effectId === adds.effect)) {
+      consider(adds.effect, adds.effect_potency || 0, adds.effect_duration_sec || 0);
+    }
+    if (!best) return preview;
+
+    if (type === 'elixir') {
+      const monsterExtra = extra?.type === 'monster';
+      best.potency += totals.bonusPotency + (monsterExtra ? extra.effect_potency || 0 : 0);
+      best.duration += totals.bonusDuration + (monsterExtra ? extra.effect_duration_sec || 0 : 0);
+    }
+    const thresholds = totals.effectDefs.get(best.effectId)?.potency_thresholds || [];
+    for (let t = thresholds.length - 1; t >= 0; t--) {
+      if (best.potency >= thresholds[t]) { preview.tier = t + 1; break; }
+    }
+    preview.effectId = best.effectId;
+    preview.durationSec = best.duration;
+    return preview;
+  }
+
+  /**
+   * What adding each candidate to `ingredients` would cook, without a
+   * computeRecipe call per candidate. Previews carry { type, effectId, tier,
+   * durationSec, hearts, sellValue } — the same values computeRecipe gives
+   * for ingredients + [candidate].
+   *
+   * Returns: { current, previews: Map<id, preview> } — `current` is the
+   * same summary for `ingredients` alone, for deltas.
+   */
+  function previewAdditions(ingredients, candidates, effects) {
+    const totals = _previewTotals(ingredients || [], effects);
+    const previews = new Map();
+    for (const ing of candidates) previews.set(ing.id, _previewWith(totals, ing));
+    return { current: _previewWith(totals, null), previews };
+  }
+
   /**
    * Goal mode: find all ingredient combos (up to 5) that achieve targetEffectId at >= targetTier.
    * Ingredients may repeat (e.g. 5× same critter for max duration).
@@ -227,29 +612,56 @@ const RecipeEngine = (() => {
    *   owned ingredients at their specified quantities. When null, all allIngredients are fair
    *   game with unlimited repetition (capped per item at 5 = recipe max).
    *
+   * @param {Object} [options]
+   * @param {boolean} [options.pareto=false] - Keep only the non-dominated set over
+   *   (duration ↑, ingredient count ↓, hearts ↑, sell value ↑). Dominated combos
+   *   are discarded as soon as they're found instead of being kept for the sort.
+   *
    * Sorted: longest duration → fewest ingredients → most hearts → best sell value.
    */
-  function findBestCombos(targetEffectId, targetTier, allIngredients, effects, maxResults = 20, ownedQtys = null) {
-    const effectDef = (effects || []).find(e => e.id === targetEffectId);
-    if (!effectDef) return [];
+  function findBestCombos(targetEffectId, targetTier, allIngredients, effects, maxResults = 20, ownedQtys = null, options = {}) {
+    const job = prepareGoalSearch(targetEffectId, targetTier, allIngredients, effects, maxResults, ownedQtys, options);
+    return job ? mergePartials(job, [searchBranches(job, listBranches(job))]) : [];
+  }
 
-    const isElixirEffect = allIngredients.some(i => i.type === 'critter' && i.effect === targetEffectId);
+  /**
+   * Candidate selection for findBestCombos. Returns a search job (see
+   * searchBranches) or null when nothing can produce the effect.
+   *
+   * With options.timeBudgetMs the job is for searchAnytime instead: no
+   * monster-part cap, candidates in promise order (see _sortByPromise).
+   */
+  function prepareGoalSearch(targetEffectId, targetTier, allIngredients, effects, maxResults = 20, ownedQtys = null, options = {}) {
+    const effectDef = (effects || []).find(e => e.id === targetEffectId);
+    if (!effectDef) return null;
 
+    let isElixirEffect;
     let candidates;
-    if (isElixirEffect) {
-      candidates = allIngredients.filter(i =>
-        (i.type === 'critter' && i.effect === targetEffectId) || i.type === 'monster'
-      );
+    const indexed = _searchIndex?.effectCandidates.get(targetEffectId);
+    if (indexed) {
+      const available = new Map(allIngredients.map(i => [i.id, i]));
+      const pick = ids => ids.map(id => available.get(id)).filter(Boolean);
+      const critters = pick(indexed.critterIds);
+      isElixirEffect = critters.length > 0;
+      candidates = isElixirEffect ? [...critters, ...pick(_searchIndex.monsterIds)] : pick(indexed.foodIds);
     } else {
-      candidates = allIngredients.filter(i =>
-        i.type === 'food' && i.effect === targetEffectId
-      );
+      isElixirEffect = allIngredients.some(i => i.type === 'critter' && i.effect === targetEffectId);
+      if (isElixirEffect) {
+        candidates = allIngredients.filter(i =>
+          (i.type === 'critter' && i.effect === targetEffectId) || i.type === 'monster'
+        );
+      } else {
+        candidates = allIngredients.filter(i =>
+          i.type === 'food' && i.effect === targetEffectId
+        );
+      }
     }
 
+    const anytime = options.timeBudgetMs != null;
     if (ownedQtys) {
       // Constrain to owned items only
       candidates = candidates.filter(i => (ownedQtys.get(i.id) || 0) > 0);
-    } else if (isElixirEffect) {
+    } else if (isElixirEffect && !anytime) {
       // Unlimited mode: cap monster parts to keep search space manageable.
       // Keep all critters (essential) + top 12 monster parts by sell price.
       const critters = candidates.filter(i => i.type === 'critter');
@@ -259,61 +671,52 @@ const RecipeEngine = (() => {
       candidates = [...critters, ...monsters];
     }
 
-    if (candidates.length === 0) return [];
+    if (candidates.length === 0) return null;
+    if (_debug) _stats.searches++;
 
-    // Alphabetical order for canonical multiset generation
-    candidates = [...candidates].sort((a, b) => a.name.localeCompare(b.name));
+    // Alphabetical order for canonical multiset generation (anytime: promise order)
+    candidates = anytime ? _sortByPromise(candidates, 'goal') : _sortByName(candidates);
 
-    // Per-item max slots: from ownedQtys if constrained, otherwise 5 (recipe max)
-    const getMaxQty = (id) => ownedQtys ? Math.min(ownedQtys.get(id) || 0, 5) : 5;
-
-    // Suffix capacity for pruning: can remaining items fill slotsLeft?
-    const suffixCap = new Array(candidates.length + 1).fill(0);
-    for (let k = candidates.length - 1; k >= 0; k--) {
-      suffixCap[k] = suffixCap[k + 1] + getMaxQty(candidates[k].id);
-    }
-
-    const results = [];
-
-    function generateCombos(itemIdx, slotsLeft, current) {
-      if (slotsLeft === 0) {
-        const recipe = computeRecipe(current, effects);
-        if (recipe.type === 'dubious') return;
-        if (!recipe.effect) return;
-        if (recipe.effect.effectId !== targetEffectId) return;
-        if (targetTier > 0 && recipe.effect.tier < targetTier) return;
-        results.push({ ingredients: [...current], result: recipe });
-        return;
-      }
-      if (itemIdx >= candidates.length) return;
-      if (suffixCap[itemIdx] < slotsLeft) return;
+    return {
+      mode: 'goal',
+      candidates,
+      // Per-item max slots: from ownedQtys if constrained, otherwise 5 (recipe max)
+      maxQty: candidates.map(i => ownedQtys ? Math.min(ownedQtys.get(i.id) || 0, 5) : 5),
+      effects,
+      maxResults,
+      targetEffectId,
+      targetTier,
+      pareto: !!options.pareto,
+      ...(anytime && _anytimeFields(candidates, options.timeBudgetMs)),
+      debug: _debug,
+    };
+  }
 
-      const item = candidates[itemIdx];
-      const maxK = Math.min(getMaxQty(item.id), slotsLeft);
-      for (let k = 0; k <= maxK; k++) {
-        for (let j = 0; j < k; j++) current.push(item);
-        generateCombos(itemIdx + 1, slotsLeft - k, current);
-        for (let j = 0; j < k; j++) current.pop();
+  /**
+   * Pareto bookkeeping for findBestCombos: returns false if a combo of `size`
+   * ingredients scoring `leaf` is dominated by (or ties) a row in `front`;
+   * otherwise evicts the rows it dominates and returns true so the caller can
+   * append it. A tie goes to the earlier serial `order`, which only matters
+   * when combos arrive out of serial order (searchAnytime).
+   */
+  function _paretoInsert(store, front, size, leaf, order = Infinity) {
+    const { duration: dur, hearts, sell } = leaf;
+    let write = 0;
+    for (let read = 0; read < front.length; read++) {
+      const o = front[read];
+      const oDur = store.duration[o];
+      const oSize = store.size[o];
+      const oHearts = store.hearts[o];
+      const oSell = store.sell[o];
+      if (oDur >= dur && oSize <= size && oHearts >= hearts && oSell >= sell) {
+        const tie = oDur === dur && oSize === size && oHearts === hearts && oSell === sell;
+        if (!tie || store.order[o] < order) return false; // existing entry is at least as good on every objective
       }
+      const dominatedByNew = dur >= oDur && size <= oSize && hearts >= oHearts && sell >= oSell;
+      if (!dominatedByNew) front[write++] = o;
     }
-
-    // Largest combos first — 5-ingredient recipes tend to have the longest duration
-    for (let size = 5; size >= 1; size--) {
-      generateCombos(0, size, []);
-    }
-
-    // Sort: longest duration → fewest ingredients → most hearts → best sell value
-    results.sort((a, b) => {
-      const durDiff = (b.result.effect?.durationSec ?? 0) - (a.result.effect?.durationSec ?? 0);
-      if (durDiff !== 0) return durDiff;
-      const sizeDiff = a.ingredients.length - b.ingredients.length;
-      if (sizeDiff !== 0) return sizeDiff;
-      const heartsDiff = b.result.hearts - a.result.hearts;
-      if (heartsDiff !== 0) return heartsDiff;
-      return b.result.sellValue - a.result.sellValue;
-    });
-
-    return results.slice(0, maxResults);
+    front.length = write;
+    return true;
   }
 
   /**
@@ -324,76 +727,1047 @@ const RecipeEngine = (() => {
    * the old "infinite" mode since recipes cap at 5 ingredients.
    */
   function findAllValidRecipes(ownedQtys, allIngredients, effects, maxResults = 30) {
-    const owned = allIngredients.filter(i => (ownedQtys.get(i.id) || 0) > 0);
-    if (owned.length === 0) return [];
+    const job = prepareMerchantSearch(ownedQtys, allIngredients, effects, maxResults);
+    return job ? mergePartials(job, [searchBranches(job, listBranches(job))]) : [];
+  }
+
+  /**
+   * Candidate selection for findAllValidRecipes; a search job or null.
+   * With options.timeBudgetMs the job is for searchAnytime instead: every
+   * owned ingredient (no 30-item cap), in promise order.
+   */
+  function prepareMerchantSearch(ownedQtys, allIngredients, effects, maxResults = 30, options = {}) {
+    const anytime = options.timeBudgetMs != null;
+    let candidates = anytime
+      ? allIngredients.filter(i => (ownedQtys.get(i.id) || 0) > 0)
+      : _merchantCandidates(ownedQtys, allIngredients);
+    if (candidates.length === 0) return null;
+    if (_debug) _stats.searches++;
+
+    // Alphabetical order → canonical multiset ordering, no dedup needed.
+    // Anytime: most valuable first, and at most 256 (combo rows store byte indices)
+    candidates = anytime ? _sortByPromise(candidates, 'merchant').slice(0, 256) : _sortByName(candidates);
 
-    // Cap candidates to avoid combinatorial explosion; always preserve critters.
+    return {
+      mode: 'merchant',
+      candidates,
+      maxQty: candidates.map(i => Math.min(ownedQtys.get(i.id) || 0, 5)),
+      effects,
+      maxResults,
+      ...(anytime && _anytimeFields(candidates, options.timeBudgetMs)),
+      debug: _debug,
+    };
+  }
+
+  /** Owned ingredients, capped to avoid combinatorial explosion; always preserves critters. */
+  function _merchantCandidates(ownedQtys, allIngredients) {
     const CAP = 30;
-    let candidates = owned;
-    if (owned.length > CAP) {
-      const critters = owned.filter(i => i.type === 'critter');
-      const nonCritters = owned.filter(i => i.type !== 'critter')
-        .sort((a, b) => b.sell_price - a.sell_price)
-        .slice(0, Math.max(CAP - critters.length, 8));
-      candidates = [...critters, ...nonCritters];
+    const owned = allIngredients.filter(i => (ownedQtys.get(i.id) || 0) > 0);
+    if (owned.length <= CAP) return owned;
+    const critters = owned.filter(i => i.type === 'critter');
+    const nonCritters = owned.filter(i => i.type !== 'critter')
+      .sort((a, b) => b.sell_price - a.sell_price)
+      .slice(0, Math.max(CAP - critters.length, 8));
+    return [...critters, ...nonCritters];
+  }
+
+  /**
+   * Merchant mode, incrementally: keeps every valid combo of the last
+   * inventory it saw, so update() after a quantity change only enumerates the
+   * combos the changed ingredients newly allow, or drops the ones they no
+   * longer can fill. results() ranks exactly like findAllValidRecipes.
+   *
+   * Combos are stored as name ranks over all ingredients rather than
+   * candidate indices, so a combo's serial enumeration order — larger combos
+   * first, then descending rank sequence — doesn't depend on what else is
+   * owned. Returns null if there are too many ingredients for byte ranks.
+   *
+   * Returns { update(ownedQtys) → number of ingredients that changed,
+   *           results(maxResults) → [{ ingredients, result }] }.
+   */
+  function createMerchantSession(allIngredients, effects) {
+    const universe = _sortByName(allIngredients);
+    if (universe.length > 256) return null;
+    const n = universe.length;
+    const rankOf = new Map(universe.map((ing, r) => [ing.id, r]));
+    const packed = _packCandidates(universe, effects);
+    const caps = new Uint8Array(n); // uses allowed per ingredient in the stored combos (0 = not a candidate)
+    const store = _createComboStore();
+    // Value-equivalent outcome (same sell value + effect + tier) → its first row
+    // in serial order; kept up to date as combos are added, rebuilt on drops
+    let best = new Map();
+
+    function update(ownedQtys) {
+      const stats = _debug ? _stats : null;
+      if (stats) stats.searches++;
+      const next = new Uint8Array(n);
+      for (const ing of _merchantCandidates(ownedQtys, allIngredients)) {
+        next[rankOf.get(ing.id)] = Math.min(ownedQtys.get(ing.id) || 0, 5);
+      }
+
+      const t0 = performance.now();
+      let changed = 0;
+      let shrunk = false;
+      for (let r = 0; r < n; r++) {
+        if (next[r] !== caps[r]) changed++;
+        if (next[r] < caps[r]) shrunk = true;
+      }
+      // Drops first, in one pass, so no combo is enumerated only to be dropped
+      if (shrunk) {
+        const { idx, size } = store;
+        best = new Map();
+        store.retain((row, newRow) => {
+          const end = row * 5 + size[row];
+          for (let j = row * 5; j < end; j++) {
+            const r = idx[j];
+            if (next[r] >= caps[r]) continue;
+            let uses = 1;
+            while (j + 1 < end && idx[j + 1] === r) { uses++; j++; }
+            if (uses > next[r]) return false;
+          }
+          _noteBest(row, newRow);
+          return true;
+        });
+        for (let r = 0; r < n; r++) if (next[r] < caps[r]) caps[r] = next[r];
+      }
+      for (let r = 0; r < n; r++) {
+        if (next[r] > caps[r]) {
+          _grow(r, caps[r], next[r], stats);
+          caps[r] = next[r];
+        }
+      }
+      if (stats) stats.phaseMs.enumerate += performance.now() - t0;
+      return changed;
     }
 
-    // Alphabetical order → canonical multiset ordering, no dedup needed.
-    candidates = [...candidates].sort((a, b) => a.name.localeCompare(b.name));
+    /**
+     * Add every valid combo that uses ingredient x more than `lo` and at most
+     * `hi` times, the other slots filled from the current candidates.
+     */
+    function _grow(x, lo, hi, stats) {
+      const others = [];
+      for (let r = 0; r < n; r++) if (r !== x && caps[r] > 0) others.push(r);
+      const suffixCap = _suffixCap(others.map(r => caps[r]));
+      const picked = new Uint8Array(5);
+      const combo = new Uint8Array(5);
+      const leaf = _leafScore;
+      let depth = 0;
+      let xUses = 0;
+
+      function emit() {
+        // Merge x's copies into the ascending picks → canonical (name) order
+        let size = 0, j = 0;
+        while (j < depth && picked[j] < x) combo[size++] = picked[j++];
+        for (let k = 0; k < xUses; k++) combo[size++] = x;
+        while (j < depth) combo[size++] = picked[j++];
+        if (stats) stats.leavesEvaluated++;
+        _scoreLeaf(packed, combo, size, leaf);
+        if (leaf.kind === KIND_DUBIOUS) return;
+        if (stats) stats.resultsRetained++;
+        const row = store.push(combo, size, leaf, _serialOrder(combo, size));
+        _noteBest(row, row);
+      }
+
+      function generateCombos(itemIdx, slotsLeft) {
+        if (stats) stats.nodesVisited++;
+        if (slotsLeft === 0) { emit(); return; }
+        if (itemIdx >= others.length || suffixCap[itemIdx] < slotsLeft) return;
+        const maxK = Math.min(caps[others[itemIdx]], slotsLeft);
+        for (let k = 0; k <= maxK; k++) {
+          for (let j = 0; j < k; j++) picked[depth++] = others[itemIdx];
+          generateCombos(itemIdx + 1, slotsLeft - k);
+          depth -= k;
+        }
+      }
+
+      for (xUses = lo + 1; xUses <= hi; xUses++) {
+        for (let rest = 0; rest <= 5 - xUses; rest++) generateCombos(0, rest);
+      }
+    }
+
+    /** Record the row now at `row`, to live at `newRow` (they differ while compacting). */
+    function _noteBest(row, newRow) {
+      const { sell, effect, tier, order } = store;
+      const rKey = (sell[row] * 256 + effect[row] + 1) * 16 + tier[row];
+      const b = best.get(rKey);
+      if (b === undefined || order[row] < order[b]) best.set(rKey, newRow);
+    }
+
+    function results(maxResults = 30) {
+      const stats = _debug ? _stats : null;
+      if (stats) stats.dedupDrops += store.length - best.size;
+
+      const t0 = performance.now();
+      const { sell, order } = store;
+      const ranked = [...best.values()].sort((a, b) => (sell[b] - sell[a]) || (order[a] - order[b]));
+      if (stats) stats.phaseMs.sort += performance.now() - t0;
+      return ranked.slice(0, maxResults).map(row => store.materialize(row, universe, effects));
+    }
+
+    return { update, results };
+  }
+
+  /**
+   * Sort key reproducing the serial enumeration order of a canonical combo
+   * of name ranks: larger combos first, then descending rank sequence.
+   */
+  function _serialOrder(combo, size) {
+    let seq = 0;
+    for (let j = 0; j < 5; j++) seq = seq * 256 + (j < size ? combo[j] : 0);
+    return (5 - size) * 2 ** 40 + (2 ** 40 - 1 - seq);
+  }
 
-    // Precompute suffix capacity for pruning: max slots each remaining item can fill.
-    const suffixCap = new Array(candidates.length + 1).fill(0);
-    for (let k = candidates.length - 1; k >= 0; k--) {
-      suffixCap[k] = suffixCap[k + 1] + Math.min(ownedQtys.get(candidates[k].id) || 0, 5);
+  // ── Branch-partitioned search ──────────────────────────────────────────────
+  //
+  // Both searches enumerate canonical multisets: candidates in name order,
+  // candidate i used 0..maxQty[i] times. A top-level branch fixes the first
+  // candidate used and its count — { size, item, count } covers every combo of
+  // `size` ingredients whose lowest candidate is `item`, used exactly `count`
+  // times — so the branches partition the search. Any grouping of branches
+  // can be searched on its own (searchBranches, or searchAnytime in a
+  // SearchPool worker) and the groups' local top rows merged (mergePartials);
+  // rows carry their single-threaded enumeration order, so merged results
+  // match a serial run exactly, ties included.
+
+  function _suffixCap(maxQty) {
+    // Suffix capacity for pruning: can candidates[k..] fill the remaining slots?
+    const suffixCap = new Array(maxQty.length + 1).fill(0);
+    for (let k = maxQty.length - 1; k >= 0; k--) suffixCap[k] = suffixCap[k + 1] + maxQty[k];
+    return suffixCap;
+  }
+
+  /**
+   * Every feasible top-level branch of a job, in serial enumeration order
+   * (largest combos first, then by descending first candidate), with `cost`
+   * estimating its leaves (quantity caps ignored).
+   */
+  function listBranches(job) {
+    const { maxQty } = job;
+    const n = maxQty.length;
+    const suffixCap = _suffixCap(maxQty);
+    const branches = [];
+    for (let size = 5; size >= 1; size--) {
+      for (let item = n - 1; item >= 0; item--) {
+        const maxK = Math.min(maxQty[item], size);
+        for (let count = 1; count <= maxK; count++) {
+          const rest = size - count;
+          if (suffixCap[item + 1] < rest) continue;
+          branches.push({ ordinal: branches.length, size, item, count, cost: _multisets(n - item - 1, rest) });
+        }
+      }
     }
+    return branches;
+  }
 
-    const results = [];
+  /** Multisets of r items drawn from m kinds: C(m + r - 1, r). */
+  function _multisets(m, r) {
+    let c = 1;
+    for (let j = 1; j <= r; j++) c = c * (m + j - 1) / j;
+    return Math.round(c);
+  }
+
+  /**
+   * Search the given branches of a job and return the local top rows as
+   * store columns (see _createComboStore) — everything that can still make
+   * the merged top maxResults.
+   */
+  function searchBranches(job, branches) {
+    const { candidates, maxQty } = job;
+    const goal = job.mode === 'goal';
+    const pareto = goal && job.pareto;
+    const targetTier = job.targetTier || 0;
+    const suffixCap = _suffixCap(maxQty);
+    const packed = _packCandidates(candidates, job.effects);
+    const targetIdx = goal ? packed.effectIds.indexOf(job.targetEffectId) : -1;
+    const store = _createComboStore();
+    const front = []; // pareto mode: row ids of the current non-dominated set
+    const leaf = _leafScore;
+    const combo = new Uint8Array(5);
+    let depth = 0;
+    let order = 0;    // next row's serial position: branch ordinal × 2^32 + rows so far
+    const stats = _debug ? _stats : null;
 
     // Recursively build multiset combos of exactly `slotsLeft` items from
     // candidates[itemIdx..], using each item at most min(qty, slotsLeft) times.
-    function generateCombos(itemIdx, slotsLeft, current) {
+    function generateCombos(itemIdx, slotsLeft) {
+      if (stats) stats.nodesVisited++;
       if (slotsLeft === 0) {
-        const recipe = computeRecipe(current, effects);
-        if (recipe.type !== 'dubious') {
-          results.push({ ingredients: [...current], result: recipe });
+        if (stats) stats.leavesEvaluated++;
+        _scoreLeaf(packed, combo, depth, leaf);
+        if (leaf.kind === KIND_DUBIOUS) return;
+        if (goal) {
+          if (leaf.effect < 0 || leaf.effect !== targetIdx) return;
+          if (targetTier > 0 && leaf.tier < targetTier) return;
+        }
+        if (pareto) {
+          const before = front.length;
+          const kept = _paretoInsert(store, front, depth, leaf);
+          if (stats) stats.dominated += kept ? before - front.length : 1;
+          if (!kept) return;
         }
+        if (stats) stats.resultsRetained++;
+        const row = store.push(combo, depth, leaf, order++);
+        if (pareto) front.push(row);
         return;
       }
       if (itemIdx >= candidates.length) return;
-      if (suffixCap[itemIdx] < slotsLeft) return; // can't fill remaining slots
+      if (suffixCap[itemIdx] < slotsLeft) { // can't fill remaining slots
+        if (stats) stats.prunedSuffixCap++;
+        return;
+      }
 
-      const item = candidates[itemIdx];
-      const maxK = Math.min(ownedQtys.get(item.id) || 0, slotsLeft);
+      const maxK = Math.min(maxQty[itemIdx], slotsLeft);
       for (let k = 0; k <= maxK; k++) {
-        for (let j = 0; j < k; j++) current.push(item);
-        generateCombos(itemIdx + 1, slotsLeft - k, current);
-        for (let j = 0; j < k; j++) current.pop();
+        for (let j = 0; j < k; j++) combo[depth++] = itemIdx;
+        generateCombos(itemIdx + 1, slotsLeft - k);
+        depth -= k;
       }
     }
 
-    for (let size = 5; size >= 1; size--) {
-      generateCombos(0, size, []);
+    // Serial order within the group, so pareto ties resolve as in a serial run
+    const t0 = performance.now();
+    for (const { ordinal, size, item, count } of [...branches].sort((a, b) => a.ordinal - b.ordinal)) {
+      for (depth = 0; depth < count; depth++) combo[depth] = item;
+      order = ordinal * 2 ** 32;
+      generateCombos(item + 1, size - count);
     }
+    if (stats) stats.phaseMs.enumerate += performance.now() - t0;
+
+    return store.columns(_rankRows(job, store, pareto ? front : store.rows(), true));
+  }
 
-    results.sort((a, b) => b.result.sellValue - a.result.sellValue);
+  /**
+   * Sort rows into result order and drop what can't be returned:
+   *   goal     — longest duration → fewest ingredients → most hearts → best
+   *              sell value; a local pareto front is kept whole, as rows
+   *              from other branches may still evict its leaders.
+   *   merchant — sell value descending, deduplicated by value-equivalent
+   *              outcome (same sell value + effect + tier).
+   */
+  function _rankRows(job, store, rows, local) {
+    const stats = _debug ? _stats : null;
+    const { duration, size, hearts, sell, effect, tier, order } = store;
 
-    // Deduplicate value-equivalent outcomes: same sell value + effect + tier.
+    let t0 = performance.now();
+    if (job.mode === 'goal') {
+      rows.sort((a, b) =>
+        (duration[b] - duration[a]) || (size[a] - size[b]) || (hearts[b] - hearts[a]) ||
+        (sell[b] - sell[a]) || (order[a] - order[b]));
+    } else {
+      rows.sort((a, b) => (sell[b] - sell[a]) || (order[a] - order[b]));
+    }
+    if (stats) stats.phaseMs.sort += performance.now() - t0;
+
+    if (job.mode === 'goal') return local && job.pareto ? rows : rows.slice(0, job.maxResults);
+
+    t0 = performance.now();
     const rankSeen = new Set();
-    const deduped = results.filter(r => {
-      const rKey = `${r.result.sellValue}|${r.result.effect?.effectId ?? 'none'}|${r.result.tier}`;
+    const deduped = rows.filter(row => {
+      const rKey = (sell[row] * 256 + effect[row] + 1) * 16 + tier[row];
       if (rankSeen.has(rKey)) return false;
       rankSeen.add(rKey);
       return true;
     });
+    if (stats) {
+      stats.phaseMs.dedup += performance.now() - t0;
+      stats.dedupDrops += rows.length - deduped.length;
+    }
+    return deduped.slice(0, job.maxResults);
+  }
+
+  /**
+   * Merge searchBranches outputs (one per branch group, any grouping) into
+   * the final materialized results. Partials from workers may carry their
+   * own stats, which are folded into this thread's.
+   */
+  function mergePartials(job, partials) {
+    const store = _createComboStore();
+    for (const part of partials) {
+      for (let r = 0; r < part.count; r++) store.append(part, r);
+      if (part.stats && _debug) addStats(part.stats);
+    }
+
+    let rows = store.rows();
+    if (job.mode === 'goal' && job.pareto && partials.length > 1) {
+      // Re-run the front in serial order over the union of the local fronts
+      rows.sort((a, b) => store.order[a] - store.order[b]);
+      const front = [];
+      for (const row of rows) {
+        const leaf = { duration: store.duration[row], hearts: store.hearts[row], sell: store.sell[row] };
+        if (_paretoInsert(store, front, store.size[row], leaf)) front.push(row);
+      }
+      if (_debug) _stats.dominated += rows.length - front.length;
+      rows = front;
+    }
+
+    return _rankRows(job, store, rows, false).map(row => store.materialize(row, job.candidates, job.effects));
+  }
+
+  /** Fold stats from another thread (a worker's getStats()) into this one's. */
+  function addStats(other) {
+    for (const [key, value] of Object.entries(other)) {
+      if (key === 'searches') continue;
+      if (key === 'phaseMs') {
+        for (const [phase, ms] of Object.entries(value)) _stats.phaseMs[phase] = (_stats.phaseMs[phase] || 0) + ms;
+      } else {
+        _stats[key] += value;
+      }
+    }
+  }
+
+  // ── Anytime search ─────────────────────────────────────────────────────────
+  //
+  // searchAnytime runs a goal or merchant job under a time budget. Its
+  // candidates are in promise order (_sortByPromise) and its branches are
+  // visited by descending upper bound on the primary objective — duration
+  // (goal) or sell value (merchant) — each enumerated taking the most of the
+  // promising candidates first. Subtrees whose upper bounds (best fill of the
+  // remaining slots, _fillTable) can't reach the current last result — or,
+  // for a pareto search, are dominated by the front — are skipped. Rows
+  // carry the serial order of the same combo in an alphabetical search, so a
+  // search that completes returns exactly what searchBranches would for
+  // these candidates, ties included.
+  //
+  // Any grouping of the branches can be searched on its own, e.g. in a
+  // SearchPool worker, and the partials merged (finishAnytime). Groups share
+  // a deadline and what they may prune against — the last returnable row, or
+  // a pareto front — through `shared` (see shareAnytimeBounds).
+
+  const ANYTIME_PARETO_ROWS = 4096;  // pareto search: stored rows before dropping those evicted from the front
+  const ANYTIME_CLOCK_NODES = 1024;  // nodes between deadline checks
+
+  /** Most promising first: longest duration (goal) or priciest (merchant), then name. */
+  function _sortByPromise(list, mode) {
+    const named = _sortByName(list);
+    const rank = new Map(named.map((ing, r) => [ing, r]));
+    const keys = mode === 'goal'
+      ? [i => i.effect_duration_sec || 0, i => i.effect_potency || 0]
+      : [i => i.sell_price || 0];
+    return named.sort((a, b) => {
+      for (const key of keys) if (key(a) !== key(b)) return key(b) - key(a);
+      return rank.get(a) - rank.get(b);
+    });
+  }
+
+  function _anytimeFields(candidates, timeBudgetMs) {
+    const names = new Map(_sortByName(candidates).map((ing, r) => [ing, r]));
+    return { timeBudgetMs, nameRank: candidates.map(ing => names.get(ing)) };
+  }
+
+  /**
+   * Upper bound of `values` summed over any valid combo of a branch, or
+   * -Infinity if the branch has none: the branch item's copies plus the best
+   * remaining candidates that can share a recipe with it (meal: food;
+   * elixir: critters and monster parts, with at least one of the kind the
+   * branch item isn't). `byValue` lists candidate indices by value descending.
+   */
+  function _branchBound(job, p, values, byValue, { size, item, count }) {
+    const t = p.type[item];
+    if (t === TYPE_OTHER) return -Infinity;
+    const allowed = t === TYPE_FOOD ? [true, false, false, false] : [false, true, true, false];
+    const need = t === TYPE_CRITTER ? TYPE_MONSTER : t === TYPE_MONSTER ? TYPE_CRITTER : -1;
+    let rest = size - count;
+    let total = values[item] * count;
+    let reserved = -1;
+    if (need >= 0) {
+      reserved = byValue.find(i => i > item && p.type[i] === need) ?? -1;
+      if (rest === 0 || reserved < 0) return -Infinity;
+      total += values[reserved];
+      rest--;
+    }
+    for (let j = 0; j < byValue.length && rest > 0; j++) {
+      const i = byValue[j];
+      if (i <= item || !allowed[p.type[i]]) continue;
+      const k = Math.min(job.maxQty[i] - (i === reserved ? 1 : 0), rest);
+      total += k * values[i];
+      rest -= k;
+    }
+    return rest > 0 ? -Infinity : total;
+  }
+
+  /**
+   * Best total of `values` over exactly s more ingredients from
+   * candidates[i..], each at most maxQty times: table[i * 6 + s], -Infinity
+   * where they can't fill s slots.
+   */
+  function _fillTable(values, maxQty) {
+    const n = maxQty.length;
+    const table = new Float64Array((n + 1) * 6).fill(-Infinity);
+    table[n * 6] = 0;
+    for (let i = n - 1; i >= 0; i--) {
+      for (let s = 0; s <= 5; s++) {
+        for (let k = 0; k <= Math.min(maxQty[i], s); k++) {
+          const v = k * values[i] + table[(i + 1) * 6 + s - k];
+          if (v > table[i * 6 + s]) table[i * 6 + s] = v;
+        }
+      }
+    }
+    return table;
+  }
+
+  /** Potency a goal job's combos need for its target tier (-Infinity: any). */
+  function _minPotency(job, packed) {
+    if (!(job.targetTier > 0)) return -Infinity;
+    const targetIdx = packed.effectIds.indexOf(job.targetEffectId);
+    return packed.thresholds[targetIdx]?.[job.targetTier - 1] ?? Infinity;
+  }
+
+  /**
+   * The branches of an anytime job that can hold a result, by descending
+   * `bound` (upper bound of duration or sell value); tiered goals also drop
+   * branches that can't reach the tier.
+   */
+  function listAnytimeBranches(job) {
+    const goal = job.mode === 'goal';
+    const packed = _packCandidates(job.candidates, job.effects);
+    const minPotency = _minPotency(job, packed);
+    const primary = goal ? packed.duration : packed.sell;
+    const byIndex = job.candidates.map((_, i) => i);
+    const byPrimary = [...byIndex].sort((a, b) => primary[b] - primary[a] || a - b);
+    const byPotency = [...byIndex].sort((a, b) => packed.potency[b] - packed.potency[a] || a - b);
+    const branches = [];
+    for (const b of listBranches(job)) {
+      if (minPotency > -Infinity && _branchBound(job, packed, packed.potency, byPotency, b) < minPotency) continue;
+      const bound = _branchBound(job, packed, primary, byPrimary, b);
+      if (bound === -Infinity) continue;
+      b.bound = goal ? bound : _sellFor(bound, b.size);
+      branches.push(b);
+    }
+    return branches.sort((a, b) => (b.bound - a.bound) || (a.ordinal - b.ordinal));
+  }
+
+  /** True if cutoff row `a` ranks strictly before `b` (or there is no `b`). */
+  function _cutoffBefore(goal, a, b) {
+    if (!b) return true;
+    if (!goal) return a.sell > b.sell;
+    if (a.duration !== b.duration) return a.duration > b.duration;
+    if (a.size !== b.size) return a.size < b.size;
+    if (a.hearts !== b.hearts) return a.hearts > b.hearts;
+    return a.sell > b.sell;
+  }
+
+  /** True if scores `a` are at least `b` on every pareto objective, and not all equal. */
+  function _strictlyDominates(a, b) {
+    return a.duration >= b.duration && a.size <= b.size && a.hearts >= b.hearts && a.sell >= b.sell &&
+      !(a.duration === b.duration && a.size === b.size && a.hearts === b.hearts && a.sell === b.sell);
+  }
+
+  /**
+   * Fold a searchAnytime partial into `shared` ({ deadline, cutoff, front }),
+   * which later branch groups of the same job prune against: the best known
+   * last returnable row (a group's own top maxResults rows already beat
+   * anything below it) or, for a pareto job, the union of the fronts.
+   */
+  function shareAnytimeBounds(job, shared, partial) {
+    const goal = job.mode === 'goal';
+    const row = r => ({ duration: partial.duration[r], size: partial.size[r], hearts: partial.hearts[r], sell: partial.sell[r] });
+    if (goal && job.pareto) {
+      const front = [...shared.front];
+      for (let r = 0; r < partial.count; r++) front.push(row(r));
+      shared.front = front.filter(a => !front.some(b => _strictlyDominates(b, a)));
+    } else if (partial.count >= job.maxResults) {
+      const last = row(partial.count - 1);
+      if (_cutoffBefore(goal, last, shared.cutoff)) shared.cutoff = last;
+    }
+    return shared;
+  }
+
+  /**
+   * Search an anytime job (prepareGoalSearch / prepareMerchantSearch with
+   * options.timeBudgetMs) until it completes or the budget runs out. Returns
+   * the top rows as store columns, like searchBranches, plus
+   *   complete — every branch was searched or ruled out by its bound
+   *   bound    — if not, the best primary value (duration in seconds or sell
+   *              value in rupees) any unsearched combo could still reach
+   *
+   * `branches` (default: all, see listAnytimeBranches) limits the search to a
+   * group of them; `shared` carries the group's deadline (Date.now() time)
+   * and bounds from groups searched before it (see shareAnytimeBounds).
+   */
+  function searchAnytime(job, branches = listAnytimeBranches(job), shared = null) {
+    const deadline = performance.now() + (shared ? shared.deadline - Date.now() : job.timeBudgetMs);
+    const { candidates, maxQty, nameRank, maxResults } = job;
+    const goal = job.mode === 'goal';
+    const pareto = goal && job.pareto;
+    const targetTier = job.targetTier || 0;
+    const suffixCap = _suffixCap(maxQty);
+    const packed = _packCandidates(candidates, job.effects);
+    const targetIdx = goal ? packed.effectIds.indexOf(job.targetEffectId) : -1;
+    const minPotency = _minPotency(job, packed);
+    const stats = _debug ? _stats : null;
+
+    // Per-node bounds: what the chosen items plus the best fill of the remaining slots could score
+    const foodHearts = packed.hearts.map((h, i) => packed.type[i] === TYPE_FOOD ? h : 0);
+    const fill = {
+      duration: _fillTable(packed.duration, maxQty),
+      hearts: _fillTable(foodHearts, maxQty),
+      sell: _fillTable(packed.sell, maxQty),
+      potency: _fillTable(packed.potency, maxQty),
+    };
+    let accDuration = 0, accHearts = 0, accSell = 0, accPotency = 0;
+    let size = 0; // current branch's combo size
+
+    const store = _createComboStore();
+    let front = [];
+    const outside = shared?.front ?? []; // pareto: front scores found by other groups
+    const probe = { duration: 0, size: 0, hearts: 0, sell: 0 }; // scratch scores for `outside` checks
+    let cutoff = shared?.cutoff ?? null; // scores of the last returnable row, once there are maxResults
+    const leaf = _leafScore;
+    const combo = new Uint8Array(5);
+    const sorted = new Uint8Array(5); // the leaf's combo in name order, as a serial search builds it
+    const ranks = new Uint8Array(5);
+    let depth = 0;
+    let clock = ANYTIME_CLOCK_NODES;
+    let stopped = false;
+
+    // Keep only the rows that can still be returned (see _rankRows)
+    function compact() {
+      const keep = _rankRows(job, store, pareto ? front : store.rows(), true);
+      if (!pareto && keep.length >= maxResults) {
+        const last = keep[keep.length - 1];
+        const next = { duration: store.duration[last], size: store.size[last], hearts: store.hearts[last], sell: store.sell[last] };
+        if (_cutoffBefore(goal, next, cutoff)) cutoff = next;
+      }
+      const kept = new Uint8Array(store.length);
+      for (const row of keep) kept[row] = 1;
+      const moved = new Int32Array(store.length);
+      store.retain((row, newRow) => {
+        moved[row] = newRow;
+        return kept[row] === 1;
+      });
+      front = front.map(row => moved[row]);
+    }
+
+    // True if a combo scoring at most these values ranks strictly after the cutoff row
+    function belowCutoff(duration, n, hearts, sell) {
+      if (!cutoff) return false;
+      if (!goal) return sell < cutoff.sell;
+      if (duration !== cutoff.duration) return duration < cutoff.duration;
+      if (n !== cutoff.size) return n > cutoff.size;
+      if (hearts !== cutoff.hearts) return hearts < cutoff.hearts;
+      return sell < cutoff.sell;
+    }
 
-    return deduped.slice(0, maxResults);
+    // True if no combo in the subtree can be returned
+    function hopeless(itemIdx, slotsLeft) {
+      const at = itemIdx * 6 + slotsLeft;
+      if (accPotency + fill.potency[at] < minPotency) return true;
+      const duration = accDuration + fill.duration[at];
+      const hearts = accHearts + fill.hearts[at];
+      const sell = _sellFor(accSell + fill.sell[at], size);
+      if (!pareto) return belowCutoff(duration, size, hearts, sell);
+      // Dominated by a front row, and not an exact tie (which could still win on order)
+      if (outside.length > 0) {
+        probe.duration = duration; probe.size = size; probe.hearts = hearts; probe.sell = sell;
+        if (outside.some(o => _strictlyDominates(o, probe))) return true;
+      }
+      return front.some(o =>
+        store.duration[o] >= duration && store.size[o] <= size && store.hearts[o] >= hearts && store.sell[o] >= sell &&
+        !(store.duration[o] === duration && store.size[o] === size && store.hearts[o] === hearts && store.sell[o] === sell));
+    }
+
+    // Sort the leaf into name order (effect ties go to the first seen), returning its serial order
+    function sortByName(n) {
+      for (let j = 0; j < n; j++) {
+        const i = combo[j], r = nameRank[i];
+        let k = j;
+        while (k > 0 && ranks[k - 1] > r) { ranks[k] = ranks[k - 1]; sorted[k] = sorted[k - 1]; k--; }
+        ranks[k] = r;
+        sorted[k] = i;
+      }
+      return _serialOrder(ranks, n);
+    }
+
+    function take(i, k) {
+      accDuration += k * packed.duration[i];
+      accHearts += k * foodHearts[i];
+      accSell += k * packed.sell[i];
+      accPotency += k * packed.potency[i];
+    }
+
+    function generateCombos(itemIdx, slotsLeft) {
+      if (stats) stats.nodesVisited++;
+      if (--clock === 0) {
+        clock = ANYTIME_CLOCK_NODES;
+        if (performance.now() >= deadline) stopped = true;
+      }
+      if (stopped) return;
+      if (slotsLeft === 0) {
+        if (stats) stats.leavesEvaluated++;
+        const order = sortByName(depth);
+        _scoreLeaf(packed, sorted, depth, leaf);
+        if (leaf.kind === KIND_DUBIOUS) return;
+        if (goal) {
+          if (leaf.effect < 0 || leaf.effect !== targetIdx) return;
+          if (targetTier > 0 && leaf.tier < targetTier) return;
+        }
+        if (pareto) {
+          const before = front.length;
+          const kept = _paretoInsert(store, front, depth, leaf, order);
+          if (stats) stats.dominated += kept ? before - front.length : 1;
+          if (!kept) return;
+        } else if (belowCutoff(leaf.duration, depth, leaf.hearts, leaf.sell)) {
+          return;
+        }
+        if (stats) stats.resultsRetained++;
+        const row = store.push(sorted, depth, leaf, order);
+        if (pareto) front.push(row);
+        // Re-rank often: each compaction can raise the cutoff and prune more
+        if (store.length >= (pareto ? Math.max(ANYTIME_PARETO_ROWS, 2 * front.length) : 2 * maxResults)) compact();
+        return;
+      }
+      if (itemIdx >= candidates.length) return;
+      if (suffixCap[itemIdx] < slotsLeft) {
+        if (stats) stats.prunedSuffixCap++;
+        return;
+      }
+      if (hopeless(itemIdx, slotsLeft)) {
+        if (stats) stats.prunedBound++;
+        return;
+      }
+
+      // Most copies of the more promising candidate first
+      const maxK = Math.min(maxQty[itemIdx], slotsLeft);
+      for (let k = maxK; k >= 0 && !stopped; k--) {
+        for (let j = 0; j < k; j++) combo[depth++] = itemIdx;
+        take(itemIdx, k);
+        generateCombos(itemIdx + 1, slotsLeft - k);
+        take(itemIdx, -k);
+        depth -= k;
+      }
+    }
+
+    const t0 = performance.now();
+    let bound = null;
+    for (const b of branches) {
+      // Sorted by bound, so once one branch can't place a row no later one can
+      if (cutoff && b.bound < (goal ? cutoff.duration : cutoff.sell)) {
+        if (stats) stats.prunedBound += branches.length - branches.indexOf(b);
+        break;
+      }
+      if (performance.now() >= deadline) stopped = true;
+      if (stopped) { bound = b.bound; break; }
+      size = b.size;
+      accDuration = accHearts = accSell = accPotency = 0;
+      for (depth = 0; depth < b.count; depth++) combo[depth] = b.item;
+      take(b.item, b.count);
+      generateCombos(b.item + 1, b.size - b.count);
+      if (stopped) { bound = b.bound; break; }
+    }
+    if (stats) stats.phaseMs.enumerate += performance.now() - t0;
+
+    const partial = store.columns(_rankRows(job, store, pareto ? front : store.rows(), true));
+    partial.complete = bound === null;
+    partial.bound = bound;
+    return partial;
+  }
+
+  /**
+   * Merge and materialize searchAnytime partials (one per branch group):
+   * { results, complete, bound, gap }, where gap is how far `bound` is above
+   * the top result's primary value (0 when complete, or when the top result
+   * is provably the best).
+   */
+  function finishAnytime(job, partials) {
+    const results = mergePartials(job, partials);
+    const complete = partials.every(part => part.complete);
+    const bound = complete ? null : Math.max(...partials.filter(part => !part.complete).map(part => part.bound));
+    const best = results.length === 0 ? 0
+      : job.mode === 'goal' ? results[0].result.effect?.durationSec || 0 : results[0].result.sellValue;
+    const gap = complete ? 0 : Math.max(0, bound - best);
+    return { results, complete, bound, gap };
+  }
+
+  /**
+   * Merchant mode, whole inventory: split everything owned into recipes that
+   * together maximize total sell value. Scoring matches findAllValidRecipes —
+   * computeRecipe's sell value, Dubious Food is worth nothing.
+   *
+   * Meals (food only) and elixirs (critter + monster part) never share
+   * ingredients, so they are planned separately:
+   *   meals   — items sorted by price, split into contiguous runs of 1–5 by DP.
+   *             Pricier items belong in larger (higher-multiplier) recipes, so
+   *             this is exact up to per-recipe rounding.
+   *   elixirs — greedy plan for every feasible elixir count g (each needs its
+   *             own critter and monster part); the best g wins.
+   * A time-boxed local search (swap/move single items between recipes and the
+   * leftover pile) then polishes rounding and leftovers.
+   *
+   * upperBound relaxes the one-critter-one-monster rule and rounding, so
+   * upperBound - totalValue bounds how far the plan can be from optimal.
+   *
+   * @param {Object} [options]
+   * @param {number} [options.timeBudgetMs=1500] - Local search budget.
+   *
+   * Returns { recipes: [{ ingredients, result }], totalValue, upperBound,
+   *           unused: [{ ingredient, qty }] } — recipes by sell value descending.
+   */
+  function planInventory(ownedQtys, allIngredients, effects, options = {}) {
+    const deadline = performance.now() + (options.timeBudgetMs ?? 1500);
+    const stats = _debug ? _stats : null;
+    if (stats) stats.searches++;
+
+    const pools = { food: [], critter: [], monster: [] };
+    for (const ing of allIngredients) {
+      const pool = pools[ing.type];
+      if (!pool) continue;
+      for (let q = ownedQtys.get(ing.id) || 0; q > 0; q--) pool.push(ing);
+    }
+    for (const pool of Object.values(pools)) pool.sort(_byPriceDesc);
+
+    let t0 = performance.now();
+    const meals = _planMeals(pools.food);
+    const elixirs = _planElixirs(pools.critter, pools.monster);
+    const upperBound = Math.floor(
+      _runsBound(pools.food, Infinity) +
+      _runsBound(_mergeByPrice(pools.critter, pools.monster), Math.min(pools.critter.length, pools.monster.length))
+    );
+    if (stats) stats.phaseMs.enumerate += performance.now() - t0;
+
+    t0 = performance.now();
+    const groups = _polishPlan([...meals.groups, ...elixirs.groups], elixirs.leftover, deadline, stats);
+    if (stats) stats.phaseMs.polish = (stats.phaseMs.polish || 0) + performance.now() - t0;
+
+    const recipes = groups.recipes.map(items => {
+      const ingredients = _sortByName(items);
+      return { ingredients, result: computeRecipe(ingredients, effects) };
+    });
+    recipes.sort((a, b) => b.result.sellValue - a.result.sellValue);
+    if (stats) stats.resultsRetained += recipes.length;
+
+    const unusedQty = new Map();
+    for (const ing of groups.leftover) unusedQty.set(ing, (unusedQty.get(ing) || 0) + 1);
+
+    return {
+      recipes,
+      totalValue: recipes.reduce((sum, r) => sum + r.result.sellValue, 0),
+      upperBound,
+      unused: [...unusedQty].map(([ingredient, qty]) => ({ ingredient, qty })),
+    };
+  }
+
+  function _byPriceDesc(a, b) {
+    return (b.sell_price || 0) - (a.sell_price || 0);
+  }
+
+  /** Merge two lists already sorted by _byPriceDesc. */
+  function _mergeByPrice(a, b) {
+    const out = [];
+    let i = 0, j = 0;
+    while (i < a.length && j < b.length) out.push(_byPriceDesc(a[i], b[j]) <= 0 ? a[i++] : b[j++]);
+    while (i < a.length) out.push(a[i++]);
+    while (j < b.length) out.push(b[j++]);
+    return out;
+  }
+
+  /**
+   * Best split of price-sorted food into contiguous recipes of 1–5 items.
+   * best[i] = value of the best plan for items[0..i).
+   */
+  function _planMeals(items) {
+    const n = items.length;
+    const prefix = new Float64Array(n + 1);
+    for (let i = 0; i < n; i++) prefix[i + 1] = prefix[i] + (items[i].sell_price || 0);
+
+    const best = new Float64Array(n + 1);
+    const cut = new Uint8Array(n + 1);
+    for (let i = 1; i <= n; i++) {
+      best[i] = -Infinity;
+      for (let s = 1; s <= 5 && s <= i; s++) {
+        const v = best[i - s] + _sellFor(prefix[i] - prefix[i - s], s);
+        if (v > best[i]) { best[i] = v; cut[i] = s; }
+      }
+    }
+
+    const groups = [];
+    for (let i = n; i > 0; i -= cut[i]) groups.push(items.slice(i - cut[i], i));
+    return { groups };
+  }
+
+  /**
+   * Greedy elixir plan: for g recipes, the g priciest critters and monster
+   * parts anchor one recipe each, and the priciest of the rest fill the
+   * remaining 3 slots per recipe, front-loaded so early recipes reach 5.
+   * Every g from 1 to min(critters, monsters) is tried.
+   */
+  function _planElixirs(critters, monsters) {
+    const gMax = Math.min(critters.length, monsters.length);
+    let best = { groups: [], leftover: [...critters, ...monsters], value: 0 };
+
+    for (let g = 1; g <= gMax; g++) {
+      const rest = _mergeByPrice(critters.slice(g), monsters.slice(g));
+      const fillCount = Math.min(rest.length, 3 * g);
+      const groups = [];
+      let value = 0;
+      for (let k = 0; k < g; k++) {
+        const fill = rest.slice(Math.min(3 * k, fillCount), Math.min(3 * k + 3, fillCount));
+        const group = [critters[k], monsters[k], ...fill];
+        value += _sellFor(group.reduce((sum, i) => sum + (i.sell_price || 0), 0), group.length);
+        groups.push(group);
+      }
+      if (value > best.value) best = { groups, leftover: rest.slice(fillCount), value };
+    }
+    return best;
+  }
+
+  /**
+   * Upper bound on splitting price-sorted items into at most maxGroups
+   * recipes of 1–5, any composition allowed, rounding replaced by +0.5 per
+   * recipe. The best plan uses a price-sorted prefix in contiguous runs, so a
+   * DP over (items used, recipes) is exact for this relaxation.
+   */
+  function _runsBound(items, maxGroups) {
+    const n = items.length;
+    const gMax = Math.min(maxGroups, n);
+    if (gMax === 0) return 0;
+    const prefix = new Float64Array(n + 1);
+    for (let i = 0; i < n; i++) prefix[i + 1] = prefix[i] + (items[i].sell_price || 0);
+
+    // prev[i] = best with g-1 recipes covering items[0..i); -Infinity if impossible
+    let prev = new Float64Array(n + 1).fill(-Infinity);
+    prev[0] = 0;
+    let bound = 0;
+    for (let g = 1; g <= gMax; g++) {
+      const cur = new Float64Array(n + 1).fill(-Infinity);
+      for (let i = g; i <= Math.min(n, 5 * g); i++) {
+        for (let s = 1; s <= 5 && s <= i; s++) {
+          if (prev[i - s] === -Infinity) continue;
+          const v = prev[i - s] + (prefix[i] - prefix[i - s]) * COUNT_SELL_MULT[s] + 0.5;
+          if (v > cur[i]) cur[i] = v;
+        }
+        if (cur[i] > bound) bound = cur[i];
+      }
+      prev = cur;
+    }
+    return bound;
+  }
+
+  /**
+   * Local search over single-item swaps and moves between recipes and the
+   * leftover pile, taking any strict improvement, until a full pass finds
+   * none or the deadline passes. A pass only re-checks pairs of bins where
+   * one has changed since the pair was last checked. Values are tracked
+   * incrementally from per-recipe price sums and type counts (same rules as
+   * determineRecipeType/computeSellValue).
+   */
+  const POLISH_CLOCK_PAIRS = 64; // bin pairs between deadline checks
+
+  function _polishPlan(groups, leftover, deadline, stats) {
+    const TYPE_SLOT = { food: 0, critter: 1, monster: 2 };
+    const makeBin = (items, cap) => {
+      const bin = { items: [...items], cap, sum: 0, counts: [0, 0, 0], value: 0, stamp: 0 };
+      for (const ing of items) {
+        bin.sum += ing.sell_price || 0;
+        bin.counts[TYPE_SLOT[ing.type]]++;
+      }
+      bin.value = cap === Infinity ? 0 : binValue(bin, null, null);
+      return bin;
+    };
+
+    // Value of `bin` after removing `out` and adding `inn` (either may be null)
+    function binValue(bin, out, inn) {
+      if (bin.cap === Infinity) return 0; // leftovers are worth nothing
+      const n = bin.items.length - (out ? 1 : 0) + (inn ? 1 : 0);
+      if (n === 0) return 0;
+      if (n > bin.cap) return -Infinity;
+      const slotOut = out ? TYPE_SLOT[out.type] : -1;
+      const slotIn = inn ? TYPE_SLOT[inn.type] : -1;
+      const food = bin.counts[0] - (slotOut === 0 ? 1 : 0) + (slotIn === 0 ? 1 : 0);
+      const critter = bin.counts[1] - (slotOut === 1 ? 1 : 0) + (slotIn === 1 ? 1 : 0);
+      const monster = bin.counts[2] - (slotOut === 2 ? 1 : 0) + (slotIn === 2 ? 1 : 0);
+      const valid = food > 0 ? critter === 0 && monster === 0 : critter > 0 && monster > 0;
+      if (!valid) return -Infinity;
+      const sum = bin.sum - (out ? out.sell_price || 0 : 0) + (inn ? inn.sell_price || 0 : 0);
+      return _sellFor(sum, n);
+    }
+
+    let tick = 0; // bumped on every change; bins and checked pairs record when
+
+    function apply(bin, out, inn, value) {
+      bin.stamp = ++tick;
+      if (out) {
+        bin.items.splice(bin.items.indexOf(out), 1);
+        bin.sum -= out.sell_price || 0;
+        bin.counts[TYPE_SLOT[out.type]]--;
+      }
+      if (inn) {
+        bin.items.push(inn);
+        bin.sum += inn.sell_price || 0;
+        bin.counts[TYPE_SLOT[inn.type]]++;
+      }
+      bin.value = value;
+    }
+
+    // Try every swap/move between bins a and b; true if one improved the plan
+    function improvePair(a, b) {
+      for (const x of [...a.items, null]) {
+        for (const y of [...b.items, null]) {
+          if (x === y) continue; // both null, or the same ingredient object — no-op
+          if (stats) stats.nodesVisited++;
+          const va = binValue(a, x, y);
+          const vb = binValue(b, y, x);
+          if (va + vb > a.value + b.value) {
+            apply(a, x, y, va);
+            apply(b, y, x, vb);
+            return true;
+          }
+        }
+      }
+      return false;
+    }
+
+    const bins = groups.map(items => makeBin(items, 5));
+    bins.push(makeBin(leftover, Infinity));
+
+    // checked[i * n + j]: tick when bins i and j last had no improving swap
+    const n = bins.length;
+    const checked = new Float64Array(n * n).fill(-1);
+    let improved = true;
+    let clock = 0;
+    while (improved) {
+      improved = false;
+      for (let i = 0; i < n; i++) {
+        for (let j = i + 1; j < n; j++) {
+          if (++clock % POLISH_CLOCK_PAIRS === 0 && performance.now() >= deadline) return finish();
+          if (Math.max(bins[i].stamp, bins[j].stamp) <= checked[i * n + j]) continue;
+          while (improvePair(bins[i], bins[j])) improved = true;
+          checked[i * n + j] = tick;
+        }
+      }
+    }
+    return finish();
+
+    function finish() {
+      const pile = bins[n - 1];
+      return { recipes: bins.slice(0, -1).filter(b => b.items.length > 0).map(b => b.items), leftover: pile.items };
+    }
   }
 
   return {
     computeRecipe,
+    previewAdditions,
     findBestCombos,
     findAllValidRecipes,
+    createMerchantSession,
+    prepareGoalSearch,
+    prepareMerchantSearch,
+    listBranches,
+    searchBranches,
+    mergePartials,
+    listAnytimeBranches,
+    shareAnytimeBounds,
+    searchAnytime,
+    finishAnytime,
+    planInventory,
     determineRecipeType,
     formatDuration,
+    buildSearchIndex,
+    setSearchIndex,
+    setDebug,
+    isDebug,
+    resetStats,
+    getStats,
+    recordPhase,
+    addStats,
   };
 })();
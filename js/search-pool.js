@@ -0,0 +1,191 @@
+/**
+ * search-pool.js — Runs the anytime combo searches across a pool of Web Workers
+ *
+ * RecipeEngine splits an anytime search into top-level branches (first
+ * candidate and its count, ordered by upper bound — see
+ * listAnytimeBranches). The pool deals groups of them out, most promising
+ * first, to navigator.hardwareConcurrency workers (js/search-worker.js). Each
+ * group goes out with the deadline and the best bounds found so far
+ * (RecipeEngine.shareAnytimeBounds), so later groups prune against earlier
+ * ones; the engine merges the groups' top rows. A search that completes
+ * returns the same results as the synchronous RecipeEngine searches.
+ *
+ * Whole-inventory plans (RecipeEngine.planInventory) run on one worker, so
+ * the page stays responsive while the planner polishes.
+ *
+ * Small searches run on the main thread, where a worker round-trip would
+ * cost more than it saves — as does everything when workers can't start
+ * (e.g. the page was opened from file://).
+ */
+
+const SearchPool = (() => {
+  const WORKER_URL = 'js/search-worker.js';
+  const MAX_WORKERS = 16;
+  const MIN_PARALLEL_LEAVES = 20000; // estimated leaves below which a search stays on the main thread
+  const CHUNKS_PER_WORKER = 4;       // branch groups per worker, for load balancing
+
+  let _workers = null; // created on first large search; [] if unavailable
+  let _queue = Promise.resolve();
+  let _nextId = 0;
+
+  function _pool() {
+    if (_workers) return _workers;
+    _workers = [];
+    if (typeof Worker === 'undefined' || location.protocol === 'file:') return _workers;
+    const count = Math.min(navigator.hardwareConcurrency || 1, MAX_WORKERS);
+    if (count < 2) return _workers;
+    try {
+      for (let i = 0; i < count; i++) _workers.push(new Worker(WORKER_URL));
+    } catch (err) {
+      console.warn('Search workers unavailable:', err);
+      _disable();
+    }
+    return _workers;
+  }
+
+  /**
+   * The service worker swapped in files from a newer build. Workers started
+   * from now on would load those scripts (or 404 on the old hashed name)
+   * while this page runs the old ones, so searches stay on the main thread
+   * unless the pool already exists.
+   */
+  function pinToPage() {
+    if (!_workers) _workers = [];
+  }
+
+  function _disable() {
+    for (const w of _workers || []) w.terminate();
+    _workers = [];
+  }
+
+  /** Number of workers searches are split across (1 = main thread only). */
+  function size() {
+    return Math.max(_pool().length, 1);
+  }
+
+  /**
+   * Group consecutive branches (in the order they should be searched) so no
+   * group much exceeds `target` estimated leaves.
+   */
+  function _chunk(branches, target) {
+    const chunks = [];
+    let current = null;
+    for (const b of branches) {
+      if (!current || current.cost + b.cost > target) {
+        current = { cost: 0, branches: [] };
+        chunks.push(current);
+      }
+      current.cost += b.cost;
+      current.branches.push(b);
+    }
+    return chunks.map(c => c.branches);
+  }
+
+  function _runLocal(job, branches) {
+    return RecipeEngine.finishAnytime(job, [RecipeEngine.searchAnytime(job, branches)]);
+  }
+
+  function _run(job) {
+    const branches = RecipeEngine.listAnytimeBranches(job);
+    const total = branches.reduce((sum, b) => sum + b.cost, 0);
+    const workers = total >= MIN_PARALLEL_LEAVES ? _pool() : [];
+    if (workers.length === 0) return _runLocal(job, branches);
+
+    // Groups stay in bound order: the first ones set the cutoff the rest prune against
+    const chunks = _chunk(branches, total / (workers.length * CHUNKS_PER_WORKER));
+    const shared = { deadline: Date.now() + job.timeBudgetMs, cutoff: null, front: [] };
+    const id = ++_nextId;
+
+    return new Promise(resolve => {
+      const partials = [];
+      const idle = [...workers];
+      let next = 0;
+      let pending = 0;
+      let failed = false;
+
+      // Groups dispatched after the deadline return at once with their bound
+      const dispatch = w => {
+        w.postMessage({ id, job, branches: chunks[next++], shared });
+        pending++;
+      };
+      const fill = () => {
+        while (idle.length > 0 && next < chunks.length) dispatch(idle.pop());
+      };
+
+      for (const w of workers) {
+        w.onmessage = ({ data }) => {
+          if (failed || data.id !== id) return;
+          partials.push(data.partial);
+          RecipeEngine.shareAnytimeBounds(job, shared, data.partial);
+          pending--;
+          idle.push(w);
+          fill();
+          if (pending === 0) resolve(RecipeEngine.finishAnytime(job, partials));
+        };
+        w.onerror = err => {
+          // A worker that can't load or run the engine: fall back to the main thread for good
+          if (failed) return;
+          failed = true;
+          err.preventDefault?.();
+          console.warn('Search worker failed, searching on the main thread:', err.message || err);
+          _disable();
+          resolve(_runLocal(job, branches));
+        };
+      }
+      // The first group goes out alone, so the rest start with its cutoff to prune against
+      dispatch(idle.shift());
+    });
+  }
+
+  function _runPlan({ ownedQtys, allIngredients, effects, options }) {
+    const local = () => RecipeEngine.planInventory(ownedQtys, allIngredients, effects, options);
+    const [w] = _pool();
+    if (!w) return local();
+    const id = ++_nextId;
+    const byId = new Map(allIngredients.map(ing => [ing.id, ing]));
+
+    return new Promise(resolve => {
+      w.onmessage = ({ data }) => {
+        if (data.id !== id) return;
+        // Hand back the page's own ingredient objects, not the worker's copies
+        const { plan } = data;
+        for (const recipe of plan.recipes) recipe.ingredients = recipe.ingredients.map(ing => byId.get(ing.id));
+        for (const u of plan.unused) u.ingredient = byId.get(u.ingredient.id);
+        if (plan.stats) RecipeEngine.addStats(plan.stats);
+        delete plan.stats;
+        resolve(plan);
+      };
+      w.onerror = err => {
+        err.preventDefault?.();
+        console.warn('Search worker failed, planning on the main thread:', err.message || err);
+        _disable();
+        resolve(local());
+      };
+      w.postMessage({ id, plan: { ownedQtys, allIngredients, effects, options, debug: RecipeEngine.isDebug() } });
+    });
+  }
+
+  // Searches share the workers, so they run one at a time
+  function _enqueue(run, arg) {
+    const result = _queue.then(() => run(arg));
+    _queue = result.catch(() => {});
+    return result;
+  }
+
+  /**
+   * Run a job prepared with options.timeBudgetMs (RecipeEngine.prepareGoalSearch
+   * or prepareMerchantSearch); resolves to { results, complete, bound, gap }
+   * (see RecipeEngine.finishAnytime).
+   */
+  function searchAnytime(job) {
+    if (!job) return Promise.resolve({ results: [], complete: true, bound: null, gap: 0 });
+    return _enqueue(_run, job);
+  }
+
+  /** Same arguments and result as RecipeEngine.planInventory, as a Promise. */
+  function planInventory(ownedQtys, allIngredients, effects, options = {}) {
+    return _enqueue(_runPlan, { ownedQtys, allIngredients, effects, options });
+  }
+
+  return { searchAnytime, planInventory, size, pinToPage };
+})();
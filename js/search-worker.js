@@ -0,0 +1,34 @@
+/**
+ * search-worker.js — SearchPool worker: searches one group of top-level branches
+ *
+ * Message in:  { id, job, branches, shared }  an anytime job, a group of its
+ *              branches (RecipeEngine.listAnytimeBranches) and the bounds to
+ *              prune against (RecipeEngine.shareAnytimeBounds)
+ * Message out: { id, partial }  local top rows, plus stats in debug mode
+ *
+ * Message in:  { id, plan }  RecipeEngine.planInventory arguments
+ *              ({ ownedQtys, allIngredients, effects, options, debug })
+ * Message out: { id, plan }  its result, plus stats in debug mode
+ *
+ * The dist/ build prepends recipe-engine.js to this file, so the import is
+ * only needed when running from the source tree.
+ */
+
+if (typeof RecipeEngine === 'undefined') importScripts('recipe-engine.js');
+
+self.onmessage = ({ data: { id, job, branches, shared, plan } }) => {
+  if (plan) {
+    RecipeEngine.setDebug(plan.debug);
+    RecipeEngine.resetStats();
+    const result = RecipeEngine.planInventory(plan.ownedQtys, plan.allIngredients, plan.effects, plan.options);
+    if (plan.debug) result.stats = RecipeEngine.getStats();
+    self.postMessage({ id, plan: result });
+    return;
+  }
+  RecipeEngine.setDebug(job.debug);
+  RecipeEngine.resetStats();
+  const partial = RecipeEngine.searchAnytime(job, branches, shared);
+  if (job.debug) partial.stats = RecipeEngine.getStats();
+  const buffers = Object.values(partial).filter(v => ArrayBuffer.isView(v)).map(v => v.buffer);
+  self.postMessage({ id, partial }, buffers);
+};
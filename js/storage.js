@@ -1,41 +1,230 @@
 /**
  * storage.js — localStorage management for saved/favorited recipes
- * Key: 'sotd_favorites'
- * Value: Array of { label: string, ingredients: string[] (ingredient IDs) }
+ *
+ * Recipes are packed as base64url bytes: [layout byte, ingredient index × 1–5],
+ * where an ingredient index is its position in ingredients.json and the layout
+ * byte comes from a hash of the ordered ingredient ids (Data.getLayoutVersion),
+ * so stat edits leave codes valid. The same code is used for share links (#r=<code>).
+ *
+ * Each favorite lives under its own key so saves append and deletes/renames
+ * touch one entry instead of rewriting a shared blob:
+ *   'sotd_fav_seq'       → next sequence number (base 36)
+ *   'sotd_fav:<seq>'     → '<code>\t<label>\t<id,id,…>'  (ids kept to repack after data changes)
+ *   'sotd_favres:<seq>'  → '<data version>\t<result summary JSON>'
+ *
+ * The legacy 'sotd_favorites' JSON array is migrated on first read.
  */
 
 const Storage = (() => {
-  const KEY = 'sotd_favorites';
+  const LEGACY_KEY = 'sotd_favorites';
+  const SEQ_KEY = 'sotd_fav_seq';
+  const FAV_PREFIX = 'sotd_fav:';
+  const RESULT_PREFIX = 'sotd_favres:';
+  const MAX_INGREDIENTS = 5;
 
-  function getFavorites() {
+  let _favorites = null; // in-memory list, ordered by seq
+  let _indexById = null; // Map<ingredientId, index>, per ingredient layout
+  let _indexVersion = null;
+
+  // ── Packed recipe codes ────────────────────────────────────────────────────
+
+  function _versionByte() {
+    return parseInt((Data.getLayoutVersion() || '00').slice(-2), 16);
+  }
+
+  function _ingredientIndex() {
+    if (_indexVersion !== Data.getLayoutVersion()) {
+      _indexById = new Map(Data.getIngredients().map((ing, idx) => [ing.id, idx]));
+      _indexVersion = Data.getLayoutVersion();
+    }
+    return _indexById;
+  }
+
+  /**
+   * Pack up to 5 ingredient IDs into a base64url code.
+   * Returns null if any ID is unknown or the index doesn't fit a byte.
+   */
+  function encodeRecipe(ingredientIds) {
+    if (!ingredientIds.length || ingredientIds.length > MAX_INGREDIENTS) return null;
+    const index = _ingredientIndex();
+    const bytes = [_versionByte()];
+    for (const id of ingredientIds) {
+      const idx = index.get(id);
+      if (idx === undefined || idx > 255) return null;
+      bytes.push(idx);
+    }
+    return btoa(String.fromCharCode(...bytes))
+      .replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '');
+  }
+
+  /**
+   * Unpack a code. Returns { ids, stale } or null if malformed; `stale` means it
+   * was made against a different ingredient layout and the indices may not match.
+   * One byte can still collide across layouts, so callers holding the ids
+   * should trust those over a decoded code.
+   */
+  function decodeRecipe(code) {
+    let raw;
+    try {
+      raw = atob(code.replace(/-/g, '+').replace(/_/g, '/'));
+    } catch {
+      return null;
+    }
+    if (raw.length < 2 || raw.length > MAX_INGREDIENTS + 1) return null;
+    const ingredients = Data.getIngredients();
+    const ids = [];
+    for (let i = 1; i < raw.length; i++) {
+      const ing = ingredients[raw.charCodeAt(i)];
+      if (!ing) return null;
+      ids.push(ing.id);
+    }
+    return { ids, stale: raw.charCodeAt(0) !== _versionByte() };
+  }
+
+  // ── Favorites ──────────────────────────────────────────────────────────────
+
+  function _load() {
+    if (_favorites) return _favorites;
+    _favorites = [];
     try {
-      const raw = localStorage.getItem(KEY);
-      return raw ? JSON.parse(raw) : [];
+      for (let i = 0; i < localStorage.length; i++) {
+        const key = localStorage.key(i);
+        if (!key || !key.startsWith(FAV_PREFIX)) continue;
+        const fav = _parseEntry(key, localStorage.getItem(key));
+        if (fav) _favorites.push(fav);
+      }
+      _favorites.sort((a, b) => a.seq - b.seq);
+      _migrateLegacy();
     } catch {
-      return [];
+      // storage unavailable — behave as empty
+    }
+    return _favorites;
+  }
+
+  function _parseEntry(key, value) {
+    if (typeof value !== 'string') return null;
+    const [code = '', label, idList = ''] = value.split('\t');
+    const seq = parseInt(key.slice(FAV_PREFIX.length), 36);
+    if (Number.isNaN(seq)) return null;
+    // The stored ids are authoritative; a code whose indices disagree with them
+    // (a layout-byte collision) is repacked by getFavoriteResult. The code is
+    // only a fallback for entries that lost their id list.
+    let ids = idList.split(',').filter(Boolean).slice(0, MAX_INGREDIENTS);
+    if (!ids.length) {
+      const decoded = code ? decodeRecipe(code) : null;
+      if (!decoded || decoded.stale) return null;
+      ids = decoded.ids;
     }
+    return { seq, key, code, label: label || 'Untitled Recipe', ingredients: ids };
+  }
+
+  function _migrateLegacy() {
+    const raw = localStorage.getItem(LEGACY_KEY);
+    if (!raw) return;
+    let legacy = [];
+    try { legacy = JSON.parse(raw) || []; } catch { /* drop unreadable blob */ }
+    for (const fav of legacy) _append(fav.label, fav.ingredients || []);
+    localStorage.removeItem(LEGACY_KEY);
+  }
+
+  function _append(label, ingredientIds) {
+    const seq = parseInt(localStorage.getItem(SEQ_KEY) || '0', 36);
+    localStorage.setItem(SEQ_KEY, (seq + 1).toString(36));
+    const fav = {
+      seq,
+      key: FAV_PREFIX + seq.toString(36),
+      code: encodeRecipe(ingredientIds) || '',
+      label: label || 'Untitled Recipe',
+      ingredients: ingredientIds,
+    };
+    _write(fav);
+    _favorites.push(fav);
+    return fav;
+  }
+
+  function _write(fav) {
+    const label = String(fav.label ?? '').replace(/\t/g, ' ');
+    localStorage.setItem(fav.key, `${fav.code || ''}\t${label}\t${fav.ingredients.join(',')}`);
+  }
+
+  function getFavorites() {
+    return _load();
   }
 
   function saveFavorite(label, ingredientIds) {
-    const favs = getFavorites();
-    favs.push({ label: label || 'Untitled Recipe', ingredients: ingredientIds });
-    localStorage.setItem(KEY, JSON.stringify(favs));
-    return favs;
+    _load();
+    _append(label, ingredientIds);
+    return _favorites;
   }
 
   function deleteFavorite(index) {
-    const favs = getFavorites();
-    favs.splice(index, 1);
-    localStorage.setItem(KEY, JSON.stringify(favs));
-    return favs;
+    const fav = _load()[index];
+    if (fav) {
+      localStorage.removeItem(fav.key);
+      localStorage.removeItem(RESULT_PREFIX + fav.key.slice(FAV_PREFIX.length));
+      _favorites.splice(index, 1);
+    }
+    return _favorites;
   }
 
   function renameFavorite(index, newLabel) {
-    const favs = getFavorites();
-    if (favs[index]) favs[index].label = newLabel;
-    localStorage.setItem(KEY, JSON.stringify(favs));
-    return favs;
+    const fav = _load()[index];
+    if (fav) {
+      fav.label = newLabel;
+      _write(fav);
+    }
+    return _favorites;
+  }
+
+  /**
+   * Cached recipe summary for a favorite:
+   * { name, type, tier, hearts, sellValue, duration, effectId }.
+   * Computed on first request per data version, then read back from storage.
+   */
+  function getFavoriteResult(fav) {
+    const version = Data.getVersion();
+    const resKey = RESULT_PREFIX + fav.key.slice(FAV_PREFIX.length);
+    if (fav._result && fav._resultVersion === version) return fav._result;
+
+    // Repack codes made against another layout (or a colliding one) while we're here
+    const code = encodeRecipe(fav.ingredients);
+    if (code && code !== fav.code) {
+      fav.code = code;
+      _write(fav);
+    }
+
+    const stored = localStorage.getItem(resKey);
+    if (stored) {
+      const tab = stored.indexOf('\t');
+      if (stored.slice(0, tab) === version) {
+        try {
+          fav._result = JSON.parse(stored.slice(tab + 1));
+          fav._resultVersion = version;
+          return fav._result;
+        } catch { /* recompute below */ }
+      }
+    }
+
+    const ingredients = fav.ingredients.map(id => Data.getIngredientById(id)).filter(Boolean);
+    const r = RecipeEngine.computeRecipe(ingredients, Data.getEffects());
+    fav._result = {
+      name: r.name,
+      type: r.type,
+      tier: r.tier,
+      hearts: r.hearts,
+      sellValue: r.sellValue,
+      duration: r.duration,
+      effectId: r.effect?.effectId ?? null,
+    };
+    fav._resultVersion = version;
+    try {
+      localStorage.setItem(resKey, `${version}\t${JSON.stringify(fav._result)}`);
+    } catch { /* quota — cache stays in memory */ }
+    return fav._result;
   }
 
-  return { getFavorites, saveFavorite, deleteFavorite, renameFavorite };
+  return {
+    getFavorites, saveFavorite, deleteFavorite, renameFavorite, getFavoriteResult,
+    encodeRecipe, decodeRecipe,
+  };
 })();
@@ -32,9 +32,33 @@ const Filters = (() => {
   let valueMaxEnabled = false;
   let valueMaxValue   = 100;
 
-  function init(effects, onChangeFn) {
+  // Precomputed per-ingredient filter attributes (indexed by position in _indexed).
+  // Each ingredient owns one "group" bit (its category, or its subcategory for
+  // monster parts) and one effect bit (bit 0 = no effect).
+  let _indexed = [];
+  let _groupBit = new Map();   // 'fruit' | 'sub:horns' → bit
+  let _effectBit = new Map();  // effect id → bit
+  let _groupBits = new Uint32Array(0);
+  let _effectBits = new Uint32Array(0);
+  let _fuse = new Float64Array(0);
+  let _sell = new Float64Array(0);
+
+  // Sidebar state compiled into masks + numeric ranges (see _compile)
+  let _groupMask = 0;
+  let _effectMask = 0;
+  let _fuseLimit = Infinity;
+  let _sellMin = -Infinity;
+  let _sellMax = Infinity;
+
+  // Cached result of the last full pass; null = filters changed since
+  let _filtered = null;
+  let _filteredIds = null;
+
+  function init(effects, onChangeFn, ingredients = [], index = null) {
     _onChange = onChangeFn;
 
+    _applyIndex(ingredients, index || buildIndex(ingredients, effects), effects);
+
     // Populate effect filter chips
     _buildEffectFilters(effects);
 
@@ -298,7 +322,119 @@ const Filters = (() => {
     master.indeterminate = !allChecked && !noneChecked;
   }
 
+  /**
+   * Assign bit positions to every category/subcategory/effect and store each
+   * ingredient's bits + numeric filter fields in typed arrays (parallel to
+   * `ingredients`). Pure and structured-cloneable, so it can be persisted.
+   */
+  function buildIndex(ingredients, effects) {
+    const groupKeys = [];
+    for (const key of [
+      ...activeCategories,
+      ...Array.from(activeSubcategories, sub => `sub:${sub}`),
+      ...ingredients.map(_groupKey),
+    ]) {
+      if (!groupKeys.includes(key)) groupKeys.push(key);
+    }
+
+    const effectIds = [];
+    for (const id of [...(effects || []).map(e => e.id), ...ingredients.map(i => i.effect).filter(Boolean)]) {
+      if (!effectIds.includes(id)) effectIds.push(id);
+    }
+
+    if (groupKeys.length > 32 || effectIds.length > 31) {
+      console.warn('Filters: too many categories/effects for a 32-bit mask');
+    }
+
+    const n = ingredients.length;
+    const index = {
+      ids: ingredients.map(i => i.id),
+      groupKeys,
+      effectIds,
+      groupBits: new Uint32Array(n),
+      effectBits: new Uint32Array(n),
+      fuse: new Float64Array(n),
+      sell: new Float64Array(n),
+    };
+    ingredients.forEach((ing, idx) => {
+      index.groupBits[idx] = 1 << groupKeys.indexOf(_groupKey(ing));
+      index.effectBits[idx] = ing.effect ? 1 << (effectIds.indexOf(ing.effect) + 1) : 1;
+      index.fuse[idx] = ing.fuse_value || 0;
+      index.sell[idx] = ing.sell_price || 0;
+    });
+    return index;
+  }
+
+  function _applyIndex(ingredients, index, effects) {
+    // A stale/mismatched index (different ingredient order) is rebuilt
+    if (index.ids.length !== ingredients.length || index.ids.some((id, i) => id !== ingredients[i].id)) {
+      index = buildIndex(ingredients, effects);
+    }
+    _indexed = ingredients;
+    _groupBit = new Map(index.groupKeys.map((key, bit) => [key, 1 << bit]));
+    _effectBit = new Map(index.effectIds.map((id, bit) => [id, 1 << (bit + 1)]));
+    _groupBits = index.groupBits;
+    _effectBits = index.effectBits;
+    _fuse = index.fuse;
+    _sell = index.sell;
+    _compile();
+  }
+
+  function _groupKey(ingredient) {
+    return ingredient.category === 'monster-part'
+      ? `sub:${ingredient.subcategory || 'other'}`
+      : ingredient.category;
+  }
+
+  /**
+   * Fold the current sidebar state into masks/ranges and drop the cached pass.
+   */
+  function _compile() {
+    _groupMask = 0;
+    for (const cat of activeCategories) {
+      if (cat !== 'monster-part') _groupMask |= _groupBit.get(cat) || 0;
+    }
+    for (const sub of activeSubcategories) _groupMask |= _groupBit.get(`sub:${sub}`) || 0;
+
+    // activeEffects holds the *unchecked* effects; "no effect" (bit 0) always passes
+    _effectMask = 1;
+    for (const [id, bit] of _effectBit) {
+      if (!activeEffects.has(id)) _effectMask |= bit;
+    }
+
+    _fuseLimit = Infinity;
+    if (fuseHideAll) _fuseLimit = 1;
+    if (fuseMaxEnabled) _fuseLimit = Math.min(_fuseLimit, fuseMaxValue);
+
+    _sellMin = valueMinEnabled ? valueMinValue : -Infinity;
+    _sellMax = valueMaxEnabled ? valueMaxValue : Infinity;
+
+    _filtered = null;
+    _filteredIds = null;
+  }
+
+  function _passesIdx(idx) {
+    return (_groupBits[idx] & _groupMask) !== 0 &&
+      (_effectBits[idx] & _effectMask) !== 0 &&
+      _fuse[idx] <= _fuseLimit &&
+      _sell[idx] >= _sellMin &&
+      _sell[idx] <= _sellMax;
+  }
+
+  function _runPass() {
+    const filtered = [];
+    const ids = new Set();
+    for (let idx = 0; idx < _indexed.length; idx++) {
+      if (!_passesIdx(idx)) continue;
+      filtered.push(_indexed[idx]);
+      ids.add(_indexed[idx].id);
+    }
+    _filtered = filtered;
+    _filteredIds = ids;
+  }
+
   function _notifyChange() {
+    _compile();
     if (_onChange) _onChange({ activeCategories, activeSubcategories, activeEffects });
   }
 
@@ -309,28 +445,24 @@ const Filters = (() => {
    * Returns true if an ingredient passes current filters.
    */
   function passes(ingredient) {
-    // Monster parts filtered by subcategory
-    if (ingredient.category === 'monster-part') {
-      if (!activeSubcategories.has(ingredient.subcategory || 'other')) return false;
-    } else {
-      if (!activeCategories.has(ingredient.category)) return false;
-    }
-
-    // Effect filter
-    if (ingredient.effect && activeEffects.has(ingredient.effect)) return false;
-
-    // Fuse filters
-    const fuse = ingredient.fuse_value;
-    if (fuseHideAll && fuse && fuse > 1) return false;
-    if (fuseMaxEnabled && fuse && fuse > fuseMaxValue) return false;
+    if (!_filteredIds) _runPass();
+    return _filteredIds.has(ingredient.id);
+  }
 
-    // Sell value filters
-    const sellPrice = ingredient.sell_price || 0;
-    if (valueMinEnabled && sellPrice < valueMinValue) return false;
-    if (valueMaxEnabled && sellPrice > valueMaxValue) return false;
+  /**
+   * All indexed ingredients passing the current filters, in data order.
+   * Cached until the sidebar state changes — treat as read-only.
+   */
+  function getFiltered() {
+    if (!_filtered) _runPass();
+    return _filtered;
+  }
 
-    return true;
+  /** Set of ingredient IDs passing the current filters (cached, read-only). */
+  function getFilteredIds() {
+    if (!_filteredIds) _runPass();
+    return _filteredIds;
   }
 
-  return { init, passes, getActiveCategories, getActiveEffects };
+  return { init, buildIndex, passes, getFiltered, getFilteredIds, getActiveCategories, getActiveEffects };
 })();
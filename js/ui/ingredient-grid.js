@@ -2,7 +2,8 @@
  * ingredient-grid.js — Renders the ingredient card grid
  *
  * Supports three display modes:
- *   'ingredient' — click to add to recipe builder
+ *   'ingredient' — click to add to recipe builder; each card previews what
+ *                  adding it would do to the builder's recipe (setPreviews)
  *   'merchant'   — click to toggle ownership checkbox
  *   'goal'       — read-only display (cards not interactive in goal results,
  *                  but grid stays visible for reference)
@@ -18,6 +19,7 @@ const IngredientGrid = (() => {
   let _highlightedIds = new Set();
   let _lastFiltered = null;
   let _showFuse = false;
+  let _previews = null; // RecipeEngine.previewAdditions result, or null for none
 
   // Category → CSS color class
   const CAT_COLOR = {
@@ -57,6 +59,18 @@ const IngredientGrid = (() => {
     _selectedIds = new Set(ids);
   }
 
+  /**
+   * Show add-one previews ({ current, previews } from
+   * RecipeEngine.previewAdditions, or null to hide them) on the rendered
+   * cards in place; cards rendered later pick them up too.
+   */
+  function setPreviews(previews) {
+    _previews = previews;
+    if (_mode !== 'ingredient') return;
+    document.getElementById('ingredient-grid')?.querySelectorAll('.ingredient-card[data-id]')
+      .forEach(card => _renderPreview(card));
+  }
+
   function setMerchantOwned(owned) {
     _merchantOwned = owned instanceof Map ? owned : new Map();
   }
@@ -212,9 +226,51 @@ const IngredientGrid = (() => {
       card.appendChild(price);
     }
 
+    if (_mode === 'ingredient') _renderPreview(card);
+
     return card;
   }
 
+  const TYPE_LABELS = { meal: 'Meal', elixir: 'Elixir', dubious: 'Dubious' };
+
+  // Replace the card's add-one preview line: type change, tier, then the
+  // duration, hearts and sell deltas against the current recipe
+  function _renderPreview(card) {
+    card.querySelector('.add-preview')?.remove();
+    const preview = _previews?.previews.get(card.dataset.id);
+    if (!preview) return;
+    const current = _previews.current;
+
+    const el = document.createElement('div');
+    el.className = 'add-preview';
+    const add = (text, sign) => {
+      const part = document.createElement('span');
+      part.className = sign > 0 ? 'preview-up' : sign < 0 ? 'preview-down' : '';
+      part.textContent = text;
+      el.appendChild(part);
+    };
+    const signed = n => `${n > 0 ? '+' : ''}${n}`;
+
+    if (preview.type !== current.type) {
+      add(`→ ${TYPE_LABELS[preview.type]}`, preview.type === 'dubious' ? -1 : current.type === 'dubious' ? 1 : 0);
+    }
+    if (preview.effectId && preview.effectId !== current.effectId) {
+      add(_effectEmoji(preview.effectId) + (preview.tier ? ` T${preview.tier}` : ''), 0);
+    } else if (preview.effectId && preview.tier !== current.tier) {
+      add(`T${preview.tier}`, preview.tier - current.tier);
+    }
+    const dd = preview.durationSec - current.durationSec;
+    if (dd) add(`${dd > 0 ? '+' : '-'}${RecipeEngine.formatDuration(Math.abs(dd))}`, dd);
+    const dh = preview.hearts - current.hearts;
+    if (dh) add(`${signed(dh)}♥`, dh);
+    const ds = preview.sellValue - current.sellValue;
+    if (ds) add(`${signed(ds)}r`, ds);
+
+    if (el.children.length === 0) return;
+    el.title = `If added: ${[...el.children].map(part => part.textContent).join(', ')}`;
+    card.appendChild(el);
+  }
+
   // Quick emoji for effect type
   function _effectEmoji(effectId) {
     const map = {
@@ -250,5 +306,5 @@ const IngredientGrid = (() => {
     if (_lastFiltered) renderGrid(_lastFiltered);
   }
 
-  return { init, setMode, setSelectedIds, setMerchantOwned, setMerchantQty, setHighlightedIds, setShowFuse, renderGrid, updateCardSelection };
+  return { init, setMode, setSelectedIds, setMerchantOwned, setMerchantQty, setHighlightedIds, setShowFuse, setPreviews, renderGrid, updateCardSelection };
 })();
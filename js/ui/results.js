@@ -19,15 +19,22 @@ const Results = (() => {
     renderFavorites();
   }
 
+  /**
+   * Render a ranked combo list. Only the rows in view get DOM nodes; they are
+   * recycled as the results panel scrolls, so hundreds of combos stay cheap.
+   * Returns the list handle; appendCombos() adds streamed results to it.
+   */
   function renderComboList(combos, title = 'Best Combos') {
     const container = document.getElementById('results-content');
-    if (!container) return;
+    if (!container) return null;
 
+    _comboList?.destroy();
+    _comboList = null;
     container.innerHTML = '';
 
     if (!combos || combos.length === 0) {
       container.innerHTML = '<p class="placeholder-text">No valid combos found.</p>';
-      return;
+      return null;
     }
 
     const heading = document.createElement('h3');
@@ -35,8 +42,203 @@ const Results = (() => {
     heading.textContent = title;
     container.appendChild(heading);
 
-    for (const combo of combos) {
-      container.appendChild(_buildComboCard(combo));
+    _comboList = _createComboList(container, combos);
+    return _comboList;
+  }
+
+  function appendCombos(combos) {
+    _comboList?.append(combos);
+  }
+
+  // ── Virtualized combo list ─────────────────────────────────────────────────
+
+  const ROW_ESTIMATE = 60; // px, used until a row has been measured
+  const ROW_GAP = 10;      // matches .results-content gap
+  const OVERSCAN = 4;      // rows rendered beyond each edge of the viewport
+
+  let _comboList = null;
+
+  function _createComboList(container, initial) {
+    const scroller = container.closest('.results-panel') || container;
+    const list = document.createElement('div');
+    list.className = 'combo-list';
+    container.appendChild(list);
+
+    const combos = [...initial];
+    const heights = [];             // measured row heights; undefined = not yet seen
+    const expanded = new Set();     // indices showing their result card
+    const details = new Map();      // index → result card, built on first expand
+    const swaps = new Map();        // index → compact swap list (or null), built on first show
+    const live = new Map();         // index → row element in view
+    const pool = [];                // detached rows ready for reuse
+    let offsets = new Float64Array(1);
+    let frame = 0;
+
+    function layout() {
+      offsets = new Float64Array(combos.length + 1);
+      for (let i = 0; i < combos.length; i++) {
+        offsets[i + 1] = offsets[i] + (heights[i] ?? ROW_ESTIMATE) + ROW_GAP;
+      }
+      list.style.height = `${Math.max(0, offsets[combos.length] - ROW_GAP)}px`;
+    }
+
+    // First row whose bottom edge is below y
+    function rowAt(y) {
+      let lo = 0, hi = combos.length;
+      while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (offsets[mid + 1] <= y) lo = mid + 1;
+        else hi = mid;
+      }
+      return lo;
+    }
+
+    function render() {
+      frame = 0;
+      if (!list.isConnected) { destroy(); return; }
+
+      const top = scroller.getBoundingClientRect().top - list.getBoundingClientRect().top;
+      const first = Math.max(0, rowAt(top) - OVERSCAN);
+      const last = Math.min(combos.length - 1, rowAt(top + scroller.clientHeight) + OVERSCAN);
+
+      for (const [i, row] of live) {
+        if (i < first || i > last) {
+          live.delete(i);
+          row.remove();
+          pool.push(row);
+        }
+      }
+
+      let remeasured = false;
+      for (let i = first; i <= last; i++) {
+        let row = live.get(i);
+        if (!row) {
+          row = pool.pop() || _createComboRow(toggle);
+          _fillComboRow(row, i, combos[i], expanded.has(i) ? detailsFor(i) : null, swapsFor(i));
+          list.appendChild(row);
+          live.set(i, row);
+        }
+        const h = row.offsetHeight;
+        if (h && h !== heights[i]) { heights[i] = h; remeasured = true; }
+      }
+      if (remeasured) layout();
+      for (const [i, row] of live) row.style.transform = `translateY(${offsets[i]}px)`;
+    }
+
+    function schedule() {
+      if (!frame) frame = requestAnimationFrame(render);
+    }
+
+    function detailsFor(i) {
+      if (!details.has(i)) details.set(i, _buildResultCard(combos[i].result, combos[i].ingredients));
+      return details.get(i);
+    }
+
+    function swapsFor(i) {
+      if (!swaps.has(i)) swaps.set(i, _buildSwapSuggestions(combos[i].result, combos[i].ingredients, true));
+      return swaps.get(i);
+    }
+
+    function toggle(i) {
+      if (expanded.has(i)) expanded.delete(i);
+      else expanded.add(i);
+      const row = live.get(i);
+      if (row) _fillComboRow(row, i, combos[i], expanded.has(i) ? detailsFor(i) : null, swapsFor(i));
+      render();
+    }
+
+    function onResize() {
+      heights.length = 0; // widths changed, so wrapping (and heights) may have too
+      layout();
+      schedule();
+    }
+
+    function append(more) {
+      if (!more || more.length === 0) return;
+      combos.push(...more);
+      layout();
+      schedule();
+    }
+
+    function destroy() {
+      scroller.removeEventListener('scroll', schedule);
+      list.removeEventListener('toggle', schedule, true);
+      window.removeEventListener('resize', onResize);
+      if (frame) cancelAnimationFrame(frame);
+      if (_comboList?.destroy === destroy) _comboList = null;
+    }
+
+    scroller.addEventListener('scroll', schedule, { passive: true });
+    list.addEventListener('toggle', schedule, true); // a swap list opened/closed inside a row
+    window.addEventListener('resize', onResize);
+    layout();
+    render();
+
+    return { append, destroy, get size() { return combos.length; } };
+  }
+
+  /**
+   * Row shell reused for any combo: the combo card, then either a compact swap
+   * list or (when expanded) the result card, which carries its own swaps.
+   */
+  function _createComboRow(onToggle) {
+    const row = document.createElement('div');
+    row.className = 'combo-row';
+
+    const card = document.createElement('div');
+    card.className = 'combo-card';
+    const tagsRow = document.createElement('div');
+    tagsRow.className = 'combo-ingredients';
+    const statsRow = document.createElement('div');
+    statsRow.className = 'combo-stats';
+    const expandBtn = document.createElement('button');
+    expandBtn.className = 'combo-expand';
+    card.append(tagsRow, statsRow, expandBtn);
+    row.appendChild(card);
+
+    // Click to load into builder
+    card.addEventListener('click', () => {
+      RecipeBuilder.loadIngredients(row._combo.ingredients);
+      // Trigger cook
+      document.getElementById('cook-btn')?.click();
+    });
+    expandBtn.addEventListener('click', (e) => {
+      e.stopPropagation();
+      onToggle(row._index);
+    });
+
+    return row;
+  }
+
+  function _fillComboRow(row, index, combo, detailCard, swaps) {
+    row._index = index;
+    row._combo = combo;
+    const [card, ...extras] = row.children;
+    const [tagsRow, statsRow, expandBtn] = card.children;
+
+    // Ingredient tags — reuse existing spans, add/remove to match the count
+    while (tagsRow.children.length > combo.ingredients.length) tagsRow.lastChild.remove();
+    while (tagsRow.children.length < combo.ingredients.length) {
+      const tag = document.createElement('span');
+      tag.className = 'combo-ingredient-tag';
+      tagsRow.appendChild(tag);
+    }
+    combo.ingredients.forEach((ing, i) => { tagsRow.children[i].textContent = ing.name; });
+
+    // Stats row
+    const r = combo.result;
+    let stats = '';
+    if (r.hearts > 0) stats += `<span>❤️ <span>${r.hearts}</span></span>`;
+    if (r.duration && r.duration !== '—') stats += `<span>⏱ <span>${r.duration}</span></span>`;
+    stats += `<span><img src="images/rupee.png" class="rupee-icon" alt=""> <span class="sell-value">${r.sellValue}r</span></span>`;
+    statsRow.innerHTML = stats;
+
+    expandBtn.textContent = detailCard ? '▾ Hide details' : '▸ Details';
+    // Swaps sit outside the card so opening them doesn't load the combo
+    const wanted = detailCard ? [detailCard] : swaps ? [swaps] : [];
+    if (extras.length !== wanted.length || extras.some((el, k) => el !== wanted[k])) {
+      for (const el of extras) el.remove();
+      row.append(...wanted);
     }
   }
 
@@ -167,6 +369,9 @@ const Results = (() => {
       card.appendChild(warnEl);
     }
 
+    const swaps = _buildSwapSuggestions(result, ingredientList);
+    if (swaps) card.appendChild(swaps);
+
     // Actions
     if (result.type !== 'dubious' && result.type !== 'empty') {
       const actions = document.createElement('div');
@@ -184,56 +389,120 @@ const Results = (() => {
       });
       actions.appendChild(saveBtn);
 
+      const code = Storage.encodeRecipe(ingredientList.map(i => i.id));
+      if (code) {
+        const shareBtn = document.createElement('button');
+        shareBtn.className = 'btn-secondary';
+        shareBtn.textContent = '🔗 Share';
+        shareBtn.addEventListener('click', () => {
+          const url = `${location.origin}${location.pathname}#r=${code}`;
+          (navigator.clipboard?.writeText(url) ?? Promise.reject())
+            .then(() => showToast('Share link copied!', 'success'))
+            .catch(() => showToast(url));
+        });
+        actions.appendChild(shareBtn);
+      }
+
       card.appendChild(actions);
     }
 
     return card;
   }
 
-  function _buildComboCard(combo) {
-    const card = document.createElement('div');
-    card.className = 'combo-card';
-
-    // Ingredient tags
-    const tagsRow = document.createElement('div');
-    tagsRow.className = 'combo-ingredients';
-    for (const ing of combo.ingredients) {
-      const tag = document.createElement('span');
-      tag.className = 'combo-ingredient-tag';
-      tag.textContent = ing.name;
-      tagsRow.appendChild(tag);
-    }
-    card.appendChild(tagsRow);
-
-    // Stats row
-    const statsRow = document.createElement('div');
-    statsRow.className = 'combo-stats';
-    const r = combo.result;
-
-    if (r.hearts > 0) {
-      const s = document.createElement('span');
-      s.innerHTML = `❤️ <span>${r.hearts}</span>`;
-      statsRow.appendChild(s);
-    }
-    if (r.duration && r.duration !== '—') {
-      const s = document.createElement('span');
-      s.innerHTML = `⏱ <span>${r.duration}</span>`;
-      statsRow.appendChild(s);
+  // ── Swap suggestions ───────────────────────────────────────────────────────
+
+  const SWAPS_PER_INGREDIENT = 3;
+
+  /**
+   * "Missing an ingredient?" — for each ingredient, the closest substitutes
+   * from the precomputed index (Data.getSubstitutes) that keep the recipe's
+   * type and dominant effect, with the recomputed outcome. Each suggestion
+   * is one computeRecipe call, not a search. Clicking one loads it.
+   * `compact` labels the toggle with the count, for combo rows.
+   */
+  function _buildSwapSuggestions(result, ingredientList, compact = false) {
+    if (!ingredientList?.length || result.type === 'dubious' || result.type === 'empty') return null;
+    const effects = Data.getEffects();
+    const effectId = result.effect?.effectId ?? null;
+
+    const list = document.createElement('div');
+    list.className = 'swap-list';
+    const seen = new Set();
+    for (const ing of ingredientList) {
+      if (seen.has(ing.id)) continue;
+      seen.add(ing.id);
+
+      let shown = 0;
+      for (const sub of Data.getSubstitutes(ing.id)) {
+        if (shown >= SWAPS_PER_INGREDIENT) break;
+        const swapped = ingredientList.map(i => i.id === ing.id ? sub : i);
+        const swappedResult = RecipeEngine.computeRecipe(swapped, effects);
+        if (swappedResult.type !== result.type || (swappedResult.effect?.effectId ?? null) !== effectId) continue;
+        list.appendChild(_buildSwapRow(ing, sub, result, swappedResult, swapped));
+        shown++;
+      }
     }
-    const sellS = document.createElement('span');
-    sellS.innerHTML = `<img src="images/rupee.png" class="rupee-icon" alt=""> <span class="sell-value">${r.sellValue}r</span>`;
-    statsRow.appendChild(sellS);
-
-    card.appendChild(statsRow);
+    if (list.children.length === 0) return null;
+
+    const wrap = document.createElement('details');
+    wrap.className = `result-swaps${compact ? ' compact' : ''}`;
+    const summary = document.createElement('summary');
+    const n = list.children.length;
+    summary.textContent = compact ? `🔁 ${n} swap${n === 1 ? '' : 's'}` : '🔁 Swap an ingredient';
+    wrap.append(summary, list);
+    return wrap;
+  }
 
-    // Click to load into builder
-    card.addEventListener('click', () => {
-      RecipeBuilder.loadIngredients(combo.ingredients);
-      // Trigger cook
+  function _buildSwapRow(from, to, before, after, ingredients) {
+    const row = document.createElement('button');
+    row.type = 'button';
+    row.className = 'swap-row';
+    row.title = after.name;
+
+    const names = document.createElement('span');
+    names.className = 'swap-names';
+    names.textContent = `${from.name} → ${to.name}`;
+    row.appendChild(names);
+
+    const deltas = document.createElement('span');
+    deltas.className = 'swap-deltas';
+    const add = (text, sign) => {
+      const el = document.createElement('span');
+      el.className = sign > 0 ? 'swap-up' : sign < 0 ? 'swap-down' : '';
+      el.textContent = text;
+      deltas.appendChild(el);
+    };
+    const signed = n => `${n > 0 ? '+' : ''}${n}`;
+
+    if (after.tier !== before.tier) add(`Tier ${after.tier}`, after.tier - before.tier);
+    const dh = after.hearts - before.hearts;
+    if (dh) add(`❤️ ${signed(dh)}`, dh);
+    const dd = (after.effect?.durationSec || 0) - (before.effect?.durationSec || 0);
+    if (dd) add(`⏱ ${after.duration}`, dd);
+    const ds = after.sellValue - before.sellValue;
+    add(ds ? `${signed(ds)}r` : 'same', ds);
+    row.appendChild(deltas);
+
+    row.addEventListener('click', () => {
+      RecipeBuilder.loadIngredients(ingredients);
       document.getElementById('cook-btn')?.click();
     });
+    return row;
+  }
 
-    return card;
+  /**
+   * Note for an anytime search that hit its time limit ({ complete, gap },
+   * see RecipeEngine.finishAnytime), or null if it completed. `gapText`
+   * formats the gap in the search's primary unit.
+   */
+  function buildSearchNote(outcome, gapText) {
+    if (!outcome || outcome.complete) return null;
+    const note = document.createElement('p');
+    note.className = 'search-note';
+    note.textContent = outcome.gap > 0
+      ? `⏳ Partial results: the search hit its time limit, and an unsearched combo could beat the top one by up to ${gapText(outcome.gap)}.`
+      : '⏳ Partial results: the search hit its time limit. The top combo is the best possible, but lower ones may be missing.';
+    return note;
   }
 
   function renderFavorites() {
@@ -249,6 +518,7 @@ const Results = (() => {
 
     section.removeAttribute('hidden');
     list.innerHTML = '';
+    const frag = document.createDocumentFragment();
 
     favs.forEach((fav, idx) => {
       const item = document.createElement('div');
@@ -260,6 +530,14 @@ const Results = (() => {
       label.title = fav.ingredients.join(', ');
       item.appendChild(label);
 
+      const summary = Storage.getFavoriteResult(fav);
+      const meta = document.createElement('span');
+      meta.className = 'favorite-meta';
+      meta.textContent = summary.duration !== '—'
+        ? `${summary.duration} · ${summary.sellValue}r`
+        : `${summary.sellValue}r`;
+      item.appendChild(meta);
+
       const loadBtn = document.createElement('button');
       loadBtn.className = 'favorite-load';
       loadBtn.textContent = 'Load';
@@ -282,8 +560,47 @@ const Results = (() => {
       });
       item.appendChild(delBtn);
 
-      list.appendChild(item);
+      frag.appendChild(item);
     });
+    list.appendChild(frag);
+  }
+
+  /**
+   * Debug-only panel under the results: search counters + per-phase timings.
+   */
+  function renderPerfPanel(stats, label = '') {
+    const panel = document.getElementById('perf-panel');
+    if (!panel) return;
+    if (!RecipeEngine.isDebug() || !stats) {
+      panel.setAttribute('hidden', '');
+      return;
+    }
+
+    const ms = v => `${v.toFixed(1)} ms`;
+    const rows = [
+      ['Searches', stats.searches],
+      ['Nodes visited', stats.nodesVisited.toLocaleString()],
+      ['Leaves evaluated', stats.leavesEvaluated.toLocaleString()],
+      ['Pruned (suffix cap)', stats.prunedSuffixCap.toLocaleString()],
+      ['Pruned (bound)', stats.prunedBound.toLocaleString()],
+      ['Results retained', stats.resultsRetained.toLocaleString()],
+      ['Dedup drops', stats.dedupDrops.toLocaleString()],
+      ['Dominated (pareto)', stats.dominated.toLocaleString()],
+      ...Object.entries(stats.phaseMs).map(([phase, v]) => [`⏱ ${phase}`, ms(v)]),
+    ];
+
+    panel.innerHTML = '';
+    const title = document.createElement('div');
+    title.className = 'perf-title';
+    title.textContent = label ? `Search stats — ${label}` : 'Search stats';
+    panel.appendChild(title);
+    for (const [name, value] of rows) {
+      const row = document.createElement('div');
+      row.className = 'perf-row';
+      row.innerHTML = `<span>${name}</span><span class="perf-value">${value}</span>`;
+      panel.appendChild(row);
+    }
+    panel.removeAttribute('hidden');
   }
 
   function showToast(message, type = '') {
@@ -298,5 +615,5 @@ const Results = (() => {
     setTimeout(() => toast.remove(), 3000);
   }
 
-  return { renderResult, renderComboList, renderFavorites, showToast };
+  return { renderResult, renderComboList, appendCombos, buildSearchNote, renderFavorites, renderPerfPanel, showToast };
 })();
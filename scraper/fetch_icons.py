@@ -2,21 +2,25 @@
 """
 fetch_icons.py — Download TotK ingredient icons + update sell prices from ZeldaWiki.gg
 
-Reads ../data/ingredients.json, fetches each ingredient's wiki page,
-grabs the TotK Icon PNG and corrects the sell_price. Writes updated JSON.
+Reads ../data/ingredients.json, fetches every ingredient's wikitext and image
+list through the MediaWiki API (50 pages per request), resolves the TotK Icon
+PNGs with prop=imageinfo and corrects the sell_price. Writes updated JSON.
 
 Usage:  py scraper/fetch_icons.py   (run from project root)
+        py scraper/fetch_icons.py --record scraper/recordings/zeldawiki.json
+        py scraper/fetch_icons.py --api-url http://127.0.0.1:8800/api.php   (replay; see wiki_api.py)
 """
 
+import argparse
 import json
 import re
 import time
 from pathlib import Path
 import requests
-from bs4 import BeautifulSoup
 
-BASE_URL  = "https://zeldawiki.wiki/wiki/"
-CDN_BASE  = "https://cdn.wikimg.net"
+from wiki_api import WikiAPI, parse_infobox, strip_markup
+
+API_URL   = "https://zeldawiki.wiki/w/api.php"
 HEADERS   = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36"}
 RATE_SEC  = 1.2  # polite delay between requests
 
@@ -44,10 +48,6 @@ EFFECT_MAP = {
 }
 
 
-def wiki_url(name: str) -> str:
-    return BASE_URL + name.strip().replace(" ", "_")
-
-
 def parse_totk_sell_price(value_text: str) -> int | None:
     """Extract TotK sell price from Value infobox field."""
     # Format: "... TotK Tears of the Kingdom : 5 Rupees ..."
@@ -69,34 +69,17 @@ def parse_effect(uses_text: str) -> str | None:
     return None
 
 
-def find_totk_icon_url(soup: BeautifulSoup, ingredient_name: str) -> str | None:
+def find_totk_icon(images: list[str], ingredient_name: str) -> str | None:
     """
-    Find the TotK inventory icon URL.
-    Pattern: TotK_<Name>_Icon.png (case-sensitive on CDN).
+    Pick the TotK inventory icon from a page's File: titles.
+    Pattern: File:TotK <Name> Icon.png (case-sensitive on CDN).
     Prefer exact match; fall back to any TotK*Icon image.
     """
-    # Build expected filename base
-    name_slug = ingredient_name.replace(" ", "_").replace("-", "-")
-    expected = f"TotK_{name_slug}_Icon.png"
-
-    best = None
-    fallback = None
-
-    for img in soup.find_all("img"):
-        src = img.get("src", "") or img.get("data-src", "")
-        if not src:
-            continue
-
-        filename = src.split("/")[-1].split("?")[0]
-
-        if filename == expected:
-            best = src
-            break
-        # Partial match: TotK*Icon.png and not a thumb (we want full-res)
-        if filename.startswith("TotK_") and "_Icon.png" in filename and "px-" not in filename:
-            fallback = src
-
-    return best or fallback
+    expected = f"File:TotK {ingredient_name.strip()} Icon.png"
+    if expected in images:
+        return expected
+    fallback = [f for f in images if f.startswith("File:TotK ") and f.endswith(" Icon.png")]
+    return fallback[-1] if fallback else None
 
 
 def download(url: str, dest: Path) -> bool:
@@ -114,60 +97,34 @@ def download(url: str, dest: Path) -> bool:
         return False
 
 
-def scrape_ingredient(ingredient: dict) -> dict:
-    """Fetch wiki page for one ingredient, update icon + sell_price. Returns updated dict."""
+def update_ingredient(ingredient: dict, page: dict | None, icon_url: str | None) -> dict:
+    """Apply one ingredient's wiki page + resolved icon URL. Returns updated dict."""
     name = ingredient["name"]
-    url = wiki_url(name)
-
-    print(f"  Fetching: {name}")
-    try:
-        time.sleep(RATE_SEC)
-        r = requests.get(url, headers=HEADERS, timeout=15)
-        if r.status_code == 404:
-            print(f"    [SKIP] 404 — {url}")
-            return ingredient
-        r.raise_for_status()
-    except Exception as e:
-        print(f"    [ERROR] {e}")
-        return ingredient
-
-    soup = BeautifulSoup(r.text, "html.parser")
-    infobox = soup.find("aside", class_="portable-infobox")
-
     updated = dict(ingredient)
+    if page is None:
+        print(f"    [SKIP] No page — {name}")
+        return updated
+
+    fields = {k: strip_markup(v) for k, v in parse_infobox(page["wikitext"] or "").items()}
 
     # ── Sell price ────────────────────────────────────────────────
-    if infobox:
-        for item in infobox.find_all("div", class_="pi-item"):
-            label = item.find(class_=lambda c: c and "pi-data-label" in c)
-            value = item.find(class_=lambda c: c and "pi-data-value" in c)
-            if label and value and label.get_text(strip=True) == "Value":
-                sell = parse_totk_sell_price(value.get_text(separator=" ", strip=True))
-                if sell is not None:
-                    updated["sell_price"] = sell
+    if "value" in fields:
+        sell = parse_totk_sell_price(fields["value"])
+        if sell is not None:
+            updated["sell_price"] = sell
 
     # ── Effect (only update if currently null to avoid overwriting curated data) ──
-    if infobox and updated["effect"] is None:
-        for item in infobox.find_all("div", class_="pi-item"):
-            label = item.find(class_=lambda c: c and "pi-data-label" in c)
-            value = item.find(class_=lambda c: c and "pi-data-value" in c)
-            if label and value and label.get_text(strip=True) == "Use(s)":
-                eff = parse_effect(value.get_text(separator=" ", strip=True))
-                if eff:
-                    updated["effect"] = eff
+    uses = fields.get("uses", fields.get("use(s)", fields.get("use")))
+    if uses and updated["effect"] is None:
+        eff = parse_effect(uses)
+        if eff:
+            updated["effect"] = eff
 
     # ── Icon ──────────────────────────────────────────────────────
-    icon_url = find_totk_icon_url(soup, name)
     slug = ingredient["id"]
     dest = IMG_DIR / f"{slug}.png"
 
     if icon_url:
-        # Make absolute URL
-        if icon_url.startswith("//"):
-            icon_url = "https:" + icon_url
-        elif icon_url.startswith("/"):
-            icon_url = "https://zeldawiki.wiki" + icon_url
-
         print(f"    Icon: {icon_url.split('/')[-1]}")
         if dest.exists():
             print(f"    [SKIP] Icon already downloaded")
@@ -185,8 +142,13 @@ def scrape_ingredient(ingredient: dict) -> dict:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Download TotK icons + sell prices via the wiki API.")
+    parser.add_argument("--api-url", default=API_URL, help="api.php endpoint (e.g. a local replay server)")
+    parser.add_argument("--record", type=Path, help="save every API response to this JSON file")
+    args = parser.parse_args()
+
     print("=== SoupOfTheDay Icon + Price Scraper ===")
-    print(f"Source: {BASE_URL}")
+    print(f"Source: {args.api_url}")
     print(f"Icons -> {IMG_DIR}\n")
 
     with open(DATA_FILE, encoding="utf-8") as f:
@@ -194,12 +156,20 @@ def main():
 
     print(f"Loaded {len(ingredients)} ingredients\n")
 
+    with WikiAPI(args.api_url, HEADERS["User-Agent"], RATE_SEC, args.record) as api:
+        pages = api.pages([ing["name"] for ing in ingredients], images=True)
+        icons = {ing["id"]: find_totk_icon(pages[ing["name"]]["images"], ing["name"])
+                 for ing in ingredients if pages.get(ing["name"])}
+        icon_urls = api.image_urls([f for f in icons.values() if f])
+
     updated = []
     ok_count = 0
     skip_count = 0
 
     for ing in ingredients:
-        result = scrape_ingredient(ing)
+        print(f"  {ing['name']}")
+        icon = icons.get(ing["id"])
+        result = update_ingredient(ing, pages.get(ing["name"]), icon_urls.get(icon) if icon else None)
         updated.append(result)
 
         icon_path = IMG_DIR / f"{ing['id']}.png"
@@ -213,6 +183,7 @@ def main():
         json.dump(updated, f, indent=2, ensure_ascii=False)
 
     print(f"\n✓ Done. Icons: {ok_count} downloaded, {skip_count} missing.")
+    print(f"✓ {api.requests} API requests")
     print(f"✓ Updated {DATA_FILE.name}")
 
 
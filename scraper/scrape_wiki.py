@@ -4,8 +4,10 @@ SoupOfTheDay — Zelda Wiki Scraper
 Scrapes ingredient data + icons from the Zelda Fandom wiki.
 
 Usage:
-    pip install requests beautifulsoup4 pillow
+    pip install requests pillow
     python scrape_wiki.py
+    python scrape_wiki.py --record recordings/fandom.json      (save API responses)
+    python scrape_wiki.py --api-url http://127.0.0.1:8800/api.php   (replay; see wiki_api.py)
 
 Outputs:
     ../data/ingredients.json
@@ -15,22 +17,23 @@ Outputs:
 NOTE: This is a one-time scraper — run locally, commit the output.
 Data is static at runtime (GitHub Pages, no server).
 
-Wiki source: https://zelda.fandom.com/wiki/
+Wiki source: https://zelda.fandom.com/api.php (MediaWiki API — category
+members, then article wikitext and icon URLs 50 titles per request).
 Confirm the URL before scraping; wiki structure may have changed.
 """
 
+import argparse
 import json
-import os
 import re
 import time
-import urllib.parse
 from pathlib import Path
 
 import requests
-from bs4 import BeautifulSoup
+
+from wiki_api import WikiAPI, file_title, parse_infobox, strip_markup
 
 # ── Config ─────────────────────────────────────────────────────────────────────
-BASE_URL = "https://zelda.fandom.com/wiki/"
+API_URL = "https://zelda.fandom.com/api.php"
 GAME_SLUG = "Tears_of_the_Kingdom"
 HEADERS = {
     "User-Agent": "SoupOfTheDay-Scraper/1.0 (educational; contact: see repo)"
@@ -106,18 +109,6 @@ def slugify(name: str) -> str:
     return name.strip("-")
 
 
-def fetch(url: str) -> BeautifulSoup | None:
-    """Fetch a URL and return BeautifulSoup, with rate limiting."""
-    try:
-        time.sleep(RATE_LIMIT_SEC)
-        resp = requests.get(url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
-        return BeautifulSoup(resp.text, "html.parser")
-    except requests.RequestException as e:
-        print(f"  [WARN] Failed to fetch {url}: {e}")
-        return None
-
-
 def download_image(img_url: str, dest: Path) -> bool:
     """Download an image to dest. Returns True on success."""
     try:
@@ -133,59 +124,14 @@ def download_image(img_url: str, dest: Path) -> bool:
         return False
 
 
-def parse_ingredient_page(url: str, category: str) -> dict | None:
+def ingredient_from_fields(name: str, data: dict, category: str) -> dict:
     """
-    Scrape a single ingredient page.
-
-    Returns ingredient dict or None if parsing fails.
-
-    NOTE: The exact selectors here will depend on the wiki's infobox structure.
-    You may need to inspect the page HTML and adjust these selectors.
+    Build an ingredient dict from an article's infobox fields
+    (see wiki_api.parse_infobox; values already stripped of markup).
     """
-    soup = fetch(url)
-    if not soup:
-        return None
-
-    # Try to get the infobox (Fandom wikis use .portable-infobox or .wikitable)
-    infobox = soup.find("aside", class_="portable-infobox")
-    if not infobox:
-        # Fallback: look for standard wikitable
-        infobox = soup.find("table", class_="wikitable")
-
-    if not infobox:
-        print(f"  [WARN] No infobox found at {url}")
-        return None
-
-    name = soup.find("h1", class_="page-header__title")
-    name = name.get_text(strip=True) if name else url.split("/")[-1].replace("_", " ")
-
-    # Parse infobox rows
-    data = {}
-    for item in infobox.find_all("div", class_="pi-item"):
-        label_el = item.find("h3", class_="pi-data-label")
-        value_el = item.find("div", class_="pi-data-value")
-        if label_el and value_el:
-            label = label_el.get_text(strip=True).lower()
-            value = value_el.get_text(strip=True)
-            data[label] = value
-
-    # Parse icon
-    img_el = infobox.find("img")
-    icon_url = None
-    if img_el:
-        icon_url = img_el.get("src") or img_el.get("data-src")
-        # Strip scale params from Fandom CDN URLs
-        if icon_url and "/revision/" in icon_url:
-            icon_url = icon_url.split("/revision/")[0] + "/revision/latest?format=original"
-
     slug = slugify(name)
-    img_dest = IMG_DIR / f"{slug}.png"
     icon_path = f"images/ingredients/{slug}.png"
 
-    if icon_url and not img_dest.exists():
-        print(f"  Downloading icon for {name}...")
-        download_image(icon_url, img_dest)
-
     # Parse effect from infobox data
     effect_raw = data.get("effect", data.get("cooking effect", ""))
     effect_id = None
@@ -245,72 +191,67 @@ def parse_ingredient_page(url: str, category: str) -> dict | None:
     }
 
 
-def get_ingredient_list(category_wiki_name: str) -> list[str]:
-    """
-    Get list of ingredient page URLs from a wiki category page.
+def category_title(category_wiki_name: str) -> str:
+    """e.g. "Fruits" → "Category:Tears_of_the_Kingdom_Fruits" """
+    return f"Category:{GAME_SLUG}_{category_wiki_name.replace(' ', '_')}"
 
-    Adjust the URL pattern and link selectors to match the wiki's structure.
-    The Zelda fandom wiki uses categories like:
-    https://zelda.fandom.com/wiki/Category:Tears_of_the_Kingdom_Fruits
-    """
-    cat_slug = category_wiki_name.replace(" ", "_")
-    url = f"{BASE_URL}Category:{GAME_SLUG}_{cat_slug}"
-    print(f"Fetching category: {url}")
-
-    soup = fetch(url)
-    if not soup:
-        return []
-
-    links = []
-    # Fandom wiki category pages list items in .category-page__members
-    member_section = soup.find("div", class_="category-page__members")
-    if member_section:
-        for a in member_section.find_all("a", class_="category-page__member-link"):
-            href = a.get("href", "")
-            if href and not any(x in href for x in [":", "#"]):
-                full_url = urllib.parse.urljoin(BASE_URL, href)
-                links.append(full_url)
-    else:
-        # Fallback: look for #mw-pages
-        mw_pages = soup.find("div", id="mw-pages")
-        if mw_pages:
-            for a in mw_pages.find_all("a"):
-                href = a.get("href", "")
-                if href and not href.startswith("#"):
-                    full_url = urllib.parse.urljoin("https://zelda.fandom.com", href)
-                    links.append(full_url)
-
-    print(f"  Found {len(links)} ingredients")
-    return links
-
-
-def scrape_all() -> None:
+
+def fetch_icon_urls(api: WikiAPI, pages: list[dict]) -> dict[str, str]:
+    """Ingredient slug → icon download URL for icons not yet on disk, via prop=imageinfo."""
+    wanted = {}
+    for page in pages:
+        slug = slugify(page["title"])
+        file = file_title(parse_infobox(page["wikitext"]).get("image", ""))
+        if file and not (IMG_DIR / f"{slug}.png").exists():
+            wanted[slug] = file
+    urls = api.image_urls(list(wanted.values()))
+    return {slug: urls[file] for slug, file in wanted.items() if urls.get(file)}
+
+
+def scrape_all(api_url: str = API_URL, record_to: Path | None = None) -> None:
     """Main scraper entry point."""
     print("=== SoupOfTheDay Wiki Scraper ===\n")
-    print("Target:", BASE_URL)
+    print("Target:", api_url)
     print("Output:", OUT_DIR, "\n")
 
+    with WikiAPI(api_url, HEADERS["User-Agent"], RATE_LIMIT_SEC, record_to) as api:
+        # Category members (continuation followed inside category_members)
+        category_of: dict[str, str] = {}
+        for wiki_cat_name, our_category in CATEGORY_MAP.items():
+            titles = api.category_members(category_title(wiki_cat_name))
+            print(f"  {wiki_cat_name} → {our_category}: {len(titles)} pages")
+            for title in titles:
+                category_of.setdefault(title, our_category)
+
+        # Article wikitext, 50 titles per request
+        pages = api.pages(list(category_of))
+
+        # Icons: File: titles from the infoboxes → URLs via prop=imageinfo (downloaded below)
+        icon_urls = fetch_icon_urls(api, [p for p in pages.values() if p and p["wikitext"]])
+
     all_ingredients = []
     errors = []
-
-    for wiki_cat_name, our_category in CATEGORY_MAP.items():
-        print(f"\n--- Category: {wiki_cat_name} → {our_category} ---")
-        urls = get_ingredient_list(wiki_cat_name)
-
-        for url in urls:
-            ingredient_name = url.split("/")[-1].replace("_", " ")
-            print(f"  Scraping: {ingredient_name}")
-            try:
-                ingredient = parse_ingredient_page(url, our_category)
-                if ingredient:
-                    all_ingredients.append(ingredient)
-                    print(f"  ✓ {ingredient['name']} (effect={ingredient['effect']}, "
-                          f"hearts={ingredient['hearts']}, sell={ingredient['sell_price']})")
-                else:
-                    errors.append(url)
-            except Exception as e:
-                print(f"  [ERROR] {url}: {e}")
-                errors.append(url)
+    for title, our_category in category_of.items():
+        page = pages.get(title)
+        fields = parse_infobox(page["wikitext"]) if page else {}
+        if not fields:
+            print(f"  [WARN] No infobox found for {title}")
+            errors.append(title)
+            continue
+        try:
+            ingredient = ingredient_from_fields(
+                page["title"], {k: strip_markup(v) for k, v in fields.items()}, our_category)
+        except Exception as e:
+            print(f"  [ERROR] {title}: {e}")
+            errors.append(title)
+            continue
+        all_ingredients.append(ingredient)
+        print(f"  ✓ {ingredient['name']} (effect={ingredient['effect']}, "
+              f"hearts={ingredient['hearts']}, sell={ingredient['sell_price']})")
+
+    for slug, url in icon_urls.items():
+        print(f"  Downloading icon for {slug}...")
+        download_image(url, IMG_DIR / f"{slug}.png")
 
     # Sort by category then name
     all_ingredients.sort(key=lambda x: (x["category"], x["name"]))
@@ -320,14 +261,19 @@ def scrape_all() -> None:
     with open(ingredients_path, "w", encoding="utf-8") as f:
         json.dump(all_ingredients, f, indent=2, ensure_ascii=False)
     print(f"\n✓ Wrote {len(all_ingredients)} ingredients to {ingredients_path}")
+    print(f"✓ {api.requests} API requests")
 
     if errors:
         print(f"\n⚠ {len(errors)} pages failed:")
-        for url in errors:
-            print(f"  {url}")
+        for title in errors:
+            print(f"  {title}")
 
     print("\nDone! Commit data/ and images/ to your repo.")
 
 
 if __name__ == "__main__":
-    scrape_all()
+    parser = argparse.ArgumentParser(description="Scrape ingredient data + icons from the wiki API.")
+    parser.add_argument("--api-url", default=API_URL, help="api.php endpoint (e.g. a local replay server)")
+    parser.add_argument("--record", type=Path, help="save every API response to this JSON file")
+    args = parser.parse_args()
+    scrape_all(args.api_url, args.record)
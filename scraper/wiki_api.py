@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+wiki_api.py — Batched MediaWiki API client shared by the scrapers
+
+Replaces one-rendered-page-per-ingredient scraping with the wiki's api.php:
+  - list=categorymembers, following `continue` tokens
+  - prop=revisions (wikitext) + prop=images, 50 titles per request
+  - prop=imageinfo to resolve File: pages to download URLs, 50 per request
+A full ingredient refresh is a handful of requests instead of hundreds.
+
+Responses can be recorded to a JSON file and replayed by a local stand-in
+server, so the scrapers can be exercised without hitting the live wiki. A
+recording is written once, when the client is closed (use it as a context
+manager):
+
+    python scraper/fetch_icons.py --record scraper/recordings/zeldawiki.json
+    python scraper/wiki_api.py serve scraper/recordings/zeldawiki.json --port 8800
+    python scraper/fetch_icons.py --api-url http://127.0.0.1:8800/api.php
+"""
+
+import argparse
+import http.server
+import json
+import re
+import time
+import urllib.parse
+from pathlib import Path
+
+import requests
+
+BATCH_SIZE = 50  # max titles per query for non-bot accounts
+
+
+class WikiAPIError(RuntimeError):
+    pass
+
+
+class WikiAPI:
+    """api.php client; `with WikiAPI(...) as api:` saves any recording on exit."""
+
+    def __init__(self, api_url: str, user_agent: str, rate_sec: float = 1.0,
+                 record_to: Path | None = None):
+        self.api_url = api_url
+        self.rate_sec = rate_sec
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        self.requests = 0
+        self.record_to = record_to
+        self._recorded: dict[str, dict] = {}
+        if record_to and record_to.exists():
+            self._recorded = json.loads(record_to.read_text(encoding="utf-8"))
+        self._unsaved = False
+
+    def __enter__(self) -> "WikiAPI":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()  # also on errors, so a failed refresh keeps what it fetched
+
+    def close(self) -> None:
+        """Write the recording, if any responses were added since the last save."""
+        if not (self.record_to and self._unsaved):
+            return
+        self.record_to.parent.mkdir(parents=True, exist_ok=True)
+        self.record_to.write_text(json.dumps(self._recorded, indent=1, sort_keys=True), encoding="utf-8")
+        self._unsaved = False
+
+    # ── Transport ──────────────────────────────────────────────────────────────
+    def get(self, params: dict) -> dict:
+        """One api.php request (action=query, JSON, formatversion=2)."""
+        params = {"action": "query", "format": "json", "formatversion": "2", **params}
+        if self.requests:
+            time.sleep(self.rate_sec)
+        resp = self.session.get(self.api_url, params=params, timeout=20)
+        resp.raise_for_status()
+        data = resp.json()
+        self.requests += 1
+        if "error" in data:
+            raise WikiAPIError(f"{data['error'].get('code')}: {data['error'].get('info')}")
+        if self.record_to:
+            self._recorded[request_key(params)] = data
+            self._unsaved = True
+        return data
+
+    def query_all(self, params: dict):
+        """Yield every response of a query, following `continue` tokens."""
+        cont: dict = {}
+        while True:
+            data = self.get({**params, **cont})
+            yield data
+            if "continue" not in data:
+                return
+            cont = data["continue"]
+
+    # ── Queries ────────────────────────────────────────────────────────────────
+    def category_members(self, category: str, namespace: int = 0) -> list[str]:
+        """Page titles in a category ('Category:' prefix optional)."""
+        if not category.startswith("Category:"):
+            category = f"Category:{category}"
+        titles = []
+        for data in self.query_all({"list": "categorymembers", "cmtitle": category,
+                                    "cmnamespace": str(namespace), "cmlimit": "max"}):
+            titles += [m["title"] for m in data.get("query", {}).get("categorymembers", [])]
+        return titles
+
+    def pages(self, titles: list[str], images: bool = False) -> dict[str, dict | None]:
+        """
+        Wikitext (and optionally the File: pages used) for each title, keyed
+        by the title as requested — normalization and redirects are followed.
+        Missing pages map to None.
+        """
+        props = {"prop": "revisions|images" if images else "revisions",
+                 "rvprop": "content", "rvslots": "main", "redirects": "1"}
+        if images:
+            props["imlimit"] = "max"
+
+        out: dict[str, dict | None] = {}
+        for batch in _batches(titles):
+            pages: dict[str, dict] = {}
+            alias: dict[str, str] = {}
+            for data in self.query_all({**props, "titles": "|".join(batch)}):
+                query = data.get("query", {})
+                for hop in query.get("normalized", []) + query.get("redirects", []):
+                    alias[hop["from"]] = hop["to"]
+                # A continued response repeats pages with only the next slice of props
+                for page in query.get("pages", []):
+                    entry = pages.setdefault(page["title"], {"title": page["title"], "wikitext": None,
+                                                             "images": [], "missing": False})
+                    entry["missing"] = entry["missing"] or bool(page.get("missing") or page.get("invalid"))
+                    for rev in page.get("revisions", []):
+                        entry["wikitext"] = rev.get("slots", {}).get("main", {}).get("content", rev.get("content"))
+                    entry["images"] += [img["title"] for img in page.get("images", [])]
+            for title in batch:
+                resolved = title
+                for _ in range(5):  # normalized → redirect → …
+                    if resolved not in alias:
+                        break
+                    resolved = alias[resolved]
+                entry = pages.get(resolved)
+                out[title] = None if not entry or entry["missing"] else entry
+        return out
+
+    def image_urls(self, files: list[str]) -> dict[str, str | None]:
+        """Download URL for each 'File:…' title (None if the file doesn't exist)."""
+        files = [f if f.startswith("File:") else f"File:{f}" for f in files]
+        out: dict[str, str | None] = {}
+        for batch in _batches(sorted(set(files))):
+            alias: dict[str, str] = {}
+            found: dict[str, str | None] = {}
+            for data in self.query_all({"prop": "imageinfo", "iiprop": "url", "titles": "|".join(batch)}):
+                query = data.get("query", {})
+                for hop in query.get("normalized", []):
+                    alias[hop["from"]] = hop["to"]
+                for page in query.get("pages", []):
+                    info = page.get("imageinfo") or []
+                    if info or page["title"] not in found:
+                        found[page["title"]] = info[0]["url"] if info else None
+            for f in batch:
+                out[f] = found.get(alias.get(f, f))
+        return out
+
+
+def _batches(items: list[str], size: int = BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def request_key(params: dict) -> str:
+    """Stable key for a request, shared by the recorder and the stand-in server."""
+    return urllib.parse.urlencode(sorted((k, str(v)) for k, v in params.items()))
+
+
+# ── Wikitext helpers ───────────────────────────────────────────────────────────
+def parse_infobox(wikitext: str, prefix: str = "Infobox") -> dict[str, str]:
+    """
+    Parameters of the first {{Infobox …}} template, keys lowercased with
+    underscores as spaces, values stripped to plain text.
+    """
+    start = (wikitext or "").find("{{" + prefix)
+    if start < 0:
+        return {}
+    # Walk to the matching closing braces, splitting on top-level pipes
+    depth, i, parts, last = 0, start, [], start + 2
+    while i < len(wikitext):
+        two = wikitext[i:i + 2]
+        if two in ("{{", "[["):
+            depth += 1
+            i += 2
+            continue
+        if two in ("}}", "]]"):
+            depth -= 1
+            i += 2
+            if depth == 0:
+                parts.append(wikitext[last:i - 2])
+                break
+            continue
+        if wikitext[i] == "|" and depth == 1:
+            parts.append(wikitext[last:i])
+            last = i + 1
+        i += 1
+
+    fields = {}
+    for part in parts[1:]:
+        key, eq, value = part.partition("=")
+        if eq:
+            fields[key.strip().lower().replace("_", " ")] = value.strip()
+    return fields
+
+
+def strip_markup(text: str) -> str:
+    """Plain text from a wikitext value: links, templates, refs and tags removed."""
+    text = re.sub(r"<ref[^>]*/>|<ref[^>]*>.*?</ref>", "", text, flags=re.S)
+    text = re.sub(r"<br\s*/?>", " ", text)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = re.sub(r"\[\[(?:File|Image):[^\]]*\]\]", "", text)
+    text = re.sub(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]", r"\1", text)
+    # Templates: keep their arguments, e.g. {{Term|TotK|5 Rupees}} → "TotK 5 Rupees"
+    while re.search(r"\{\{[^{}]*\}\}", text):
+        text = re.sub(r"\{\{([^{}]*)\}\}",
+                      lambda m: " ".join(a.split("=")[-1] for a in m.group(1).split("|")[1:]), text)
+    text = text.replace("'''", "").replace("''", "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def file_title(value: str) -> str | None:
+    """'[[File:TotK Apple Icon.png|64px]]' or 'TotK Apple Icon.png' → 'File:TotK Apple Icon.png'."""
+    m = re.search(r"(?:File|Image):([^|\]]+)", value) or re.search(r"([^|\[\]]+\.(?:png|jpe?g|gif|webp))", value, re.I)
+    return f"File:{m.group(1).strip()}" if m else None
+
+
+# ── Stand-in server ────────────────────────────────────────────────────────────
+def serve_recording(recording: Path, port: int) -> None:
+    """Replay recorded api.php responses; unknown requests get an API error."""
+    responses = json.loads(recording.read_text(encoding="utf-8"))
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = urllib.parse.urlsplit(self.path).query
+            key = request_key(dict(urllib.parse.parse_qsl(query, keep_blank_values=True)))
+            body = responses.get(key, {"error": {"code": "notrecorded", "info": key}})
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    print(f"✓ Replaying {len(responses)} recorded responses at http://127.0.0.1:{port}/api.php")
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MediaWiki API helpers.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    serve = sub.add_parser("serve", help="replay a recording as a local stand-in api.php")
+    serve.add_argument("recording", type=Path)
+    serve.add_argument("--port", type=int, default=8800)
+    args = parser.parse_args()
+    if args.cmd == "serve":
+        serve_recording(args.recording, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+/**
+ * sw.js — Offline-first service worker
+ *
+ * Precaches every URL in precache-manifest.json (generated by
+ * tools/build_sw_manifest.py) and serves them cache-first. On each page
+ * load the manifest is re-fetched in the background; only entries whose
+ * content hash changed are re-downloaded, removed entries are evicted.
+ *
+ * A sync that swaps entries posts 'sotd:precache-updated' to open pages.
+ * Their scripts are from the previous build, so they stop loading more code
+ * (SearchPool.pinToPage) and offer a reload; the next load is all new.
+ */
+
+const PRECACHE = 'sotd-precache-v1';
+const RUNTIME = 'sotd-runtime-v1';      // cross-origin fonts, fetched on first use
+const MANIFEST_URL = 'precache-manifest.json';
+const MANIFEST_KEY = '__sotd-manifest__'; // last manifest applied to PRECACHE
+const SYNC_INTERVAL_MS = 60 * 1000;
+
+let _lastSync = 0;
+let _syncing = null;
+
+function _abs(path) {
+  return new URL(path, self.registration.scope).href;
+}
+
+async function _fetchManifest() {
+  const resp = await fetch(_abs(MANIFEST_URL), { cache: 'no-store' });
+  if (!resp.ok) throw new Error(`precache manifest: HTTP ${resp.status}`);
+  return resp.json();
+}
+
+async function _storedManifest(cache) {
+  const resp = await cache.match(_abs(MANIFEST_KEY));
+  return resp ? resp.json() : { version: null, entries: {} };
+}
+
+/**
+ * Bring PRECACHE in line with the server manifest, touching only changed entries.
+ * Returns the list of URLs that were (re)fetched.
+ */
+async function syncPrecache() {
+  const cache = await caches.open(PRECACHE);
+  const [next, prev] = await Promise.all([_fetchManifest(), _storedManifest(cache)]);
+  if (next.version === prev.version) return [];
+
+  const changed = Object.keys(next.entries)
+    .filter(url => prev.entries[url] !== next.entries[url]);
+
+  // Fetch everything before writing so a failed sync leaves the old set intact
+  const responses = await Promise.all(changed.map(async url => {
+    const resp = await fetch(_abs(url), { cache: 'reload' });
+    if (!resp.ok) throw new Error(`precache ${url}: HTTP ${resp.status}`);
+    return resp;
+  }));
+  await Promise.all(changed.map((url, i) => cache.put(_abs(url), responses[i])));
+
+  const removed = Object.keys(prev.entries).filter(url => !(url in next.entries));
+  await Promise.all(removed.map(url => cache.delete(_abs(url))));
+
+  await cache.put(_abs(MANIFEST_KEY), new Response(JSON.stringify(next), {
+    headers: { 'Content-Type': 'application/json' },
+  }));
+  return changed;
+}
+
+function _backgroundSync() {
+  if (_syncing || Date.now() - _lastSync < SYNC_INTERVAL_MS) return _syncing;
+  _lastSync = Date.now();
+  _syncing = syncPrecache()
+    .then(async changed => {
+      if (changed.length === 0) return;
+      const clients = await self.clients.matchAll({ type: 'window' });
+      clients.forEach(c => c.postMessage({ type: 'sotd:precache-updated', urls: changed }));
+    })
+    .catch(err => console.warn('Precache sync failed:', err))
+    .finally(() => { _syncing = null; });
+  return _syncing;
+}
+
+self.addEventListener('install', (event) => {
+  _lastSync = Date.now();
+  event.waitUntil(syncPrecache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    const keep = new Set([PRECACHE, RUNTIME]);
+    const names = await caches.keys();
+    await Promise.all(names.filter(n => !keep.has(n)).map(n => caches.delete(n)));
+    await self.clients.claim();
+  })());
+});
+
+self.addEventListener('fetch', (event) => {
+  const req = event.request;
+  if (req.method !== 'GET') return;
+
+  const url = new URL(req.url);
+
+  if (url.origin !== self.location.origin) {
+    // Google Fonts (unbundled site): cache-first once seen, so they work offline
+    if (/fonts\.(googleapis|gstatic)\.com$/.test(url.hostname)) {
+      event.respondWith(_runtimeCacheFirst(req));
+    }
+    return;
+  }
+
+  if (req.mode === 'navigate') {
+    event.waitUntil(_backgroundSync());
+    event.respondWith(_cacheFirst(req, _abs('index.html')));
+    return;
+  }
+
+  // Query strings never change content here; match on path only
+  event.respondWith(_cacheFirst(req, url.origin + url.pathname));
+});
+
+async function _cacheFirst(req, key) {
+  const cache = await caches.open(PRECACHE);
+  const hit = await cache.match(key);
+  return hit || fetch(req);
+}
+
+async function _runtimeCacheFirst(req) {
+  const cache = await caches.open(RUNTIME);
+  const hit = await cache.match(req);
+  if (hit) return hit;
+  const resp = await fetch(req);
+  if (resp.ok || resp.type === 'opaque') cache.put(req, resp.clone());
+  return resp;
+}
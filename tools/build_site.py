@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+"""
+build_site.py — Bundle, minify and fingerprint the static site into dist/
+
+Reads index.html as the source of truth for script/stylesheet order, then:
+  - concatenates the <script> modules in page order and minifies them;
+    Web Worker scripts get their own bundles (see WORKER_BUNDLES)
+  - splits css/styles.css into inlined critical CSS + an async full sheet
+  - self-hosts the Google Fonts stylesheet and subsets every font to the
+    characters the site actually uses
+  - content-hashes every asset (js, css, fonts, data, images) and rewrites
+    references to the hashed names
+  - writes dist/ with an asset manifest and the service worker + its precache
+    manifest. On GitHub Pages, which sets its own cache headers, the hashed
+    names and the service worker are what make repeat visits cache-only; a
+    `_headers` file adds year-long immutable caching on hosts that read it
+    (Netlify, Cloudflare Pages)
+
+The source layout is untouched — the unbundled site keeps working as-is.
+
+Usage:  python tools/build_site.py            (run from project root)
+        python tools/build_site.py --no-fonts (skip Google Fonts download)
+
+Optional extras (used when installed, skipped otherwise):
+    pip install fonttools brotli    # font subsetting + woff2 output
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import re
+import shutil
+import string
+import urllib.request
+from pathlib import Path
+
+from build_sw_manifest import write_manifest
+
+try:
+    from fontTools import subset as font_subset
+except ImportError:  # pragma: no cover - optional extra
+    font_subset = None
+
+# ── Config ─────────────────────────────────────────────────────────────────────
+ROOT       = Path(__file__).parent.parent
+INDEX_HTML = ROOT / "index.html"
+DIST_DIR   = ROOT / "dist"
+
+HASH_LEN     = 10
+STATIC_DIRS  = ["images", "data"]  # copied verbatim (images) or rewritten (data)
+BUNDLE_NAME  = "js/app.js"
+# Worker entry point → scripts it needs, in order (the entry itself last)
+WORKER_BUNDLES = {
+    "js/search-worker.js": ["js/recipe-engine.js", "js/search-worker.js"],
+}
+FONT_UA      = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36"
+CACHE_FOREVER = "public, max-age=31536000, immutable"
+
+SCRIPT_RE     = re.compile(r'[ \t]*<script src="([^"]+)"></script>\n?')
+STYLESHEET_RE = re.compile(r'[ \t]*<link rel="stylesheet" href="([^"]+)">\n?')
+GFONTS_RE     = re.compile(r'[ \t]*<link [^>]*fonts\.(?:googleapis|gstatic)\.com[^>]*>\n?')
+CSS_URL_RE    = re.compile(r"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+
+
+# ── Hashing ────────────────────────────────────────────────────────────────────
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LEN]
+
+
+def hashed_name(rel_path: str, data: bytes) -> str:
+    """'images/apple.png' + bytes → 'images/apple.<hash>.png'."""
+    p = Path(rel_path)
+    return str(p.with_name(f"{p.stem}.{content_hash(data)}{p.suffix}")).replace("\\", "/")
+
+
+class AssetWriter:
+    """Writes fingerprinted files into dist/ and records source → hashed paths."""
+
+    def __init__(self, out_dir: Path):
+        self.out_dir = out_dir
+        self.manifest: dict[str, str] = {}
+
+    def write(self, rel_path: str, data: bytes) -> str:
+        target = hashed_name(rel_path, data)
+        dest = self.out_dir / target
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(data)
+        self.manifest[rel_path] = target
+        return target
+
+    def rewrite_refs(self, text: str) -> str:
+        """Replace quoted references to known source paths with hashed ones."""
+        if not self.manifest:
+            return text
+        keys = sorted(self.manifest, key=len, reverse=True)
+        pattern = re.compile(r"(?<=['\"`])(" + "|".join(map(re.escape, keys)) + r")(?=['\"`?#])")
+        return pattern.sub(lambda m: self.manifest[m.group(1)], text)
+
+
+# ── JS ─────────────────────────────────────────────────────────────────────────
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+# Keywords after which a "/" starts a regex literal rather than dividing
+_REGEX_KEYWORDS = {"return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+                   "throw", "case", "do", "else", "yield", "await"}
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c in "_$"
+
+
+def minify_js(src: str) -> str:
+    """
+    Conservative minifier: drops comments, indentation, trailing whitespace and
+    blank lines while leaving strings, template literals (multi-line ones
+    included) and regex literals byte-for-byte intact. Whitespace is handled
+    as it is scanned, outside literals only. Newlines are kept so automatic
+    semicolon insertion behaves as in source; a comment counts as whitespace.
+
+    A "/" starts a regex literal when the previous token is an operator or
+    punctuator (_REGEX_PRECEDERS), a keyword such as `return`
+    (_REGEX_KEYWORDS), or the start of the file; after an identifier, number,
+    literal, ")" or "]" it divides.
+    """
+    out: list[str] = []
+    i, n = 0, len(src)
+    last_sig = ""  # last significant token emitted: a punctuator char, a whole word, or a literal's last char
+
+    def gap(newline: bool) -> None:
+        # Whitespace between tokens: a newline per run of line breaks, one space
+        # for interior runs, nothing at line starts/ends
+        while newline and out and out[-1].isspace() and out[-1] != "\n":
+            out.pop()
+        if not out or out[-1] == "\n":
+            return
+        if newline:
+            out.append("\n")
+        elif not out[-1].isspace():
+            out.append(" ")
+
+    while i < n:
+        c = src[i]
+        nxt = src[i + 1] if i + 1 < n else ""
+        if c == "/" and nxt == "/":
+            while i < n and src[i] != "\n":
+                i += 1
+            continue
+        if c == "/" and nxt == "*":
+            end = src.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            gap("\n" in src[i:end])
+            i = end
+            continue
+        if c.isspace():
+            j = i
+            while j < n and src[j].isspace():
+                j += 1
+            gap("\n" in src[i:j])
+            i = j
+            continue
+        if c in "'\"`" or (c == "/" and (last_sig in _REGEX_PRECEDERS or last_sig in _REGEX_KEYWORDS
+                                          or last_sig == "")):
+            j = _skip_literal(src, i)
+            out.append(src[i:j])
+            last_sig = src[j - 1]
+            i = j
+            continue
+        if _is_word_char(c):
+            j = i + 1
+            while j < n and _is_word_char(src[j]):
+                j += 1
+            out.append(src[i:j])
+            last_sig = src[i:j]
+            i = j
+            continue
+        out.append(c)
+        last_sig = c
+        i += 1
+
+    gap(True)
+    return "".join(out) or "\n"
+
+
+def _skip_literal(src: str, i: int) -> int:
+    """Return the index just past the string/template/regex literal at src[i]."""
+    quote = src[i]
+    j = i + 1
+    in_class = False
+    depth = 0  # ${ … } nesting inside template literals
+    while j < len(src):
+        c = src[j]
+        if c == "\\":
+            j += 2
+            continue
+        if quote == "`":
+            if depth == 0 and c == "`":
+                return j + 1
+            if src.startswith("${", j):
+                depth += 1
+                j += 2
+                continue
+            if depth and c in "'\"`":
+                j = _skip_literal(src, j)
+                continue
+            if depth and c == "{":  # object literal or block inside the expression
+                depth += 1
+            elif depth and c == "}":
+                depth -= 1
+        elif quote == "/":
+            if c == "[":
+                in_class = True
+            elif c == "]":
+                in_class = False
+            elif c == "/" and not in_class:
+                j += 1
+                while j < len(src) and src[j].isalpha():  # flags
+                    j += 1
+                return j
+            elif c == "\n":
+                return j
+        elif c == quote:
+            return j + 1
+        j += 1
+    return j
+
+
+def build_js(script_paths: list[str], assets: AssetWriter, name: str = BUNDLE_NAME) -> str:
+    parts = []
+    for rel in script_paths:
+        src = (ROOT / rel).read_text(encoding="utf-8")
+        parts.append(f";\n{src}")
+    bundle = minify_js(assets.rewrite_refs("".join(parts)))
+    return assets.write(name, bundle.encode("utf-8"))
+
+
+# ── CSS ────────────────────────────────────────────────────────────────────────
+def minify_css(src: str) -> str:
+    src = re.sub(r"/\*.*?\*/", "", src, flags=re.S)
+    src = re.sub(r"\s+", " ", src)
+    src = re.sub(r"\s*([{};:,>])\s*", r"\1", src)
+    return src.replace(";}", "}").strip()
+
+
+def split_rules(css: str) -> list[str]:
+    """Split minified CSS into top-level rules (at-rule blocks kept whole)."""
+    rules, depth, start = [], 0, 0
+    for i, c in enumerate(css):
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                rules.append(css[start:i + 1])
+                start = i + 1
+    return rules
+
+
+def _selector_is_static(selector: str, static_tokens: set[str]) -> bool:
+    tokens = re.findall(r"[.#][A-Za-z_][\w-]*", re.sub(r"::?[\w-]+(\([^)]*\))?", "", selector))
+    return all(t in static_tokens for t in tokens)
+
+
+def critical_css(css: str, html: str) -> str:
+    """
+    Keep rules whose selectors only reference classes/ids present in the
+    static index.html shell. Cards, results and toasts are created by JS after
+    the data loads, by which point the full stylesheet has arrived.
+    """
+    static_tokens = {f"#{m}" for m in re.findall(r'\bid="([^"]+)"', html)}
+    for classes in re.findall(r'\bclass="([^"]+)"', html):
+        static_tokens.update(f".{c}" for c in classes.split())
+
+    keep = []
+    for rule in split_rules(css):
+        head, _, body = rule.partition("{")
+        if head.startswith("@font-face"):
+            keep.append(rule)
+            continue
+        if head.startswith("@keyframes"):
+            continue
+        if head.startswith("@media"):
+            inner = [r for r in split_rules(body[:-1])
+                     if any(_selector_is_static(s, static_tokens) for s in r.partition("{")[0].split(","))]
+            if inner:
+                keep.append(head + "{" + "".join(inner) + "}")
+            continue
+        if any(_selector_is_static(s, static_tokens) for s in head.split(",")):
+            keep.append(rule)
+    return "".join(keep)
+
+
+def rewrite_css_urls(css: str, css_rel: str, assets: AssetWriter) -> str:
+    """Point url(...) references at hashed assets, relative to the css file."""
+    css_dir = Path(css_rel).parent
+
+    def repl(m):
+        url = m.group(2)
+        if re.match(r"^(data:|https?:|//)", url):
+            return m.group(0)
+        src_rel = _normalize(css_dir / url)
+        target = assets.manifest.get(src_rel)
+        if not target:
+            return m.group(0)
+        up = "../" * len(css_dir.parts)
+        return f"url('{up}{target}')"
+
+    return CSS_URL_RE.sub(repl, css)
+
+
+def _normalize(path: Path) -> str:
+    parts = []
+    for part in path.parts:
+        if part == "..":
+            if parts:
+                parts.pop()
+        elif part != ".":
+            parts.append(part)
+    return "/".join(parts)
+
+
+# ── Fonts ──────────────────────────────────────────────────────────────────────
+def used_characters() -> str:
+    """Every character the site can render: page, scripts, data + printable ASCII."""
+    chars = set(string.printable)
+    for path in [INDEX_HTML, *ROOT.glob("js/**/*.js"), *ROOT.glob("data/*.json")]:
+        chars.update(path.read_text(encoding="utf-8"))
+    return "".join(sorted(c for c in chars if c.isprintable()))
+
+
+def subset_font(data: bytes, text: str) -> tuple[bytes, str]:
+    """Subset to `text`; returns (font bytes, format). No-op without fontTools."""
+    if font_subset is None:
+        return data, ""
+    options = font_subset.Options()
+    try:
+        import brotli  # noqa: F401  (woff2 needs it)
+        options.flavor = "woff2"
+    except ImportError:
+        options.flavor = "woff"
+    font = font_subset.load_font(io.BytesIO(data), options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    buf = io.BytesIO()
+    font_subset.save_font(font, buf, options)
+    return buf.getvalue(), options.flavor
+
+
+_FONT_FORMAT = {".ttf": "truetype", ".otf": "opentype", ".woff": "woff", ".woff2": "woff2"}
+
+
+def build_local_fonts(css: str, css_rel: str, text: str, assets: AssetWriter) -> str:
+    """Subset fonts referenced by @font-face blocks and register them as assets."""
+    css_dir = Path(css_rel).parent
+
+    def repl(block_match):
+        block = block_match.group(0)
+        for m in CSS_URL_RE.finditer(block):
+            src_rel = _normalize(css_dir / m.group(2))
+            suffix = Path(src_rel).suffix.lower()
+            if suffix not in _FONT_FORMAT:
+                continue
+            data, flavor = subset_font((ROOT / src_rel).read_bytes(), text)
+            ext = f".{flavor}" if flavor else suffix
+            assets.manifest[src_rel] = assets.write(f"fonts/{Path(src_rel).stem}{ext}", data)
+            if flavor:
+                block = block.replace(f"format('{_FONT_FORMAT[suffix]}')", f"format('{flavor}')")
+        return block
+
+    return re.sub(r"@font-face\s*{[^}]*}", repl, css)
+
+
+def _in_unicode_range(range_spec: str, codepoints: set[int]) -> bool:
+    for part in range_spec.split(","):
+        part = part.strip().upper().removeprefix("U+")
+        if "-" in part:
+            lo, hi = (int(x, 16) for x in part.split("-"))
+        elif "?" in part:
+            lo, hi = int(part.replace("?", "0"), 16), int(part.replace("?", "F"), 16)
+        else:
+            lo = hi = int(part, 16)
+        if any(lo <= cp <= hi for cp in codepoints):
+            return True
+    return False
+
+
+def fetch_google_fonts(html: str, text: str, assets: AssetWriter) -> str:
+    """
+    Download the Google Fonts stylesheet linked from index.html, keep only the
+    @font-face blocks whose unicode-range covers characters we use, and
+    self-host their font files. Returns the @font-face CSS ('' on failure).
+    """
+    m = re.search(r'href="(https://fonts\.googleapis\.com/[^"]+)"', html)
+    if not m:
+        return ""
+    url = m.group(1).replace("&amp;", "&")
+    try:
+        req = urllib.request.Request(url, headers={"User-Agent": FONT_UA})
+        with urllib.request.urlopen(req, timeout=20) as resp:
+            font_css = resp.read().decode("utf-8")
+    except Exception as e:
+        print(f"  [WARN] Google Fonts download failed ({e}); keeping remote stylesheet")
+        return ""
+
+    codepoints = {ord(c) for c in text}
+    blocks = []
+    for block in re.findall(r"@font-face\s*{[^}]*}", font_css):
+        rng = re.search(r"unicode-range:\s*([^;]+);", block)
+        if rng and not _in_unicode_range(rng.group(1), codepoints):
+            continue
+        family = re.search(r"font-family:\s*'([^']+)'", block).group(1)
+        weight = re.search(r"font-weight:\s*(\d+)", block)
+        for src_url in re.findall(r"url\((https://[^)]+)\)", block):
+            try:
+                with urllib.request.urlopen(src_url, timeout=20) as resp:
+                    data = resp.read()
+            except Exception as e:
+                print(f"  [WARN] Font download failed ({e}); keeping remote stylesheet")
+                return ""
+            data, flavor = subset_font(data, text)
+            ext = flavor or Path(src_url).suffix.lstrip(".") or "woff2"
+            stem = f"{family.replace(' ', '-')}-{weight.group(1) if weight else 'regular'}-{len(blocks)}"
+            target = assets.write(f"fonts/{stem}.{ext}", data)
+            block = block.replace(src_url, f"../{target}")
+        blocks.append(block)
+    return "\n".join(blocks)
+
+
+# ── HTML ───────────────────────────────────────────────────────────────────────
+def minify_html(html: str) -> str:
+    html = re.sub(r"<!--.*?-->", "", html, flags=re.S)
+    lines = (line.strip() for line in html.splitlines())
+    return "\n".join(line for line in lines if line) + "\n"
+
+
+def build_html(html: str, js_target: str, css_target: str, critical: str,
+               self_hosted_fonts: bool, assets: AssetWriter) -> str:
+    html = SCRIPT_RE.sub("", html)
+    html = html.replace("</body>", f'<script src="{js_target}" defer></script>\n</body>')
+
+    if self_hosted_fonts:
+        html = GFONTS_RE.sub("", html)
+
+    data_preloads = "".join(
+        f'<link rel="preload" href="{target}" as="fetch" crossorigin>\n'
+        for src, target in assets.manifest.items() if src.startswith("data/")
+    )
+    css_links = (
+        f"<style>{critical}</style>\n"
+        f'<link rel="preload" href="{css_target}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        f'<noscript><link rel="stylesheet" href="{css_target}"></noscript>\n'
+    )
+    # The bundle replaces every source stylesheet; drop them all before adding
+    # css_links, whose <noscript> fallback link would otherwise match too
+    first = STYLESHEET_RE.search(html)
+    if first:
+        html = html[:first.start()] + data_preloads + css_links + STYLESHEET_RE.sub("", html[first.end():])
+    return minify_html(assets.rewrite_refs(html))
+
+
+# ── Main ───────────────────────────────────────────────────────────────────────
+class SiteBuild:
+    """
+    One dist/ build split into steps (images → data → css → js → html → meta)
+    so tools/watch.py can re-run only the steps whose inputs changed. Each
+    step returns a signature of what it wrote; downstream steps only need to
+    re-run when that signature changes.
+    """
+
+    def __init__(self, out_dir: Path = DIST_DIR, fonts: bool = True):
+        self.out_dir = out_dir
+        self.fonts = fonts
+        self.assets = AssetWriter(out_dir)
+        self._step_keys: dict[str, set[str]] = {}  # step → manifest keys it wrote
+        self._google_css: str | None = None        # fetched once per SiteBuild
+        self.css_target = self.critical = self.js_target = ""
+        self.self_hosted_fonts = False
+        self.load_html()
+
+    def load_html(self) -> None:
+        self.html = INDEX_HTML.read_text(encoding="utf-8")
+        self.scripts = [m.group(1) for m in SCRIPT_RE.finditer(self.html)]
+        self.stylesheets = [m.group(1) for m in STYLESHEET_RE.finditer(self.html)]
+
+    def _begin(self, step: str) -> None:
+        """Forget the manifest entries this step wrote last time."""
+        for key in self._step_keys.get(step, ()):
+            self.assets.manifest.pop(key, None)
+        self._before = set(self.assets.manifest.items())
+
+    def _end(self, step: str) -> str:
+        written = set(self.assets.manifest.items()) - self._before
+        self._step_keys[step] = {key for key, _ in written}
+        return content_hash(json.dumps(sorted(written)).encode("utf-8"))
+
+    def build_images(self) -> str:
+        self._begin("images")
+        for path in sorted((ROOT / "images").rglob("*")):
+            if path.is_file():
+                self.assets.write(path.relative_to(ROOT).as_posix(), path.read_bytes())
+        return self._end("images")
+
+    def build_data(self) -> str:
+        """Data JSON, with icon paths rewritten to hashed names."""
+        self._begin("data")
+        for path in sorted((ROOT / "data").glob("*.json")):
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(raw, list):
+                for item in raw:
+                    if isinstance(item, dict) and item.get("icon") in self.assets.manifest:
+                        item["icon"] = self.assets.manifest[item["icon"]]
+            data = json.dumps(raw, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self.assets.write(path.relative_to(ROOT).as_posix(), data)
+        return self._end("data")
+
+    def build_css(self) -> str:
+        text = used_characters()
+        if self.fonts and self._google_css is None:
+            self._begin("google-fonts")
+            self._google_css = fetch_google_fonts(self.html, text, self.assets)
+            self._end("google-fonts")
+
+        self._begin("css")
+        css_parts = []
+        google_css = self._google_css or ""
+        self.self_hosted_fonts = bool(google_css)
+        if google_css:
+            css_parts.append(rewrite_css_urls(google_css, "css/fonts.css", self.assets))
+        for rel in self.stylesheets:
+            css = (ROOT / rel).read_text(encoding="utf-8")
+            css = build_local_fonts(css, rel, text, self.assets)
+            css_parts.append(rewrite_css_urls(css, rel, self.assets))
+        full_css = minify_css("\n".join(css_parts))
+        self.css_target = self.assets.write(self.stylesheets[0] if self.stylesheets else "css/styles.css",
+                                            full_css.encode("utf-8"))
+        # Inlined into index.html, so css-relative '../' urls become root-relative
+        self.critical = critical_css(full_css, self.html).replace("url('../", "url('")
+        self.css_size = len(full_css)
+        return self._end("css") + content_hash(self.critical.encode("utf-8"))
+
+    def build_js(self) -> str:
+        self._begin("js")
+        # Workers first, so the page bundle's references to them get rewritten
+        for entry, scripts in WORKER_BUNDLES.items():
+            build_js(scripts, self.assets, entry)
+        self.js_target = build_js(self.scripts, self.assets)
+        return self._end("js")
+
+    def build_html(self) -> str:
+        """index.html itself is never fingerprinted."""
+        out_html = build_html(self.html, self.js_target, self.css_target, self.critical,
+                              self.self_hosted_fonts, self.assets)
+        (self.out_dir / "index.html").write_text(out_html, encoding="utf-8")
+        return content_hash(out_html.encode("utf-8"))
+
+    def write_meta(self) -> dict:
+        """Host metadata, service worker and its precache manifest; drops stale hashed files."""
+        out_dir = self.out_dir
+        (out_dir / ".nojekyll").write_text("", encoding="utf-8")
+        shutil.copyfile(ROOT / "sw.js", out_dir / "sw.js")
+        # Netlify / Cloudflare Pages only — GitHub Pages ignores this file
+        (out_dir / "_headers").write_text(
+            "".join(f"/{name}\n  Cache-Control: no-cache\n" for name in ["index.html", "sw.js", "precache-manifest.json"])
+            + "".join(f"/{d}/*\n  Cache-Control: {CACHE_FOREVER}\n" for d in ["js", "css", "fonts", *STATIC_DIRS]),
+            encoding="utf-8",
+        )
+        (out_dir / "asset-manifest.json").write_text(
+            json.dumps(self.assets.manifest, indent=2, sort_keys=True), encoding="utf-8")
+        self.prune()
+        return write_manifest(out_dir)
+
+    def prune(self) -> None:
+        """Delete hashed files no longer referenced by the manifest (left by earlier runs)."""
+        live = set(self.assets.manifest.values())
+        for dirname in ["js", "css", "fonts", *STATIC_DIRS]:
+            d = self.out_dir / dirname
+            if not d.is_dir():
+                continue
+            for path in d.rglob("*"):
+                if path.is_file() and path.relative_to(self.out_dir).as_posix() not in live:
+                    path.unlink()
+
+
+def build(out_dir: Path = DIST_DIR, fonts: bool = True) -> dict[str, str]:
+    """Build the site into out_dir. Returns the source → hashed asset manifest."""
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+    site = SiteBuild(out_dir, fonts)
+
+    # Images first — data and CSS reference them
+    site.build_images()
+    site.build_data()
+    print(f"✓ Fingerprinted {len(site.assets.manifest)} images + data files")
+
+    site.build_css()
+    print(f"✓ CSS: {site.css_size} bytes, {len(site.critical)} bytes critical (inlined)")
+    if font_subset is None:
+        print("  [INFO] fontTools not installed — fonts copied without subsetting")
+
+    site.build_js()
+    print(f"✓ Bundled {len(site.scripts)} scripts → {site.js_target}")
+
+    site.build_html()
+    sw_manifest = site.write_meta()
+    print(f"✓ Service worker precache: {len(sw_manifest['entries'])} entries")
+
+    print(f"✓ Wrote {out_dir}")
+    return site.assets.manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--out", type=Path, default=DIST_DIR, help="output directory (default: dist/)")
+    parser.add_argument("--no-fonts", action="store_true", help="keep the remote Google Fonts stylesheet")
+    args = parser.parse_args()
+    build(args.out, fonts=not args.no_fonts)
+
+
+if __name__ == "__main__":
+    main()
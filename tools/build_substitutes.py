@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+build_substitutes.py — Precompute the ingredient substitution index
+
+For every ingredient, lists the ingredients that can stand in for it in a
+recipe: same type (food / critter / monster part, so the recipe type can't
+change) and same effect (so the dominant effect stays), ranked by how close
+their potency, duration, hearts and sell price are. The results panel uses
+it to suggest swaps for a combo without running a new search.
+
+Writes data/substitutes.json:
+
+    { "apple": ["hylian-tomato", "wildberry", ...], ... }
+
+Usage:  python tools/build_substitutes.py   (run from project root)
+Re-run (and commit the output) after changing ingredients.json.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from recipe_engine import DATA_DIR, load_data, name_key
+
+OUT_NAME        = "substitutes.json"
+MAX_SUBSTITUTES = 6
+
+# Attributes that feed computeRecipe for each ingredient type; hearts only
+# count in meals, so they don't separate critters or monster parts
+ATTRS = {
+    "food":    ["effect_potency", "effect_duration_sec", "hearts", "sell_price"],
+    "critter": ["effect_potency", "effect_duration_sec", "sell_price"],
+    "monster": ["effect_potency", "effect_duration_sec", "sell_price"],
+}
+
+
+def _scales(ingredients: list[dict]) -> dict[tuple[str, str], float]:
+    """Range of each attribute within each type, so attributes weigh equally."""
+    scales = {}
+    for type_, attrs in ATTRS.items():
+        group = [i for i in ingredients if i["type"] == type_]
+        for attr in attrs:
+            values = [i.get(attr) or 0 for i in group] or [0]
+            scales[type_, attr] = (max(values) - min(values)) or 1
+    return scales
+
+
+def distance(a: dict, b: dict, scales: dict[tuple[str, str], float]) -> float:
+    return sum(abs((a.get(attr) or 0) - (b.get(attr) or 0)) / scales[a["type"], attr]
+               for attr in ATTRS[a["type"]])
+
+
+def build_index(ingredients: list[dict], limit: int = MAX_SUBSTITUTES) -> dict[str, list[str]]:
+    scales = _scales(ingredients)
+    groups: dict[tuple[str, str | None], list[dict]] = {}
+    for ing in ingredients:
+        if ing["type"] in ATTRS:
+            groups.setdefault((ing["type"], ing.get("effect")), []).append(ing)
+
+    index = {}
+    for ing in ingredients:
+        peers = [p for p in groups.get((ing["type"], ing.get("effect")), []) if p["id"] != ing["id"]]
+        peers.sort(key=lambda p: (distance(ing, p, scales), name_key(p)))
+        if peers:
+            index[ing["id"]] = [p["id"] for p in peers[:limit]]
+    return index
+
+
+def write_index(data_dir: Path = DATA_DIR, limit: int = MAX_SUBSTITUTES) -> dict[str, list[str]]:
+    """Rebuild data/substitutes.json; the file is only rewritten when it changes."""
+    ingredients, _ = load_data(data_dir)
+    index = build_index(ingredients, limit)
+    out = data_dir / OUT_NAME
+    text = json.dumps(index, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    if not out.exists() or out.read_text(encoding="utf-8") != text:
+        out.write_text(text, encoding="utf-8")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the ingredient substitution index.")
+    parser.add_argument("--limit", type=int, default=MAX_SUBSTITUTES, help="substitutes kept per ingredient")
+    args = parser.parse_args()
+
+    index = write_index(limit=args.limit)
+    pairs = sum(len(subs) for subs in index.values())
+    print(f"✓ {len(index)} ingredients, {pairs} substitutes → {DATA_DIR / OUT_NAME}")
+
+
+if __name__ == "__main__":
+    main()
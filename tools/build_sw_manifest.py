@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+build_sw_manifest.py — Generate the service worker precache manifest
+
+Hashes every file the app needs offline (index.html, data/, js/, css/,
+images/ and the self-hosted fonts) and writes precache-manifest.json next to
+sw.js:
+
+    { "version": "<hash of all entries>",
+      "entries": { "data/ingredients.json": "<content hash>", ... } }
+
+sw.js serves these URLs cache-first and, when the manifest changes, re-fetches
+only the entries whose hash differs.
+
+Usage:  python tools/build_sw_manifest.py   (run from project root)
+Re-run (and commit the output) after changing data, scripts, styles or icons.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+ROOT          = Path(__file__).parent.parent
+MANIFEST_NAME = "precache-manifest.json"
+HASH_LEN      = 10
+
+PRECACHE_DIRS  = ["data", "js", "css", "images", "fonts"]
+PRECACHE_FILES = ["index.html"]
+FONT_SUFFIXES  = {".ttf", ".otf", ".woff", ".woff2"}
+SKIP_NAMES     = {"sw.js", MANIFEST_NAME, "asset-manifest.json"}
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:HASH_LEN]
+
+
+def collect_entries(site_dir: Path) -> dict[str, str]:
+    """Map site-relative URL → content hash for every precached file."""
+    paths = [site_dir / name for name in PRECACHE_FILES]
+    paths += [p for p in site_dir.iterdir() if p.suffix.lower() in FONT_SUFFIXES]
+    for dirname in PRECACHE_DIRS:
+        d = site_dir / dirname
+        if d.is_dir():
+            paths += [p for p in d.rglob("*") if p.is_file()]
+
+    entries = {}
+    for path in sorted(paths):
+        if not path.is_file() or path.name in SKIP_NAMES or path.name.startswith("."):
+            continue
+        entries[path.relative_to(site_dir).as_posix()] = file_hash(path)
+    return entries
+
+
+def build_manifest(site_dir: Path = ROOT) -> dict:
+    entries = collect_entries(site_dir)
+    digest = hashlib.sha256(json.dumps(entries, sort_keys=True).encode("utf-8"))
+    return {"version": digest.hexdigest()[:HASH_LEN], "entries": entries}
+
+
+def write_manifest(site_dir: Path = ROOT) -> dict:
+    """Write <site_dir>/precache-manifest.json and return the manifest."""
+    manifest = build_manifest(site_dir)
+    out = site_dir / MANIFEST_NAME
+    out.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return manifest
+
+
+def main():
+    manifest = write_manifest(ROOT)
+    print(f"✓ Wrote {MANIFEST_NAME}: {len(manifest['entries'])} entries, version {manifest['version']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+parallel_enum.py — Exhaustive multiset enumeration across all CPU cores
+
+Walks every canonical ingredient multiset (1–5 items, each ingredient at most
+--max-qty times) and keeps the global top-K by sell value, or by the goal-mode
+ordering for one effect. Meant for offline work that recipe_engine.py's single
+core can't finish: full best-combo tables, or checking a rule change against
+every combo of the 225 ingredients (~5.1 billion multisets).
+
+How the work is split:
+  - Ingredients are indexed in name order (the engine's canonical order), and
+    the multiset space is partitioned by leading ingredient index.
+  - Partitions are very skewed (index 0 heads far more multisets than index
+    224), so the largest are split further by their next index until every
+    chunk is small; chunks are queued biggest-first.
+  - Ingredient attributes live in one multiprocessing.shared_memory block that
+    every worker maps instead of receiving a copy.
+  - Each worker keeps its own top-K heap across all chunks it takes; the
+    parent merges the per-worker heaps and recomputes the winners with
+    recipe_engine.compute_recipe.
+
+Usage:  python tools/parallel_enum.py --top 20
+        python tools/parallel_enum.py --types critter,monster --workers 8
+        python tools/parallel_enum.py --rank duration --effect attack-up --tier 3
+"""
+
+import argparse
+import heapq
+import math
+import multiprocessing as mp
+import os
+import time
+from array import array
+from multiprocessing import shared_memory
+
+from recipe_engine import COUNT_SELL_MULT, MAX_SLOTS, compute_recipe, load_data, name_key
+
+TYPE_CODES = {"food": 0, "critter": 1, "monster": 2}
+COLUMNS    = ("type", "effect", "potency", "duration", "hearts", "sell")
+CHUNKS_PER_WORKER = 16   # split until the largest chunk is ≤ total / (workers × this)
+
+
+# ── Shared attribute table ─────────────────────────────────────────────────────
+def pack_attributes(ingredients: list[dict], effect_index: dict) -> array:
+    """Column-major float64 table: COLUMNS[c] of ingredient i is at c * n + i."""
+    n = len(ingredients)
+    table = array("d", bytes(8 * n * len(COLUMNS)))
+    for i, ing in enumerate(ingredients):
+        row = (
+            TYPE_CODES.get(ing["type"], 3),
+            effect_index.get(ing.get("effect"), -1),
+            ing.get("effect_potency") or 0,
+            ing.get("effect_duration_sec") or 0,
+            ing.get("hearts") or 0,
+            ing.get("sell_price") or 0,
+        )
+        for c, value in enumerate(row):
+            table[c * n + i] = value
+    return table
+
+
+# ── Chunking ───────────────────────────────────────────────────────────────────
+def _extensions(n: int, start: int, slots: int) -> int:
+    """Nondecreasing sequences of length 0..slots over indices start..n-1 (qty caps ignored)."""
+    k = n - start
+    return sum(math.comb(k + r - 1, r) for r in range(slots + 1)) if k > 0 else 1
+
+
+def plan_chunks(n: int, max_qty: list[int], max_size: int, workers: int) -> list[tuple]:
+    """
+    Chunks are (prefix, extend): the multiset `prefix` itself, plus — when
+    extend is True — every multiset that continues it with indices ≥ prefix[-1].
+    Returns chunks largest-first by estimated size.
+    """
+    def cost(chunk):
+        prefix, extend = chunk
+        return _extensions(n, prefix[-1], max_size - len(prefix)) if extend else 1
+
+    chunks = [((i,), max_size > 1) for i in range(n) if max_qty[i] > 0]
+    total = sum(cost(c) for c in chunks)
+    target = max(1, total // (max(workers, 1) * CHUNKS_PER_WORKER))
+
+    heap = [(-cost(c), c) for c in chunks]
+    heapq.heapify(heap)
+    done = []
+    while heap and -heap[0][0] > target:
+        _, (prefix, extend) = heapq.heappop(heap)
+        done.append((prefix, False))
+        last = prefix[-1]
+        for j in range(last, n):
+            if prefix.count(j) >= max_qty[j]:
+                continue
+            child = (prefix + (j,), len(prefix) + 1 < max_size)
+            heapq.heappush(heap, (-cost(child), child))
+    done += [c for _, c in heap]
+    done.sort(key=cost, reverse=True)
+    return done
+
+
+# ── Worker ─────────────────────────────────────────────────────────────────────
+def _worker(shm_name: str, n: int, max_qty: list[int], max_size: int, params: dict,
+            tasks: mp.Queue, results: mp.Queue) -> None:
+    # Children share the parent's resource tracker, so attaching here doesn't
+    # change who unlinks the block — the parent does, once every worker is done.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    table = shm.buf.cast("d")
+    t_type, t_effect, t_potency, t_duration, t_hearts, t_sell = (
+        table[c * n:(c + 1) * n] for c in range(len(COLUMNS)))
+
+    rank = params["rank"]
+    top_k = params["top"]
+    target_effect = params.get("effect_idx", -1)
+    target_tier = params.get("tier", 0)
+    thresholds = params["thresholds"]
+    mult = [0.0] + [COUNT_SELL_MULT[s] for s in range(1, MAX_SLOTS + 1)]
+
+    heap: list[tuple] = []          # min-heap of (score, tiebreak, seq)
+    counts = {"leaves": 0, "meal": 0, "elixir": 0, "dubious": 0}
+
+    def evaluate(seq: list[int]) -> None:
+        counts["leaves"] += 1
+        food = critter = monster = 0
+        base = 0.0
+        for i in seq:
+            t = t_type[i]
+            if t == 0:
+                food += 1
+            elif t == 1:
+                critter += 1
+            elif t == 2:
+                monster += 1
+            base += t_sell[i]
+        if food and not critter and not monster:
+            kind = "meal"
+        elif critter and monster and not food:
+            kind = "elixir"
+        else:
+            counts["dubious"] += 1
+            return
+        counts[kind] += 1
+        sell = int((base * mult[min(len(seq), MAX_SLOTS)] + 0.5) // 1)
+
+        if rank == "sell":
+            score = (sell,)
+        else:
+            # Dominant effect, same rules (and first-seen tie-break) as compute_dominant_effect
+            route = 1 if kind == "elixir" else 0
+            acc: dict = {}
+            bonus_p = bonus_d = 0.0
+            hearts = 0.0
+            for i in seq:
+                t = t_type[i]
+                if t == 0:
+                    hearts += t_hearts[i]
+                if kind == "elixir" and t == 2:
+                    bonus_p += t_potency[i]
+                    bonus_d += t_duration[i]
+                    continue
+                e = t_effect[i]
+                if t != route or e < 0:
+                    continue
+                pd = acc.setdefault(e, [0.0, 0.0])
+                pd[0] += t_potency[i]
+                pd[1] += t_duration[i]
+            best = None
+            best_p = 0
+            for e, (p, d) in acc.items():
+                if p > best_p:
+                    best_p, best = p, (e, p, d)
+            if best is None or best[0] != target_effect:
+                return
+            potency = best[1] + (bonus_p if kind == "elixir" else 0)
+            duration = best[2] + (bonus_d if kind == "elixir" else 0)
+            if target_tier > 0:
+                th = thresholds[target_effect]
+                tier = next((t + 1 for t in range(len(th) - 1, -1, -1) if potency >= th[t]), 0)
+                if tier < target_tier:
+                    return
+            score = (duration, -len(seq), 0.0 if kind == "elixir" else hearts, sell)
+
+        # Ties prefer the lexicographically smaller sequence (shorter first)
+        tiebreak = tuple(-i for i in seq) + (1,) * (MAX_SLOTS - len(seq))
+        entry = (score, tiebreak, tuple(seq))
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def extend(seq: list[int], start: int, used: int, slots: int) -> None:
+        for j in range(start, n):
+            c = used if j == start else 0
+            if c >= max_qty[j]:
+                continue
+            seq.append(j)
+            evaluate(seq)
+            if slots > 1:
+                extend(seq, j, c + 1, slots - 1)
+            seq.pop()
+
+    try:
+        while (task := tasks.get()) is not None:
+            prefix, more = task
+            seq = list(prefix)
+            evaluate(seq)
+            if more:
+                extend(seq, prefix[-1], prefix.count(prefix[-1]), max_size - len(prefix))
+        results.put((heap, counts))
+    finally:
+        del t_type, t_effect, t_potency, t_duration, t_hearts, t_sell, table
+        shm.close()
+
+
+# ── Driver ─────────────────────────────────────────────────────────────────────
+def run(ingredients: list[dict], effects: list[dict], *, rank: str = "sell", top: int = 20,
+        max_size: int = MAX_SLOTS, max_qty: int = MAX_SLOTS, workers: int | None = None,
+        effect: str | None = None, tier: int = 0) -> tuple[list[dict], dict]:
+    """
+    Enumerate every multiset of `ingredients` in parallel.
+    Returns ([{'ingredients', 'result', 'score'}] best-first, counts).
+    """
+    workers = workers or os.cpu_count() or 1
+    ingredients = sorted(ingredients, key=name_key)
+    n = len(ingredients)
+    effect_index = {e["id"]: k for k, e in enumerate(effects)}
+    effects_by_id = {e["id"]: e for e in effects}
+    caps = [max_qty] * n
+
+    params = {
+        "rank": rank,
+        "top": top,
+        "thresholds": [e.get("potency_thresholds") or [] for e in effects],
+    }
+    if rank == "duration":
+        if effect not in effect_index:
+            raise ValueError(f"unknown effect: {effect!r}")
+        params.update(effect_idx=effect_index[effect], tier=tier)
+
+    table = pack_attributes(ingredients, effect_index)
+    shm = shared_memory.SharedMemory(create=True, size=max(len(table) * table.itemsize, 1))
+    try:
+        shm.buf[:len(table) * table.itemsize] = table.tobytes()
+        chunks = plan_chunks(n, caps, max_size, workers)
+
+        ctx = mp.get_context()
+        tasks, results = ctx.Queue(), ctx.Queue()
+        procs = [ctx.Process(target=_worker, args=(shm.name, n, caps, max_size, params, tasks, results))
+                 for _ in range(workers)]
+        for p in procs:
+            p.start()
+        for chunk in chunks:
+            tasks.put(chunk)
+        for _ in procs:
+            tasks.put(None)
+
+        merged: list[tuple] = []
+        counts = {"chunks": len(chunks), "workers": workers}
+        for _ in procs:
+            heap, worker_counts = results.get()
+            merged += heap
+            for key, value in worker_counts.items():
+                counts[key] = counts.get(key, 0) + value
+        for p in procs:
+            p.join()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    best = heapq.nlargest(top, merged)
+    out = []
+    for score, _, seq in best:
+        combo = [ingredients[i] for i in seq]
+        out.append({"ingredients": combo, "result": compute_recipe(combo, effects_by_id), "score": score})
+    return out, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exhaustive parallel multiset enumeration.")
+    parser.add_argument("--rank", choices=("sell", "duration"), default="sell",
+                        help="sell value, or goal-mode ordering for --effect")
+    parser.add_argument("--effect", help="target effect id (with --rank duration)")
+    parser.add_argument("--tier", type=int, default=0)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--types", help="comma-separated ingredient types to include (default: all)")
+    parser.add_argument("--max-size", type=int, default=MAX_SLOTS, choices=range(1, MAX_SLOTS + 1))
+    parser.add_argument("--max-qty", type=int, default=MAX_SLOTS, choices=range(1, MAX_SLOTS + 1))
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    args = parser.parse_args()
+
+    ingredients, effects = load_data()
+    if args.types:
+        wanted = set(args.types.split(","))
+        ingredients = [i for i in ingredients if i["type"] in wanted]
+
+    start = time.perf_counter()
+    results, counts = run(ingredients, effects, rank=args.rank, top=args.top, max_size=args.max_size,
+                          max_qty=args.max_qty, workers=args.workers, effect=args.effect, tier=args.tier)
+    elapsed = time.perf_counter() - start
+
+    for r in results:
+        names = ", ".join(i["name"] for i in r["ingredients"])
+        res = r["result"]
+        print(f"  {res['sell_value']:>4}r  {res['duration']:>6}  {res['name']:<32} {names}")
+    print(f"\n✓ {counts.get('leaves', 0):,} multisets in {elapsed:.1f}s "
+          f"({counts['workers']} workers, {counts['chunks']} chunks)")
+    print(f"  meal {counts.get('meal', 0):,}  elixir {counts.get('elixir', 0):,}  dubious {counts.get('dubious', 0):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+recipe_engine.py — Python port of js/recipe-engine.js for offline analysis
+
+Mirrors the browser engine's rules and search order exactly, so results and
+search counters can be compared one-to-one with the in-app perf panel
+(?debug). Use it to reproduce slow inventories outside the browser.
+
+Only the exact searches (findBestCombos, findAllValidRecipes) are ported.
+Goal mode, and merchant inventories past 30 ingredients, run the
+time-budgeted RecipeEngine.searchAnytime in the app; its counters depend on
+where the deadline lands, so those perf-panel runs (labelled "anytime") have
+no Python counterpart.
+
+Usage:  python tools/recipe_engine.py goal attack-up --tier 3
+        python tools/recipe_engine.py goal hearty --inventory inv.json
+        python tools/recipe_engine.py merchant --inventory inv.json
+        python tools/recipe_engine.py merchant --all 5
+        python tools/recipe_engine.py parity [--inventory inv.json]
+
+`parity` runs a fixed set of searches through both this port and the JS
+engine (needs node on PATH) and fails if any counter or result differs —
+run it after touching the search in either file.
+
+An inventory file is a JSON object of ingredient id → quantity (1–5).
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+ROOT      = Path(__file__).parent.parent
+DATA_DIR  = ROOT / "data"
+JS_ENGINE = ROOT / "js" / "recipe-engine.js"
+MAX_SLOTS = 5
+
+# Sell value multipliers by ingredient count
+COUNT_SELL_MULT = {1: 1.2, 2: 1.3, 3: 1.4, 4: 1.6, 5: 1.8}
+
+MERCHANT_CAP       = 30  # findAllValidRecipes candidate cap
+GOAL_MONSTER_CAP   = 12  # findBestCombos monster parts kept in unlimited mode
+
+
+@dataclass
+class SearchStats:
+    """Same counters as RecipeEngine.getStats() in the browser."""
+    searches: int = 0
+    nodes_visited: int = 0
+    leaves_evaluated: int = 0
+    pruned_suffix_cap: int = 0
+    pruned_bound: int = 0  # anytime search (RecipeEngine.searchAnytime), not ported
+    results_retained: int = 0
+    dedup_drops: int = 0
+    dominated: int = 0
+    phase_ms: dict = field(default_factory=lambda: {"enumerate": 0.0, "sort": 0.0, "dedup": 0.0})
+
+    def add_phase(self, phase: str, start: float) -> None:
+        self.phase_ms[phase] = self.phase_ms.get(phase, 0.0) + (time.perf_counter() - start) * 1000
+
+
+# ── Data ───────────────────────────────────────────────────────────────────────
+def load_data(data_dir: Path = DATA_DIR) -> tuple[list[dict], list[dict]]:
+    with open(data_dir / "ingredients.json", encoding="utf-8") as f:
+        ingredients = json.load(f)
+    with open(data_dir / "effects.json", encoding="utf-8") as f:
+        effects = json.load(f)
+    return ingredients, effects
+
+
+def js_round(x: float) -> int:
+    """Math.round semantics (half rounds up), unlike Python's banker's round."""
+    return int((x + 0.5) // 1)
+
+
+def name_key(ingredient: dict) -> str:
+    # Approximates localeCompare for the ASCII names in ingredients.json
+    return ingredient["name"].casefold()
+
+
+# ── Recipe rules ───────────────────────────────────────────────────────────────
+def determine_recipe_type(ingredients: list[dict]) -> str:
+    if not ingredients:
+        return "empty"
+    has_food    = any(i["type"] == "food" for i in ingredients)
+    has_critter = any(i["type"] == "critter" for i in ingredients)
+    has_monster = any(i["type"] == "monster" for i in ingredients)
+    if has_food and not has_critter and not has_monster:
+        return "meal"
+    if has_critter and has_monster and not has_food:
+        return "elixir"
+    return "dubious"
+
+
+def compute_dominant_effect(ingredients: list[dict], recipe_type: str, effects_by_id: dict) -> dict | None:
+    by_effect: dict[str, list] = {}
+    monster_potency = 0
+    monster_duration = 0
+
+    for ing in ingredients:
+        if recipe_type == "elixir":
+            if ing["type"] == "monster":
+                monster_potency += ing.get("effect_potency") or 0
+                monster_duration += ing.get("effect_duration_sec") or 0
+                continue
+            if ing["type"] != "critter":
+                continue
+        elif recipe_type == "meal" and ing["type"] != "food":
+            continue
+        if not ing.get("effect"):
+            continue
+        acc = by_effect.setdefault(ing["effect"], [0, 0])
+        acc[0] += ing.get("effect_potency") or 0
+        acc[1] += ing.get("effect_duration_sec") or 0
+
+    # Highest potency; ties keep the first effect encountered
+    dominant = None
+    max_potency = 0
+    for effect_id, (potency, duration) in by_effect.items():
+        if potency > max_potency:
+            max_potency = potency
+            dominant = [effect_id, potency, duration]
+    if not dominant:
+        return None
+
+    effect_id, potency, duration = dominant
+    if recipe_type == "elixir":
+        potency += monster_potency
+        duration += monster_duration
+
+    effect_def = effects_by_id.get(effect_id)
+    tier = 0
+    thresholds = (effect_def or {}).get("potency_thresholds") or []
+    for t in range(len(thresholds) - 1, -1, -1):
+        if potency >= thresholds[t]:
+            tier = t + 1
+            break
+
+    return {"effect_id": effect_id, "effect_def": effect_def, "total_potency": potency,
+            "tier": tier, "duration_sec": duration}
+
+
+def compute_hearts(ingredients: list[dict], recipe_type: str) -> float:
+    if recipe_type == "elixir":
+        return 0
+    return sum((i.get("hearts") or 0) for i in ingredients if i["type"] == "food")
+
+
+def compute_sell_value(ingredients: list[dict]) -> int:
+    base = sum((i.get("sell_price") or 0) for i in ingredients)
+    mult = COUNT_SELL_MULT.get(min(len(ingredients), MAX_SLOTS), 1.2)
+    return js_round(base * mult)
+
+
+def generate_recipe_name(recipe_type: str, effect: dict | None, hearts: float) -> str:
+    if recipe_type == "dubious":
+        return "Dubious Food"
+    if recipe_type == "empty":
+        return "—"
+    if not effect:
+        if recipe_type == "elixir":
+            return "Plain Elixir"
+        hearts_str = "Hearty " if hearts >= 3 else " " if hearts >= 1 else "Plain "
+        return f"{hearts_str.strip()} Dish".strip()
+
+    effect_def = effect["effect_def"] or {}
+    prefix = effect_def.get("prefix") or ""
+    suffix = "Elixir" if recipe_type == "elixir" else "Dish"
+    tier_names = effect_def.get("tier_names") or []
+    tier_name = tier_names[effect["tier"] - 1] if 0 < effect["tier"] <= len(tier_names) else ""
+    if effect_def.get("tiers") == 0:
+        return f"{prefix} {suffix}".strip()
+    return f"{prefix} {suffix} ({tier_name})" if tier_name else f"{prefix} {suffix}"
+
+
+def format_duration(seconds: float) -> str:
+    if not seconds or seconds <= 0:
+        return "—"
+    return f"{int(seconds // 60)}:{int(seconds % 60):02d}"
+
+
+def compute_recipe(ingredients: list[dict], effects_by_id: dict) -> dict:
+    """Port of computeRecipe(); `effects_by_id` maps effect id → effect def."""
+    if not ingredients:
+        return {"type": "empty", "name": "—", "effect": None, "tier": 0, "hearts": 0,
+                "sell_value": 0, "duration": "—", "warnings": []}
+
+    recipe_type = determine_recipe_type(ingredients)
+    warnings = []
+    if recipe_type == "dubious":
+        warnings.append("Incompatible ingredient mix — produces Dubious Food.")
+
+    effect = None if recipe_type == "dubious" else compute_dominant_effect(ingredients, recipe_type, effects_by_id)
+    hearts = compute_hearts(ingredients, recipe_type)
+
+    if effect and effect["effect_id"] == "hearty":
+        route = "critter" if recipe_type == "elixir" else "food"
+        effect["hearty_hearts"] = sum((i.get("effect_potency") or 0) for i in ingredients
+                                      if i.get("effect") == "hearty" and i["type"] == route)
+
+    return {
+        "type": recipe_type,
+        "name": generate_recipe_name(recipe_type, effect, hearts),
+        "effect": effect,
+        "tier": effect["tier"] if effect else 0,
+        "hearts": hearts,
+        "sell_value": compute_sell_value(ingredients),
+        "duration": format_duration(effect["duration_sec"]) if effect else "—",
+        "warnings": warnings,
+    }
+
+
+# ── Searches ───────────────────────────────────────────────────────────────────
+def _enumerate(candidates: list[dict], max_qty: list[int], on_leaf, stats: SearchStats) -> None:
+    """
+    Canonical multiset enumeration, largest combos first. Walks the same
+    top-level branches as listBranches/searchBranches — lowest candidate and
+    its count fixed, infeasible branches skipped — so node counts match.
+    """
+    suffix_cap = [0] * (len(candidates) + 1)
+    for k in range(len(candidates) - 1, -1, -1):
+        suffix_cap[k] = suffix_cap[k + 1] + max_qty[k]
+
+    current: list[dict] = []
+
+    def generate(item_idx: int, slots_left: int) -> None:
+        stats.nodes_visited += 1
+        if slots_left == 0:
+            stats.leaves_evaluated += 1
+            on_leaf(current)
+            return
+        if item_idx >= len(candidates):
+            return
+        if suffix_cap[item_idx] < slots_left:
+            stats.pruned_suffix_cap += 1
+            return
+        item = candidates[item_idx]
+        for k in range(min(max_qty[item_idx], slots_left) + 1):
+            current.extend([item] * k)
+            generate(item_idx + 1, slots_left - k)
+            del current[len(current) - k:]
+
+    for size in range(MAX_SLOTS, 0, -1):
+        for item_idx in range(len(candidates) - 1, -1, -1):
+            item = candidates[item_idx]
+            for count in range(1, min(max_qty[item_idx], size) + 1):
+                if suffix_cap[item_idx + 1] < size - count:
+                    continue
+                current.extend([item] * count)
+                generate(item_idx + 1, size - count)
+                del current[len(current) - count:]
+
+
+def find_best_combos(target_effect_id: str, target_tier: int, all_ingredients: list[dict],
+                     effects: list[dict], max_results: int = 20, owned_qtys: dict | None = None,
+                     stats: SearchStats | None = None, pareto: bool = False) -> list[dict]:
+    """
+    Port of findBestCombos(). Returns [{'ingredients': [...], 'result': {...}}].
+    With pareto=True only the non-dominated set over (duration ↑, count ↓,
+    hearts ↑, sell value ↑) is kept, pruned as combos are found.
+    """
+    stats = stats if stats is not None else SearchStats()
+    effects_by_id = {e["id"]: e for e in effects}
+    if target_effect_id not in effects_by_id:
+        return []
+
+    is_elixir = any(i["type"] == "critter" and i.get("effect") == target_effect_id for i in all_ingredients)
+    if is_elixir:
+        candidates = [i for i in all_ingredients
+                      if (i["type"] == "critter" and i.get("effect") == target_effect_id) or i["type"] == "monster"]
+    else:
+        candidates = [i for i in all_ingredients if i["type"] == "food" and i.get("effect") == target_effect_id]
+
+    if owned_qtys:
+        candidates = [i for i in candidates if owned_qtys.get(i["id"], 0) > 0]
+    elif is_elixir:
+        critters = [i for i in candidates if i["type"] == "critter"]
+        monsters = sorted((i for i in candidates if i["type"] == "monster"),
+                          key=lambda i: -(i.get("sell_price") or 0))[:GOAL_MONSTER_CAP]
+        candidates = critters + monsters
+    if not candidates:
+        return []
+
+    candidates = sorted(candidates, key=name_key)
+    max_qty = [min(owned_qtys.get(c["id"], 0), MAX_SLOTS) if owned_qtys else MAX_SLOTS for c in candidates]
+
+    stats.searches += 1
+    results = []
+
+    def on_leaf(current):
+        recipe = compute_recipe(current, effects_by_id)
+        effect = recipe["effect"]
+        if recipe["type"] == "dubious" or not effect or effect["effect_id"] != target_effect_id:
+            return
+        if target_tier > 0 and effect["tier"] < target_tier:
+            return
+        if pareto:
+            before = len(results)
+            kept = _pareto_insert(results, len(current), recipe)
+            stats.dominated += before - len(results) if kept else 1
+            if not kept:
+                return
+        stats.results_retained += 1
+        results.append({"ingredients": list(current), "result": recipe})
+
+    start = time.perf_counter()
+    _enumerate(candidates, max_qty, on_leaf, stats)
+    stats.add_phase("enumerate", start)
+
+    start = time.perf_counter()
+    results.sort(key=lambda r: (-(r["result"]["effect"]["duration_sec"]), len(r["ingredients"]),
+                                -r["result"]["hearts"], -r["result"]["sell_value"]))
+    stats.add_phase("sort", start)
+    return results[:max_results]
+
+
+def _objectives(size: int, recipe: dict) -> tuple:
+    # All "larger is better" so dominance is a plain element-wise >=
+    return (recipe["effect"]["duration_sec"], -size, recipe["hearts"], recipe["sell_value"])
+
+
+def _pareto_insert(front: list[dict], size: int, recipe: dict) -> bool:
+    """Mirror of _paretoInsert(): reject if dominated/tied, else evict what it dominates."""
+    new = _objectives(size, recipe)
+    kept = []
+    for entry in front:
+        old = _objectives(len(entry["ingredients"]), entry["result"])
+        if all(o >= n for o, n in zip(old, new)):
+            return False
+        if not all(n >= o for n, o in zip(new, old)):
+            kept.append(entry)
+    front[:] = kept
+    return True
+
+
+def find_all_valid_recipes(owned_qtys: dict, all_ingredients: list[dict], effects: list[dict],
+                           max_results: int = 30, stats: SearchStats | None = None) -> list[dict]:
+    """Port of findAllValidRecipes(). Returns [{'ingredients': [...], 'result': {...}}]."""
+    stats = stats if stats is not None else SearchStats()
+    effects_by_id = {e["id"]: e for e in effects}
+    owned = [i for i in all_ingredients if owned_qtys.get(i["id"], 0) > 0]
+    if not owned:
+        return []
+
+    candidates = owned
+    if len(owned) > MERCHANT_CAP:
+        critters = [i for i in owned if i["type"] == "critter"]
+        non_critters = sorted((i for i in owned if i["type"] != "critter"),
+                              key=lambda i: -(i.get("sell_price") or 0))
+        candidates = critters + non_critters[:max(MERCHANT_CAP - len(critters), 8)]
+
+    candidates = sorted(candidates, key=name_key)
+    max_qty = [min(owned_qtys.get(c["id"], 0), MAX_SLOTS) for c in candidates]
+
+    stats.searches += 1
+    results = []
+
+    def on_leaf(current):
+        recipe = compute_recipe(current, effects_by_id)
+        if recipe["type"] != "dubious":
+            stats.results_retained += 1
+            results.append({"ingredients": list(current), "result": recipe})
+
+    start = time.perf_counter()
+    _enumerate(candidates, max_qty, on_leaf, stats)
+    stats.add_phase("enumerate", start)
+
+    start = time.perf_counter()
+    results.sort(key=lambda r: -r["result"]["sell_value"])
+    stats.add_phase("sort", start)
+
+    # Deduplicate value-equivalent outcomes: same sell value + effect + tier
+    start = time.perf_counter()
+    seen = set()
+    deduped = []
+    for r in results:
+        res = r["result"]
+        key = (res["sell_value"], res["effect"]["effect_id"] if res["effect"] else None, res["tier"])
+        if key not in seen:
+            seen.add(key)
+            deduped.append(r)
+    stats.dedup_drops += len(results) - len(deduped)
+    stats.add_phase("dedup", start)
+    return deduped[:max_results]
+
+
+# ── Parity with the JS engine ──────────────────────────────────────────────────
+# Counters compared between the ports; phase timings and the anytime search's
+# pruned_bound are engine-specific.
+PARITY_COUNTERS = {
+    "searches": "searches",
+    "nodes_visited": "nodesVisited",
+    "leaves_evaluated": "leavesEvaluated",
+    "pruned_suffix_cap": "prunedSuffixCap",
+    "results_retained": "resultsRetained",
+    "dedup_drops": "dedupDrops",
+    "dominated": "dominated",
+}
+
+# Runs each case through findBestCombos/findAllValidRecipes with debug on;
+# reads {cases, ingredients, effects} on stdin, writes [{stats, results}].
+_JS_PARITY_RUNNER = r"""
+const fs = require('fs');
+const RecipeEngine = new Function(fs.readFileSync(process.argv[1], 'utf8') + '\nreturn RecipeEngine;')();
+const { cases, ingredients, effects } = JSON.parse(fs.readFileSync(0, 'utf8'));
+RecipeEngine.setDebug(true);
+const out = cases.map(c => {
+  RecipeEngine.resetStats();
+  const owned = c.owned ? new Map(Object.entries(c.owned)) : null;
+  const results = c.mode === 'goal'
+    ? RecipeEngine.findBestCombos(c.effect, c.tier, ingredients, effects, c.max_results, owned, { pareto: c.pareto })
+    : RecipeEngine.findAllValidRecipes(owned, ingredients, effects, c.max_results);
+  return { stats: RecipeEngine.getStats(), results: results.map(r => r.ingredients.map(i => i.id)) };
+});
+process.stdout.write(JSON.stringify(out));
+"""
+
+
+def _parity_cases(ingredients: list[dict], effects: list[dict], owned: dict | None) -> list[dict]:
+    cases = [{"mode": "goal", "effect": e["id"], "tier": tier, "pareto": False, "owned": owned, "max_results": 20}
+             for e in effects for tier in (0, 2)]
+    cases.append({"mode": "goal", "effect": "attack-up", "tier": 0, "pareto": True, "owned": owned, "max_results": 20})
+    cases.append({"mode": "merchant", "owned": owned or {i["id"]: 1 for i in ingredients}, "max_results": 30})
+    return cases
+
+
+def check_parity(ingredients: list[dict], effects: list[dict], owned: dict | None = None) -> bool:
+    """Run the parity cases through both engines; print and return whether all agree."""
+    node = shutil.which("node")
+    if not node:
+        raise SystemExit("parity needs node on PATH to run js/recipe-engine.js")
+    cases = _parity_cases(ingredients, effects, owned)
+    proc = subprocess.run([node, "-e", _JS_PARITY_RUNNER, str(JS_ENGINE)], check=True, capture_output=True,
+                          input=json.dumps({"cases": cases, "ingredients": ingredients, "effects": effects}),
+                          text=True, encoding="utf-8")
+    js_runs = json.loads(proc.stdout)
+
+    ok = True
+    for case, js in zip(cases, js_runs):
+        stats = SearchStats()
+        if case["mode"] == "goal":
+            results = find_best_combos(case["effect"], case["tier"], ingredients, effects, case["max_results"],
+                                       case["owned"], stats, pareto=case["pareto"])
+            name = f"goal {case['effect']} tier {case['tier']}{' pareto' if case['pareto'] else ''}"
+        else:
+            results = find_all_valid_recipes(case["owned"], ingredients, effects, case["max_results"], stats)
+            name = "merchant"
+        diffs = [f"{py_key} {getattr(stats, py_key):,} vs {js['stats'][js_key]:,}"
+                 for py_key, js_key in PARITY_COUNTERS.items() if getattr(stats, py_key) != js["stats"][js_key]]
+        if [[i["id"] for i in r["ingredients"]] for r in results] != js["results"]:
+            diffs.append("results differ")
+        print(f"  {'ok  ' if not diffs else 'FAIL'} {name}{': ' + '; '.join(diffs) if diffs else ''}")
+        ok = ok and not diffs
+    return ok
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+def _print_results(results: list[dict], stats: SearchStats) -> None:
+    for r in results:
+        names = ", ".join(i["name"] for i in r["ingredients"])
+        res = r["result"]
+        print(f"  {res['sell_value']:>4}r  {res['duration']:>6}  {res['name']:<32} {names}")
+    print("\nSearch stats:")
+    for key, value in asdict(stats).items():
+        if key == "phase_ms":
+            for phase, ms in value.items():
+                print(f"  {phase + ' ms':<20} {ms:.1f}")
+        else:
+            print(f"  {key:<20} {value:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the recipe searches offline with counters.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    goal = sub.add_parser("goal", help="findBestCombos")
+    goal.add_argument("effect")
+    goal.add_argument("--tier", type=int, default=0)
+    goal.add_argument("--pareto", action="store_true", help="keep only the non-dominated trade-offs")
+    merchant = sub.add_parser("merchant", help="findAllValidRecipes")
+    parity = sub.add_parser("parity", help="compare counters and results with js/recipe-engine.js")
+    parity.add_argument("--inventory", type=Path, help="also constrain the cases to this inventory")
+    for p in (goal, merchant):
+        p.add_argument("--inventory", type=Path, help="JSON object of ingredient id → qty")
+        p.add_argument("--all", type=int, metavar="QTY", help="own every ingredient at QTY")
+        p.add_argument("--max-results", type=int, default=None)
+    args = parser.parse_args()
+
+    ingredients, effects = load_data()
+    owned = None
+    if args.inventory:
+        owned = {k: int(v) for k, v in json.loads(args.inventory.read_text(encoding="utf-8")).items()}
+    elif getattr(args, "all", None):
+        owned = {i["id"]: args.all for i in ingredients}
+
+    if args.mode == "parity":
+        print("Parity with js/recipe-engine.js (python vs js):")
+        sys.exit(0 if check_parity(ingredients, effects, owned) else 1)
+
+    stats = SearchStats()
+    if args.mode == "goal":
+        results = find_best_combos(args.effect, args.tier, ingredients, effects,
+                                   args.max_results or 20, owned, stats, pareto=args.pareto)
+    else:
+        if not owned:
+            parser.error("merchant mode needs --inventory or --all")
+        results = find_all_valid_recipes(owned, ingredients, effects, args.max_results or 30, stats)
+    _print_results(results, stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+watch.py — Serve the site locally and rebuild derived files as sources change
+
+Keeps a small dependency graph from source files to generated artifacts and,
+on every change, re-runs only the rules whose inputs changed. Changes are
+detected by content hash (mtime/size only decide when to re-hash), so saving
+a file without editing it, or a rebuild that reproduces identical output,
+doesn't ripple further down the graph.
+
+Artifacts:
+  data/substitutes.json    always (see build_substitutes.py)
+  precache-manifest.json   always (see build_sw_manifest.py)
+  dist/                    with --dist, step by step via build_site.SiteBuild:
+                           images → data → css → js → html → sw/headers/manifests
+
+Search indexes and the goal-mode lookup tables are derived in the browser
+(js/derived-cache.js) rather than at build time, so they have no rule here;
+add a Rule to build_rules() when a build-time artifact is introduced.
+
+Usage:  python tools/watch.py                 (serve the source tree on :8000)
+        python tools/watch.py --dist          (also maintain dist/ and serve that)
+        python tools/watch.py --port 8080 --fonts
+        python tools/watch.py --sw            (serve the real service worker)
+
+The page registers sw.js, which serves cached files first and only syncs
+them every minute. Unless --sw is given, the dev server answers /sw.js with
+DEV_SERVICE_WORKER instead: it takes over from any cached worker, empties
+its caches and has no fetch handler, so every reload hits the server.
+"""
+
+import argparse
+import functools
+import hashlib
+import http.server
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from build_site import DIST_DIR, SiteBuild
+from build_substitutes import write_index
+from build_sw_manifest import PRECACHE_DIRS, PRECACHE_FILES, write_manifest
+
+ROOT = Path(__file__).parent.parent
+POLL_INTERVAL = 0.25  # seconds
+
+# Stand-in for sw.js while developing (see module docstring)
+DEV_SERVICE_WORKER = b"""// tools/watch.py: no caching while developing
+self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', event => event.waitUntil((async () => {
+  for (const key of await caches.keys()) await caches.delete(key);
+  await self.clients.claim();
+})()));
+"""
+
+
+@dataclass
+class Rule:
+    name: str
+    inputs: list[str]                 # globs relative to ROOT
+    action: Callable[[], object]      # rebuilds; returns a signature of its output
+    deps: list[str] = field(default_factory=list)  # rules whose output feeds this one
+
+
+def build_rules(dist: bool, fonts: bool) -> list[Rule]:
+    """Rules in dependency order (every dep appears before its dependents)."""
+    rules = [
+        Rule("substitutes", ["data/ingredients.json"], write_index),
+        Rule("precache-manifest",
+             [*PRECACHE_FILES, *(f"{d}/**/*" for d in PRECACHE_DIRS)],
+             lambda: write_manifest(ROOT)["version"], ["substitutes"]),
+    ]
+    if not dist:
+        return rules
+
+    DIST_DIR.mkdir(parents=True, exist_ok=True)
+    site = SiteBuild(DIST_DIR, fonts)
+
+    def load_page():
+        site.load_html()
+        return site.html
+
+    rules += [
+        Rule("dist:page", ["index.html"], load_page),
+        Rule("dist:images", ["images/**/*"], site.build_images),
+        Rule("dist:data", ["data/*.json"], site.build_data, ["dist:images"]),
+        # used_characters() reads the page, scripts and data for font subsetting;
+        # the local fonts sit in the repo root
+        Rule("dist:css", ["css/**/*", "*.otf", "*.ttf", "js/**/*.js", "data/*.json"], site.build_css,
+             ["dist:page", "dist:images"]),
+        Rule("dist:js", ["js/**/*.js"], site.build_js, ["dist:page", "dist:images", "dist:data"]),
+        Rule("dist:html", [], site.build_html, ["dist:page", "dist:data", "dist:css", "dist:js"]),
+        Rule("dist:meta", ["sw.js"], lambda: site.write_meta()["version"],
+             ["dist:images", "dist:data", "dist:css", "dist:js", "dist:html"]),
+    ]
+    return rules
+
+
+class Graph:
+    """Tracks file content hashes and the input/output signature of every rule."""
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        self._files: dict[Path, tuple[int, int, str]] = {}  # path → (mtime_ns, size, hash)
+        self._in_sig: dict[str, str] = {}
+        self._out_sig: dict[str, str] = {}
+
+    def _hash(self, path: Path) -> str:
+        st = path.stat()
+        cached = self._files.get(path)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._files[path] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def _input_signature(self, rule: Rule) -> str:
+        h = hashlib.sha256()
+        paths = sorted({p for pattern in rule.inputs for p in ROOT.glob(pattern) if p.is_file()})
+        for path in paths:
+            try:
+                h.update(f"{path.relative_to(ROOT).as_posix()}\0{self._hash(path)}\n".encode("utf-8"))
+            except FileNotFoundError:  # deleted between glob and stat
+                continue
+        for dep in rule.deps:
+            h.update(f"<{dep}>{self._out_sig.get(dep, '')}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    def update(self) -> list[str]:
+        """Re-run every rule whose inputs changed; returns the names of rules that ran."""
+        ran = []
+        for rule in self.rules:
+            sig = self._input_signature(rule)
+            if self._in_sig.get(rule.name) == sig:
+                continue
+            self._in_sig[rule.name] = sig  # a failed rule waits for its next input change
+            out = rule.action()
+            self._out_sig[rule.name] = hashlib.sha256(json.dumps(out, default=str).encode("utf-8")).hexdigest()
+            ran.append(rule.name)
+        return ran
+
+
+class _DevHandler(http.server.SimpleHTTPRequestHandler):
+    real_sw = False
+
+    def do_GET(self):
+        if self.real_sw or self.path.split("?", 1)[0] != "/sw.js":
+            return super().do_GET()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/javascript; charset=utf-8")
+        self.send_header("Content-Length", str(len(DEV_SERVICE_WORKER)))
+        self.end_headers()
+        self.wfile.write(DEV_SERVICE_WORKER)
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format, *args):  # keep the console for rebuild output
+        pass
+
+
+def serve(directory: Path, port: int, real_sw: bool = False) -> http.server.ThreadingHTTPServer:
+    handler = functools.partial(type("_Handler", (_DevHandler,), {"real_sw": real_sw}), directory=str(directory))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the site and rebuild derived files on change.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--dist", action="store_true", help="maintain dist/ incrementally and serve it")
+    parser.add_argument("--fonts", action="store_true",
+                        help="self-host Google Fonts in dist/ (downloaded once per session)")
+    parser.add_argument("--no-serve", action="store_true", help="only rebuild, don't start a server")
+    parser.add_argument("--sw", action="store_true",
+                        help="serve the real service worker (offline testing; reloads may show cached files)")
+    args = parser.parse_args()
+
+    graph = Graph(build_rules(args.dist, args.fonts))
+    start = time.perf_counter()
+    graph.update()
+    print(f"✓ Initial build: {len(graph.rules)} rules in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if not args.no_serve:
+        site_dir = DIST_DIR if args.dist else ROOT
+        serve(site_dir, args.port, args.sw)
+        print(f"✓ Serving {site_dir} at http://127.0.0.1:{args.port}/")
+    print("  Watching for changes (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            start = time.perf_counter()
+            try:
+                ran = graph.update()
+            except Exception as e:  # keep watching; the next save usually fixes it
+                print(f"  [ERROR] rebuild failed: {e}")
+                continue
+            if ran:
+                ms = (time.perf_counter() - start) * 1000
+                print(f"✓ {time.strftime('%H:%M:%S')} rebuilt {', '.join(ran)} in {ms:.0f} ms")
+    except KeyboardInterrupt:
+        print()
+
+
+if __name__ == "__main__":
+    main()